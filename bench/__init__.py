@@ -0,0 +1,8 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# see license https://github.com/DerwenAI/pytextrank#license-and-copyright
+
+"""
+Benchmarks for the `pytextrank` library, run as modules from the
+repository root, e.g., `python -m bench.groupby`
+"""
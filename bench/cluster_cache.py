@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# see license https://github.com/DerwenAI/pytextrank#license-and-copyright
+
+"""
+Benchmark the cache of clustering results in `TopicRank`, on a stream
+of synthetic documents where the same documents recur: the clustering
+of every document in the stream gets timed without a cache, then with a
+cold cache, then again once the cache is warm.
+
+    python -m bench.cluster_cache --tokens 2000 --distinct 10 --docs 100
+"""
+
+import argparse
+import time
+import typing
+
+import spacy  # type: ignore # pylint: disable=E0401
+
+from pytextrank.topicrank import TopicRankFactory
+
+from .synth import make_doc
+
+
+METHODS: typing.List[str] = [ "average", "single", "sparse_average" ]
+
+
+def make_stream (
+    n_tokens: int,
+    n_distinct: int,
+    n_docs: int,
+    ) -> typing.List[typing.List[typing.FrozenSet[str]]]:
+    """
+Generate the candidate term sets of a stream of documents, which cycles
+through a given number of distinct documents.
+
+    n_tokens:
+number of tokens per document
+
+    n_distinct:
+number of distinct documents
+
+    n_docs:
+number of documents in the stream
+
+    returns:
+list of the candidate term sets of each document
+    """
+    distinct: typing.List[typing.List[typing.FrozenSet[str]]] = []
+
+    for seed in range(n_distinct):
+        doc = make_doc(n_tokens, seed=seed)
+        tr = TopicRankFactory()(doc)._.textrank
+
+        distinct.append([
+            frozenset(term.text for term in candidate if not term.is_stop)
+            for candidate in tr._get_candidates()  # pylint: disable=W0212
+        ])
+
+    return [ distinct[i % n_distinct] for i in range(n_docs) ]
+
+
+def run (
+    stream: typing.List[typing.List[typing.FrozenSet[str]]],
+    method: str,
+    ) -> typing.Dict[str, float]:
+    """
+Time the clustering of the stream without a cache, with a cold cache,
+and with a warm cache, after checking that their results agree.
+
+    stream:
+list of the candidate term sets of each document
+
+    method:
+clustering method
+
+    returns:
+the time in seconds for each configuration
+    """
+    empty_doc = spacy.blank("en").make_doc("")
+    uncached = TopicRankFactory(method=method, chunker="pos")(empty_doc)._.textrank
+    cached = TopicRankFactory(method=method, chunker="pos", cache_size=len(stream) * 100)(empty_doc)._.textrank
+
+    timings: typing.Dict[str, float] = {}
+    results: typing.Dict[str, typing.List[typing.List[int]]] = {}
+
+    for name, tr in [ ("cache_size=0", uncached), ("cold cache", cached), ("warm cache", cached) ]:
+        start = time.perf_counter()
+        results[name] = [ tr._cluster_term_sets(term_sets).tolist() for term_sets in stream ]  # pylint: disable=W0212
+        timings[name] = time.perf_counter() - start
+
+    assert results["cold cache"] == results["cache_size=0"]
+    assert results["warm cache"] == results["cache_size=0"]
+
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=2000, help="number of tokens per document")
+    parser.add_argument("--distinct", type=int, default=10, help="number of distinct documents")
+    parser.add_argument("--docs", type=int, default=100, help="number of documents in the stream")
+    parser.add_argument("--methods", nargs="+", default=METHODS, help="clustering methods")
+    args = parser.parse_args()
+
+    stream = make_stream(args.tokens, args.distinct, args.docs)
+
+    print("{:>16}  {:>14}  {:>10}  {:>8}".format("method", "cache", "time (ms)", "speedup"))
+
+    for method in args.methods:
+        timings = run(stream, method)
+        baseline = timings["cache_size=0"]
+
+        for name, elapsed in timings.items():
+            print("{:>16}  {:>14}  {:>10.3f}  {:>7.2f}x".format(method, name, elapsed * 1000.0, baseline / elapsed))
@@ -0,0 +1,404 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# see license https://github.com/DerwenAI/pytextrank#license-and-copyright
+
+"""
+Verify that the alternative computation paths in `pytextrank` return
+the same results as the reference paths, on the bundled texts in
+`dat/*.txt` and on synthetic documents. Each mode runs a reference
+path and an alternative path side by side:
+
+  * `snapshot-textrank`, `snapshot-positionrank`, `snapshot-biasedtextrank`:
+    the *NetworkX* PageRank on the lemma graph, versus re-ranking a
+    `RankSnapshot` with `pagerank_matrix()` on its sparse adjacency
+  * `dense-topicrank`: the *NetworkX* PageRank on the graph of topics,
+    versus `pagerank_matrix()` on the dense matrix of topic weights
+  * `sparse-topicrank`: the `"single"` clustering method, versus
+    `"sparse_single"`; the `"sparse_average"` method only approximates
+    `"average"` where merges are tied, so it does not get compared
+  * `cached-topicrank`: clustering without a cache, versus a warm cache
+
+The results get compared by the sets of phrase texts, the rank order
+of the phrases, the rank values within a tolerance, and the sentence
+ids of the summary. Any divergence comes back as a diff report, and
+the exit status is non-zero.
+
+    python -m bench.equiv --sizes 1000 5000 --rtol 1e-6
+"""
+
+import argparse
+from bisect import bisect_right
+from dataclasses import dataclass, field
+import math
+import pathlib
+import sys
+import typing
+
+from spacy.tokens import Doc, Span  # type: ignore # pylint: disable=E0401
+
+from pytextrank.base import BaseTextRank, BaseTextRankFactory, Phrase
+from pytextrank.biasedrank import BiasedTextRank, BiasedTextRankFactory
+from pytextrank.positionrank import PositionRankFactory
+from pytextrank.snapshot import RankSnapshot
+from pytextrank.topicrank import TopicRankFactory
+
+from .pipeline import BIASED_FOCUS, REPO_DIR, TOKEN_LIMITS, load_docs
+
+
+@dataclass
+class RankResult:
+    """
+The results of one computation path: the ranked phrases as `(text,
+rank)` pairs in descending order, and the sentence ids of the summary.
+    """
+    phrases: typing.List[typing.Tuple[str, float]]
+    summary: typing.List[int]
+
+
+@dataclass
+class EquivReport:
+    """
+The differences between the results of a reference path and an
+alternative path, which are equivalent when all of the lists are empty.
+    """
+    mode: str
+    input: str
+    missing: typing.List[str] = field(default_factory=list)
+    extra: typing.List[str] = field(default_factory=list)
+    rank_diffs: typing.List[typing.Tuple[str, float, float]] = field(default_factory=list)
+    inversions: typing.List[typing.Tuple[str, str]] = field(default_factory=list)
+    summary_diff: typing.List[typing.List[int]] = field(default_factory=list)
+
+
+    @property
+    def ok (
+        self
+        ) -> bool:
+        """
+Test whether the two paths returned equivalent results.
+
+    returns:
+`True` if no differences were found
+        """
+        return not (self.missing or self.extra or self.rank_diffs or self.inversions or self.summary_diff)
+
+
+    def __str__ (
+        self
+        ) -> str:
+        """
+Format the differences as a diff report.
+
+    returns:
+one line per difference, after a header line
+        """
+        lines = [ "{} on {}: {}".format(self.mode, self.input, "ok" if self.ok else "DIVERGED") ]
+        lines.extend("  - phrase {!r}".format(text) for text in self.missing)
+        lines.extend("  + phrase {!r}".format(text) for text in self.extra)
+
+        lines.extend(
+            "  ~ rank {!r}: {:.12g} != {:.12g}".format(text, expected, actual)
+            for text, expected, actual in self.rank_diffs
+        )
+
+        lines.extend(
+            "  ~ order {!r} before {!r}".format(first, second)
+            for first, second in self.inversions
+        )
+
+        if self.summary_diff:
+            lines.append("  ~ summary {} != {}".format(*self.summary_diff))
+
+        return "\n".join(lines)
+
+
+def compare_results (
+    reference: RankResult,
+    alternative: RankResult,
+    *,
+    mode: str = "",
+    input_name: str = "",
+    rtol: float = 1e-6,
+    atol: float = 1e-12,
+    ) -> EquivReport:
+    """
+Compare the results of an alternative path with those of the reference
+path. Phrases whose reference ranks are equal within the tolerance may
+appear in either order.
+
+    reference:
+results of the reference path
+
+    alternative:
+results of the alternative path
+
+    mode:
+name of the mode, for the report
+
+    input_name:
+name of the document, for the report
+
+    rtol:
+relative tolerance for the rank values
+
+    atol:
+absolute tolerance for the rank values
+
+    returns:
+the differences found
+    """
+    expected = dict(reference.phrases)
+    actual = dict(alternative.phrases)
+
+    report = EquivReport(
+        mode = mode,
+        input = input_name,
+        missing = sorted(set(expected) - set(actual)),
+        extra = sorted(set(actual) - set(expected)),
+    )
+
+    report.rank_diffs = [
+        (text, expected[text], rank)
+        for text, rank in alternative.phrases
+        if text in expected and not math.isclose(expected[text], rank, rel_tol=rtol, abs_tol=atol)
+    ]
+
+    order = [ text for text, _ in alternative.phrases if text in expected ]
+
+    report.inversions = [
+        (first, second)
+        for first, second in zip(order, order[1:])
+        if expected[second] > expected[first] and not math.isclose(expected[first], expected[second], rel_tol=rtol, abs_tol=atol)
+    ]
+
+    if reference.summary != alternative.summary:
+        report.summary_diff = [ reference.summary, alternative.summary ]
+
+    return report
+
+
+def sentence_ids (
+    doc: Doc,
+    sentences: typing.Iterable[typing.Union[Span, str]],
+    ) -> typing.List[int]:
+    """
+Identify the sentences yielded by a summary, either as spans or as
+texts, where repeated texts match successive sentences.
+
+    doc:
+the summarized document
+
+    sentences:
+the summary
+
+    returns:
+the sentence ids, in the order of the summary
+    """
+    sents = list(doc.sents)
+    starts = [ sent.start for sent in sents ]
+    ids: typing.List[int] = []
+
+    for sent in sentences:
+        if isinstance(sent, Span):
+            ids.append(bisect_right(starts, sent.start) - 1)
+        else:
+            ids.append(next(
+                sent_id
+                for sent_id, span in enumerate(sents)
+                if span.text == sent and sent_id not in ids
+            ))
+
+    return ids
+
+
+def live_result (
+    tr: BaseTextRank,
+    phrases: typing.List[Phrase],
+    ) -> RankResult:
+    """
+Collect the results of a pipeline component for the given phrases.
+
+    tr:
+the `pytextrank` component of a document
+
+    phrases:
+the ranked phrases, which get set on the document for the summary
+
+    returns:
+the phrases and summary
+    """
+    tr.doc._.phrases = phrases
+
+    return RankResult(
+        phrases = [ (p.text, p.rank) for p in phrases ],
+        summary = sentence_ids(tr.doc, tr.summary()),
+    )
+
+
+def compare_snapshot (
+    factory: BaseTextRankFactory,
+    doc: Doc,
+    ) -> typing.Tuple[RankResult, RankResult]:
+    """
+Compare the pipeline component with re-ranking a snapshot of it.
+
+    factory:
+the factory for the pipeline component
+
+    doc:
+an annotated document
+
+    returns:
+the reference and alternative results
+    """
+    tr = factory(doc)._.textrank
+
+    if isinstance(tr, BiasedTextRank):
+        tr.change_focus(BIASED_FOCUS, bias=10.0, default_bias=0.0)
+
+    reference = live_result(tr, doc._.phrases)
+
+    snapshot = RankSnapshot.from_textrank(tr)
+    phrases = snapshot.rank(tr.get_personalization())
+
+    alternative = RankResult(
+        phrases = [ (p.text, p.rank) for p in phrases ],
+        summary = sentence_ids(doc, snapshot.summary()),
+    )
+
+    return reference, alternative
+
+
+def compare_dense_topicrank (
+    doc: Doc,
+    ) -> typing.Tuple[RankResult, RankResult]:
+    """
+Compare *TopicRank* using the *NetworkX* PageRank on its graph of
+topics with using `pagerank_matrix()` on the dense topic weights.
+
+    doc:
+an annotated document
+
+    returns:
+the reference and alternative results
+    """
+    import networkx as nx  # type: ignore # pylint: disable=C0415,E0401
+
+    tr = TopicRankFactory()(doc)._.textrank
+    alternative = live_result(tr, doc._.phrases)
+
+    ranks = nx.pagerank(tr.lemma_graph)
+    tr.ranks = { topic: ranks[topic] for topic in tr.node_list }
+    reference = live_result(tr, tr._get_topic_phrases())  # pylint: disable=W0212
+
+    return reference, alternative
+
+
+def compare_topicrank (
+    doc: Doc,
+    reference_factory: TopicRankFactory,
+    alternative_factory: TopicRankFactory,
+    ) -> typing.Tuple[RankResult, RankResult]:
+    """
+Compare two configurations of *TopicRank*, where the alternative runs
+twice so that any cache gets used.
+
+    doc:
+an annotated document
+
+    reference_factory:
+the factory for the reference configuration
+
+    alternative_factory:
+the factory for the alternative configuration
+
+    returns:
+the reference and alternative results
+    """
+    reference = live_result(reference_factory(doc)._.textrank, doc._.phrases)
+
+    alternative_factory(doc)
+    alternative = live_result(alternative_factory(doc)._.textrank, doc._.phrases)
+
+    return reference, alternative
+
+
+MODES: typing.Dict[str, typing.Callable[[Doc], typing.Tuple[RankResult, RankResult]]] = {
+    "snapshot-textrank": lambda doc: compare_snapshot(BaseTextRankFactory(), doc),
+    "snapshot-positionrank": lambda doc: compare_snapshot(PositionRankFactory(), doc),
+    "snapshot-biasedtextrank": lambda doc: compare_snapshot(BiasedTextRankFactory(), doc),
+    "dense-topicrank": compare_dense_topicrank,
+    "sparse-topicrank": lambda doc: compare_topicrank(
+        doc, TopicRankFactory(method="single"), TopicRankFactory(method="sparse_single"),
+    ),
+    "cached-topicrank": lambda doc: compare_topicrank(
+        doc, TopicRankFactory(), TopicRankFactory(cache_size=10000),
+    ),
+}
+
+
+def check_doc (
+    mode: str,
+    doc: Doc,
+    *,
+    input_name: str = "",
+    rtol: float = 1e-6,
+    atol: float = 1e-12,
+    ) -> EquivReport:
+    """
+Run both paths of a mode on a document, then compare their results.
+
+    mode:
+name of the mode, as a key in `MODES`
+
+    doc:
+an annotated document
+
+    input_name:
+name of the document, for the report
+
+    rtol:
+relative tolerance for the rank values
+
+    atol:
+absolute tolerance for the rank values
+
+    returns:
+the differences found
+    """
+    reference, alternative = MODES[mode](doc)
+
+    return compare_results(
+        reference,
+        alternative,
+        mode = mode,
+        input_name = input_name,
+        rtol = rtol,
+        atol = atol,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES), help="computation paths to verify")
+    parser.add_argument("--texts", type=pathlib.Path, nargs="*", default=sorted(REPO_DIR.glob("dat/*.txt")), help="text files to verify on")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[ 1000, 5000 ], help="numbers of tokens for the synthetic documents")
+    parser.add_argument("--model", default="en_core_web_sm", help="trained pipeline used to parse the texts")
+    parser.add_argument("--rtol", type=float, default=1e-6, help="relative tolerance for the rank values")
+    parser.add_argument("--atol", type=float, default=1e-12, help="absolute tolerance for the rank values")
+    args = parser.parse_args()
+
+    diverged = 0
+
+    for name, input_doc in load_docs(args.texts, args.sizes, args.model):
+        for mode_name in args.modes:
+            if mode_name.endswith("topicrank") and len(input_doc) > TOKEN_LIMITS["topicrank"]:
+                continue
+
+            equiv_report = check_doc(mode_name, input_doc, input_name=name, rtol=args.rtol, atol=args.atol)
+            print(equiv_report)
+
+            if not equiv_report.ok:
+                diverged += 1
+
+    sys.exit(1 if diverged else 0)
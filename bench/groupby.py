@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# see license https://github.com/DerwenAI/pytextrank#license-and-copyright
+
+"""
+Benchmark the hash-based `groupby_hash()` against the sort-based
+`groupby_apply()`, on data shaped like the phrase grouping in
+`BaseTextRank._get_min_phrases()`: `(text, rank, span)` tuples grouped
+by their text.
+
+    python -m bench.groupby --items 1000 10000 100000 --distinct 0.2
+"""
+
+import argparse
+import random
+import timeit
+import typing
+
+from pytextrank.util import groupby_apply, groupby_hash
+
+
+def make_data (
+    n_items: int,
+    n_keys: int,
+    seed: int = 0,
+    ) -> typing.List[typing.Tuple[str, float, int]]:
+    """
+Generate phrase-like tuples with a given number of distinct texts.
+
+    n_items:
+number of tuples
+
+    n_keys:
+number of distinct texts
+
+    seed:
+seed for the random number generator
+
+    returns:
+list of `(text, rank, position)` tuples
+    """
+    rng = random.Random(seed)
+    texts = [ "phrase {:08d}".format(rng.randrange(10**8)) for _ in range(n_keys) ]
+
+    return [
+        (rng.choice(texts), rng.random(), pos)
+        for pos in range(n_items)
+    ]
+
+
+def run (
+    n_items: int,
+    distinct: float,
+    repeat: int,
+    ) -> typing.Dict[str, float]:
+    """
+Time both implementations on the same data, after checking that their
+results agree.
+
+    n_items:
+number of items to group
+
+    distinct:
+ratio of distinct keys to items
+
+    repeat:
+number of timing runs, where the best one gets reported
+
+    returns:
+the best time in seconds for each implementation
+    """
+    data = make_data(n_items, max(1, int(n_items * distinct)))
+    keyfunc = lambda x: x[0]
+    applyfunc = lambda g: list((rank, pos) for text, rank, pos in g)
+
+    expected = groupby_apply(data, keyfunc, applyfunc)
+    assert groupby_hash(data, keyfunc, applyfunc, sort_keys=True) == expected
+
+    timings: typing.Dict[str, float] = {}
+
+    for name, func in [
+        ("groupby_apply", lambda: groupby_apply(data, keyfunc, applyfunc)),
+        ("groupby_hash", lambda: groupby_hash(data, keyfunc, applyfunc)),
+        ("groupby_hash(sort_keys)", lambda: groupby_hash(data, keyfunc, applyfunc, sort_keys=True)),
+    ]:
+        timings[name] = min(timeit.repeat(func, number=1, repeat=repeat))
+
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, nargs="+", default=[ 1000, 10000, 100000 ], help="numbers of items to group")
+    parser.add_argument("--distinct", type=float, default=0.2, help="ratio of distinct keys to items")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timing runs")
+    args = parser.parse_args()
+
+    print("{:>10}  {:>24}  {:>10}  {:>8}".format("items", "method", "best (ms)", "speedup"))
+
+    for n_items in args.items:
+        timings = run(n_items, args.distinct, args.repeat)
+        baseline = timings["groupby_apply"]
+
+        for name, elapsed in timings.items():
+            print("{:>10}  {:>24}  {:>10.3f}  {:>7.2f}x".format(n_items, name, elapsed * 1000.0, baseline / elapsed))
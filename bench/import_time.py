@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# see license https://github.com/DerwenAI/pytextrank#license-and-copyright
+
+"""
+Benchmark the cold-start cost of `import pytextrank`, in fresh
+interpreters, separately from the cost of importing `spaCy` itself.
+Exits with an error if the median cost exceeds the budget.
+
+    python -m bench.import_time --runs 10 --budget 0.5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import typing
+
+# the extra time allowed for `import pytextrank`, in seconds, on top
+# of importing `spaCy`
+IMPORT_BUDGET: float = 0.5
+
+# libraries which only get imported on first use
+LAZY_MODULES: typing.List[str] = [
+    "altair",
+    "graphviz",
+    "icecream",
+    "networkx",
+    "pandas",
+    "scipy",
+]
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import spacy
+t1 = time.perf_counter()
+import pytextrank
+t2 = time.perf_counter()
+print(json.dumps({
+    "spacy": t1 - t0,
+    "pytextrank": t2 - t1,
+    "loaded": sorted({ name.split(".")[0] for name in sys.modules }),
+}))
+"""
+
+
+def probe () -> typing.Dict[str, typing.Any]:
+    """
+Time the imports in a fresh interpreter.
+
+    returns:
+the import times in seconds, and the top-level modules loaded
+    """
+    result = subprocess.run(
+        [ sys.executable, "-c", _PROBE ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    # the probe prints its results last, after anything else which got
+    # printed while importing, e.g., by `pytextrank.version`
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run (
+    runs: int,
+    ) -> typing.Dict[str, typing.Any]:
+    """
+Repeat the probe, then summarize.
+
+    runs:
+number of fresh interpreters to time
+
+    returns:
+the median import times, and any lazy modules which got loaded eagerly
+    """
+    probes = [ probe() for _ in range(runs) ]
+
+    return {
+        "spacy": statistics.median(p["spacy"] for p in probes),
+        "pytextrank": statistics.median(p["pytextrank"] for p in probes),
+        "eager": sorted(set(LAZY_MODULES).intersection(probes[0]["loaded"])),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreters to time")
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET, help="budget in seconds for `import pytextrank`, on top of `spaCy`")
+    args = parser.parse_args()
+
+    summary = run(args.runs)
+
+    print("import spacy:       {:8.3f} s".format(summary["spacy"]))
+    print("import pytextrank:  {:8.3f} s  (budget {:.3f} s)".format(summary["pytextrank"], args.budget))
+    print("eagerly loaded:     {}".format(", ".join(summary["eager"]) or "none"))
+
+    if summary["pytextrank"] > args.budget or summary["eager"]:
+        sys.exit(1)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# see license https://github.com/DerwenAI/pytextrank#license-and-copyright
+
+"""
+Profile the memory used by each algorithm variant of `pytextrank` per
+document, with `tracemalloc`:
+
+  * `peak`: the peak allocation while the pipeline component ranks
+    the document and summarizes it
+  * `retained`: the bytes still allocated once the pipeline returns,
+    which the document keeps through `doc._.textrank` and
+    `doc._.phrases`, i.e., the lemma graph, `seen_lemma`, `ranks`,
+    and the `Span` objects of each phrase
+  * `leaked`: the bytes still allocated after the document and the
+    factory get released, which should be close to zero
+
+Exits with an error if the retained memory per token exceeds the
+budget, or if any document leaks more than the leak budget.
+
+    python -m bench.memory --sizes 1000 10000 --top 5
+"""
+
+import argparse
+import gc
+import json
+import pathlib
+import sys
+import tracemalloc
+import typing
+
+from .pipeline import ALGORITHMS
+from .synth import make_doc
+
+
+# the bytes a ranked document may retain, per token
+RETAINED_BUDGET: int = 1024
+
+# the bytes which may remain allocated after a document gets released
+LEAK_BUDGET: int = 64 * 1024
+
+
+def warm_up (
+    algorithm: str,
+    ) -> None:
+    """
+Run an algorithm once on a small document, so that the libraries which
+get imported on first use and any module-level state do not count
+towards the measures.
+
+    algorithm:
+name of the algorithm, as a key in `ALGORITHMS`
+    """
+    doc = ALGORITHMS[algorithm]()(make_doc(200))
+    list(doc._.textrank.summary())
+
+
+def measure_doc (
+    algorithm: str,
+    n_tokens: int,
+    *,
+    top: int = 0,
+    ) -> typing.Dict[str, typing.Any]:
+    """
+Measure the memory used to rank and summarize one synthetic document.
+
+    algorithm:
+name of the algorithm, as a key in `ALGORITHMS`
+
+    n_tokens:
+number of tokens in the document
+
+    top:
+number of source lines retaining the most memory to report
+
+    returns:
+the peak, retained, and leaked bytes, along with the top source lines if requested
+    """
+    doc = make_doc(n_tokens)
+    factory = ALGORITHMS[algorithm]()
+    sources: typing.List[str] = []
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        base_mem, _ = tracemalloc.get_traced_memory()
+        before = tracemalloc.take_snapshot() if top else None
+
+        factory(doc)
+        list(doc._.textrank.summary())
+
+        _, peak_mem = tracemalloc.get_traced_memory()
+        gc.collect()
+        retained_mem, _ = tracemalloc.get_traced_memory()
+
+        if before is not None:
+            sources = [
+                str(stat)
+                for stat in tracemalloc.take_snapshot().compare_to(before, "lineno")[:top]
+            ]
+
+        del doc, factory
+        gc.collect()
+        leaked_mem, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "algorithm": algorithm,
+        "tokens": n_tokens,
+        "peak": peak_mem - base_mem,
+        "retained": retained_mem - base_mem,
+        "leaked": leaked_mem - base_mem,
+        "sources": sources,
+    }
+
+
+def run (
+    algorithms: typing.List[str],
+    sizes: typing.List[int],
+    budget: int,
+    top: int,
+    ) -> typing.Dict[str, typing.Any]:
+    """
+Measure each of the algorithms on synthetic documents of each size,
+printing a table of the results along the way.
+
+    algorithms:
+names of the algorithms
+
+    sizes:
+numbers of tokens for the synthetic documents
+
+    budget:
+the bytes a ranked document may retain, per token
+
+    top:
+number of source lines retaining the most memory to report
+
+    returns:
+the results, and the documents which went over budget
+    """
+    print("{:>14}  {:>8}  {:>10}  {:>13}  {:>9}  {:>10}".format(
+        "algorithm", "tokens", "peak (MB)", "retained (MB)", "B/token", "leaked (B)",
+    ))
+
+    results = []
+    over_budget = []
+
+    for algorithm in algorithms:
+        warm_up(algorithm)
+
+        for n_tokens in sizes:
+            result = measure_doc(algorithm, n_tokens, top=top)
+            results.append(result)
+
+            per_token = result["retained"] / n_tokens
+            flag = ""
+
+            if per_token > budget or result["leaked"] > LEAK_BUDGET:
+                flag = "  over budget"
+                over_budget.append((algorithm, n_tokens))
+
+            print("{:>14}  {:>8}  {:>10.2f}  {:>13.2f}  {:>9.1f}  {:>10}{}".format(
+                algorithm, n_tokens, result["peak"] / 2**20, result["retained"] / 2**20, per_token, result["leaked"], flag,
+            ))
+
+            for source in result["sources"]:
+                print("    " + source)
+
+    return {
+        "budget": budget,
+        "results": results,
+        "over_budget": over_budget,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS), default=list(ALGORITHMS), help="algorithms to profile")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[ 1000, 10000 ], help="numbers of tokens for the synthetic documents")
+    parser.add_argument("--budget", type=int, default=RETAINED_BUDGET, help="bytes a ranked document may retain, per token")
+    parser.add_argument("--top", type=int, default=0, help="number of source lines retaining the most memory to report")
+    parser.add_argument("--output", type=pathlib.Path, help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    report = run(args.algorithms, args.sizes, args.budget, args.top)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    sys.exit(1 if report["over_budget"] else 0)
@@ -0,0 +1,385 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# see license https://github.com/DerwenAI/pytextrank#license-and-copyright
+
+"""
+Benchmark each algorithm variant of `pytextrank`, per stage, on the
+bundled texts in `dat/*.txt` and on synthetic documents.
+
+For each algorithm and document this reports the latency of the
+stages within the pipeline component (building the graph, running
+*PageRank*, collecting phrases, and the extractive summary) along with
+the end-to-end ranking time, the throughput in tokens per second, and
+the peak memory allocated. Results can get written as JSON, then two
+of these JSON files compared, e.g., before and after a commit:
+
+    python -m bench.pipeline --sizes 1000 10000 100000 --output after.json
+    python -m bench.pipeline --compare before.json after.json --tolerance 0.1
+
+The bundled texts get parsed with a trained pipeline, which gets
+skipped when it is not installed; the parsing time is not included.
+"""
+
+import argparse
+import datetime
+import json
+import pathlib
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import typing
+
+import spacy  # type: ignore # pylint: disable=E0401
+from spacy.tokens import Doc  # type: ignore # pylint: disable=E0401
+
+import pytextrank
+from pytextrank.base import BaseTextRank, BaseTextRankFactory, Stage
+from pytextrank.biasedrank import BiasedTextRank, BiasedTextRankFactory
+from pytextrank.positionrank import PositionRankFactory
+from pytextrank.topicrank import TopicRankFactory
+
+from .synth import make_doc
+
+
+REPO_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent
+
+ALGORITHMS: typing.Dict[str, typing.Type[BaseTextRankFactory]] = {
+    "textrank": BaseTextRankFactory,
+    "positionrank": PositionRankFactory,
+    "biasedtextrank": BiasedTextRankFactory,
+    "topicrank": TopicRankFactory,
+}
+
+STAGES: typing.List[str] = [ "graph", "pagerank", "phrases", "summary" ]
+
+# the stages reported by *TopicRank* to build its graph of topics
+STAGE_GROUPS: typing.Dict[str, str] = {
+    "candidates": "graph",
+    "cluster": "graph",
+}
+
+# measures which get compared between runs, where higher is worse
+MEASURES: typing.List[str] = [ *STAGES, "rank", "peak_mem" ]
+
+# the largest documents to benchmark per algorithm, by number of
+# tokens, where *TopicRank* clusters its candidates pairwise so its
+# memory use grows quadratically on large documents
+TOKEN_LIMITS: typing.Dict[str, int] = {
+    "topicrank": 30000,
+}
+
+# the focus used for *Biased TextRank*, as the most frequent nouns in
+# the synthetic documents
+BIASED_FOCUS: str = "term00000 term00001"
+
+
+def run_stages (
+    tr: BaseTextRank,
+    ) -> typing.Dict[str, float]:
+    """
+Rank a document and summarize it, with an observer which times each
+stage.
+
+    tr:
+the `pytextrank` component of a document
+
+    returns:
+elapsed time in seconds per stage
+    """
+    elapsed: typing.Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+
+    def observe (doc: Doc, stage: Stage) -> None:  # pylint: disable=W0613
+        elapsed[STAGE_GROUPS.get(stage.name, stage.name)] += stage.elapsed
+
+    tr.observer = observe
+
+    try:
+        tr.doc._.phrases = tr.calc_textrank()
+        list(tr.summary())
+    finally:
+        tr.observer = None
+
+    return elapsed
+
+
+def measure_peak (
+    tr: BaseTextRank,
+    ) -> int:
+    """
+Measure the peak memory allocated while ranking a document and
+summarizing it.
+
+    tr:
+the `pytextrank` component of a document
+
+    returns:
+peak allocation in bytes, relative to the allocation beforehand
+    """
+    tr.reset()
+
+    tracemalloc.start()
+    base_mem, _ = tracemalloc.get_traced_memory()
+
+    try:
+        tr.doc._.phrases = tr.calc_textrank()
+        list(tr.summary())
+        _, peak_mem = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak_mem - base_mem
+
+
+def bench_doc (
+    algorithm: str,
+    doc: Doc,
+    repeat: int,
+    ) -> typing.Dict[str, typing.Any]:
+    """
+Benchmark one algorithm on one document, reporting the best time of
+several runs for each stage.
+
+    algorithm:
+name of the algorithm, as a key in `ALGORITHMS`
+
+    doc:
+an annotated document
+
+    repeat:
+number of timing runs
+
+    returns:
+the measures for this document
+    """
+    t0 = time.perf_counter()
+    ALGORITHMS[algorithm]()(doc)
+    component = time.perf_counter() - t0
+
+    tr = doc._.textrank
+
+    if isinstance(tr, BiasedTextRank):
+        tr.change_focus(BIASED_FOCUS, bias=10.0, default_bias=0.0)
+
+    stages = [ run_stages(tr) for _ in range(repeat) ]
+    ranks = []
+
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        tr.calc_textrank()
+        ranks.append(time.perf_counter() - t0)
+
+    rank = min(ranks)
+
+    return {
+        "algorithm": algorithm,
+        "tokens": len(doc),
+        "nodes": len(tr.node_list),
+        "phrases": len(doc._.phrases),
+        **{
+            stage: min(elapsed[stage] for elapsed in stages)
+            for stage in STAGES
+        },
+        "component": component,
+        "rank": rank,
+        "throughput": len(doc) / rank if rank > 0.0 else 0.0,
+        "peak_mem": measure_peak(tr),
+    }
+
+
+def load_docs (
+    texts: typing.List[pathlib.Path],
+    sizes: typing.List[int],
+    model: str,
+    ) -> typing.Iterator[typing.Tuple[str, Doc]]:
+    """
+Load the documents to benchmark, parsing the texts only if the trained
+pipeline is installed.
+
+    texts:
+paths of text files
+
+    sizes:
+numbers of tokens for the synthetic documents
+
+    model:
+name of the trained pipeline used to parse the texts
+
+    yields:
+the name and document for each input
+    """
+    if texts:
+        try:
+            nlp = spacy.load(model)
+        except OSError:
+            print("skipping texts: cannot load {}".format(model), file=sys.stderr)
+        else:
+            for path in texts:
+                yield path.name, nlp(path.read_text())
+
+    for n_tokens in sizes:
+        yield "synth-{}".format(n_tokens), make_doc(n_tokens)
+
+
+def get_meta () -> typing.Dict[str, str]:
+    """
+Describe the environment for a benchmark run.
+
+    returns:
+the commit, library versions, and platform
+    """
+    try:
+        commit = subprocess.run(
+            [ "git", "rev-parse", "--short", "HEAD" ],
+            cwd=REPO_DIR,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+
+    return {
+        "commit": commit,
+        "time": datetime.datetime.now().isoformat(timespec="seconds"),
+        "pytextrank": pytextrank.__version__,
+        "spacy": spacy.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def run (
+    algorithms: typing.List[str],
+    texts: typing.List[pathlib.Path],
+    sizes: typing.List[int],
+    model: str,
+    repeat: int,
+    limits: typing.Dict[str, int],
+    ) -> typing.Dict[str, typing.Any]:
+    """
+Benchmark each of the algorithms on each of the documents, printing
+a table of the results along the way.
+
+    algorithms:
+names of the algorithms
+
+    texts:
+paths of text files
+
+    sizes:
+numbers of tokens for the synthetic documents
+
+    model:
+name of the trained pipeline used to parse the texts
+
+    repeat:
+number of timing runs
+
+    limits:
+the largest documents to benchmark per algorithm, by number of tokens
+
+    returns:
+the benchmark metadata and results, ready to serialize as JSON
+    """
+    print("{:>16}  {:>14}  {:>8}  {}  {:>9}  {:>10}  {:>9}".format(
+        "input", "algorithm", "tokens", "  ".join("{:>9}".format(stage) for stage in STAGES),
+        "rank (ms)", "tokens/s", "peak (MB)",
+    ))
+
+    results = []
+
+    for name, doc in load_docs(texts, sizes, model):
+        for algorithm in algorithms:
+            if len(doc) > limits.get(algorithm, len(doc)):
+                print("skipping {} on {}: over {} tokens".format(algorithm, name, limits[algorithm]), file=sys.stderr)
+                continue
+
+            result = { "input": name, **bench_doc(algorithm, doc, repeat) }
+            results.append(result)
+
+            print("{:>16}  {:>14}  {:>8}  {}  {:>9.2f}  {:>10.0f}  {:>9.2f}".format(
+                name, algorithm, result["tokens"],
+                "  ".join("{:>9.2f}".format(result[stage] * 1000.0) for stage in STAGES),
+                result["rank"] * 1000.0, result["throughput"], result["peak_mem"] / 2**20,
+            ))
+
+    return {
+        "meta": get_meta(),
+        "results": results,
+    }
+
+
+def compare (
+    before: typing.Dict[str, typing.Any],
+    after: typing.Dict[str, typing.Any],
+    tolerance: float,
+    ) -> int:
+    """
+Compare two benchmark runs, printing the ratio of each measure.
+
+    before:
+results of the baseline run
+
+    after:
+results of the run to check
+
+    tolerance:
+relative increase allowed in any measure before it gets flagged as a regression
+
+    returns:
+the number of regressions
+    """
+    baseline = {
+        (result["input"], result["algorithm"]): result
+        for result in before["results"]
+    }
+
+    print("comparing {} to {}".format(before["meta"]["commit"] or "?", after["meta"]["commit"] or "?"))
+    print("{:>16}  {:>14}  {:>9}  {:>12}  {:>12}  {:>7}".format("input", "algorithm", "measure", "before", "after", "ratio"))
+
+    regressions = 0
+
+    for result in after["results"]:
+        old = baseline.get((result["input"], result["algorithm"]))
+
+        if old is None:
+            continue
+
+        for measure in MEASURES:
+            ratio = result[measure] / old[measure] if old[measure] > 0 else 1.0
+            flag = ""
+
+            if ratio > 1.0 + tolerance:
+                flag = "  regression"
+                regressions += 1
+
+            print("{:>16}  {:>14}  {:>9}  {:>12.6g}  {:>12.6g}  {:>6.2f}x{}".format(
+                result["input"], result["algorithm"], measure, old[measure], result[measure], ratio, flag,
+            ))
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS), default=list(ALGORITHMS), help="algorithms to benchmark")
+    parser.add_argument("--texts", type=pathlib.Path, nargs="*", default=sorted(REPO_DIR.glob("dat/*.txt")), help="text files to benchmark")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[ 1000, 10000, 100000 ], help="numbers of tokens for the synthetic documents, up to 1000000")
+    parser.add_argument("--model", default="en_core_web_sm", help="trained pipeline used to parse the texts")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timing runs")
+    parser.add_argument("--no-limits", action="store_true", help="ignore the per-algorithm limits on document size")
+    parser.add_argument("--output", type=pathlib.Path, help="write the results as JSON to this file")
+    parser.add_argument("--compare", type=pathlib.Path, nargs=2, metavar=("BEFORE", "AFTER"), help="compare two JSON results instead of running")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="relative increase flagged as a regression when comparing")
+    args = parser.parse_args()
+
+    if args.compare:
+        before_run, after_run = [ json.loads(path.read_text()) for path in args.compare ]
+        sys.exit(1 if compare(before_run, after_run, args.tolerance) else 0)
+
+    report = run(args.algorithms, args.texts, args.sizes, args.model, args.repeat, {} if args.no_limits else TOKEN_LIMITS)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# see license https://github.com/DerwenAI/pytextrank#license-and-copyright
+
+"""
+Fit the empirical complexity of the stages of `pytextrank` which
+depend on the shape of a document, by varying one statistic of the
+synthetic documents at a time and timing each stage:
+
+  * `edge_list` for the lemma graph of `BaseTextRank`
+  * `calc_sent_dist` for the extractive summary
+  * `cluster` for the candidates of `TopicRank`
+  * `topic_edge_list` for the complete graph of `TopicRank`
+
+The exponent of each stage gets fitted as the slope of the log-log
+regression of time over the varied statistic, and any stage growing
+faster than linearly (beyond the tolerance) gets flagged, with a
+non-zero exit status.
+
+    python -m bench.scaling --axis sentences --values 100 200 400 800 1600
+    python -m bench.scaling --axis lookback --values 2 4 8 16
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import time
+import typing
+
+import numpy as np  # type: ignore # pylint: disable=E0401
+
+from pytextrank.base import BaseTextRankFactory
+from pytextrank.topicrank import TopicRankFactory
+
+from .synth import make_doc
+
+
+STAGES: typing.List[str] = [ "edge_list", "calc_sent_dist", "cluster", "topic_edge_list" ]
+
+# the statistics of a document held fixed, while one gets varied
+DEFAULTS: typing.Dict[str, typing.Any] = {
+    "sentences": 400,
+    "sent_len": 15,
+    "vocab": 1000,
+    "density": 0.7,
+    "lookback": 3,
+}
+
+# the values to use along each axis, by default
+AXES: typing.Dict[str, typing.List[typing.Any]] = {
+    "sentences": [ 100, 200, 400, 800, 1600 ],
+    "sent_len": [ 8, 15, 30, 60, 120 ],
+    "vocab": [ 100, 300, 1000, 3000, 10000 ],
+    "density": [ 0.2, 0.4, 0.6, 0.8, 1.0 ],
+    "lookback": [ 1, 2, 4, 8, 16 ],
+}
+
+# the number of top-ranked phrases used to measure sentence distances
+LIMIT_PHRASES: int = 10
+
+
+def best_time (
+    func: typing.Callable[[], typing.Any],
+    repeat: int,
+    ) -> float:
+    """
+Time a function.
+
+    func:
+the function to call without arguments
+
+    repeat:
+number of timing runs
+
+    returns:
+the best time in seconds
+    """
+    timings = []
+
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+
+    return min(timings)
+
+
+def measure (
+    stats: typing.Dict[str, typing.Any],
+    repeat: int,
+    ) -> typing.Dict[str, float]:
+    """
+Time each stage on a synthetic document with the given statistics.
+
+    stats:
+the document statistics, with the same keys as `DEFAULTS`
+
+    repeat:
+number of timing runs
+
+    returns:
+the best time in seconds per stage
+    """
+    doc = make_doc(
+        stats["sentences"] * stats["sent_len"],
+        sent_len = stats["sent_len"],
+        vocab_size = stats["vocab"],
+        chunk_density = stats["density"],
+        )
+
+    tr = BaseTextRankFactory(token_lookback=stats["lookback"])(doc)._.textrank
+
+    timings: typing.Dict[str, float] = {
+        "edge_list": best_time(lambda: tr.edge_list, repeat),
+        "calc_sent_dist": best_time(lambda: tr.calc_sent_dist(LIMIT_PHRASES), repeat),
+    }
+
+    topic_tr = TopicRankFactory(token_lookback=stats["lookback"])(doc)._.textrank
+    candidates = topic_tr._get_candidates()  # pylint: disable=W0212
+
+    timings["cluster"] = best_time(lambda: topic_tr._cluster(candidates), repeat)  # pylint: disable=W0212
+    timings["topic_edge_list"] = best_time(lambda: topic_tr.edge_list, repeat)
+
+    return timings
+
+
+def fit_exponent (
+    values: typing.List[float],
+    timings: typing.List[float],
+    ) -> float:
+    """
+Fit the exponent `k` of `time ~ value ** k`, as the slope of a least
+squares line in log-log space.
+
+    values:
+the varied statistic
+
+    timings:
+the time measured at each value
+
+    returns:
+the fitted exponent
+    """
+    slope, _ = np.polyfit(np.log(values), np.log(np.maximum(timings, 1e-9)), 1)
+    return float(slope)
+
+
+def run (
+    axis: str,
+    values: typing.List[typing.Any],
+    repeat: int,
+    tolerance: float,
+    ) -> typing.Dict[str, typing.Any]:
+    """
+Vary one statistic of the synthetic documents, then fit the exponent
+of each stage, printing the timings along the way.
+
+    axis:
+the statistic to vary, as a key in `DEFAULTS`
+
+    values:
+the values to use for that statistic
+
+    repeat:
+number of timing runs
+
+    tolerance:
+how far above `1.0` an exponent can be before the stage gets flagged as super-linear
+
+    returns:
+the timings per value and the fitted exponents per stage
+    """
+    print("{:>10}  {}".format(axis, "  ".join("{:>15}".format(stage) for stage in STAGES)))
+
+    points = []
+
+    for value in values:
+        timings = measure({ **DEFAULTS, axis: value }, repeat)
+        points.append({ "value": value, **timings })
+
+        print("{:>10}  {}".format(value, "  ".join("{:>12.3f} ms".format(timings[stage] * 1000.0) for stage in STAGES)))
+
+    exponents = {
+        stage: fit_exponent([ point["value"] for point in points ], [ point[stage] for point in points ])
+        for stage in STAGES
+    }
+
+    flagged = [ stage for stage in STAGES if exponents[stage] > 1.0 + tolerance ]
+
+    print("{:>10}  {}".format("exponent", "  ".join("{:>15.2f}".format(exponents[stage]) for stage in STAGES)))
+
+    for stage in flagged:
+        print("super-linear in {}: {} (exponent {:.2f})".format(axis, stage, exponents[stage]))
+
+    return {
+        "axis": axis,
+        "fixed": { key: val for key, val in DEFAULTS.items() if key != axis },
+        "points": points,
+        "exponents": exponents,
+        "flagged": flagged,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--axis", choices=list(AXES), default="sentences", help="document statistic to vary")
+    parser.add_argument("--values", type=float, nargs="+", help="values for the statistic; defaults depend on the axis")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timing runs")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed excess of an exponent over 1.0")
+    parser.add_argument("--output", type=pathlib.Path, help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    axis_values = AXES[args.axis]
+
+    if args.values:
+        axis_values = [ value if args.axis == "density" else int(value) for value in args.values ]
+
+    report = run(args.axis, axis_values, args.repeat, args.tolerance)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    sys.exit(1 if report["flagged"] else 0)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# see license https://github.com/DerwenAI/pytextrank#license-and-copyright
+
+"""
+Generate synthetic documents of any size, as `spaCy` documents which
+already carry the annotations that `pytextrank` uses: POS tags, lemmas,
+a dependency parse for `noun_chunks`, sentence starts, and named
+entities. No trained pipeline is needed.
+
+The number of tokens, the sentence length, the vocabulary size, and
+the density of noun chunks can each get varied independently. Each
+sentence starts with a noun phrase and its root verb, followed by a
+mix of noun phrases "the ADJ* NOUN? NOUN" and other tokens, where the
+nouns get drawn from a Zipf-distributed vocabulary and some of the
+heads are proper nouns marked as entities.
+
+    python -m bench.synth --tokens 100 --sent-len 12 --vocab 500 --density 0.5
+"""
+
+import argparse
+import itertools
+import math
+import random
+import typing
+
+import spacy  # type: ignore # pylint: disable=E0401
+from spacy.tokens import Doc, Span  # type: ignore # pylint: disable=E0401
+from spacy.vocab import Vocab  # type: ignore # pylint: disable=E0401
+
+
+ADJECTIVES: typing.List[str] = [
+    "big", "deep", "early", "fast", "general", "linear", "local", "natural",
+    "new", "open", "random", "simple", "small", "strong", "total", "useful",
+]
+
+VERBS: typing.List[str] = [
+    "build", "describe", "find", "improve", "include", "measure", "rank", "use",
+]
+
+# tokens which are not part of noun phrases, as `(word, pos, dep)`
+FILLERS: typing.List[typing.Tuple[str, str, str]] = [
+    ("also", "ADV", "advmod"),
+    ("and", "CCONJ", "cc"),
+    ("for", "ADP", "prep"),
+    ("in", "ADP", "prep"),
+    ("often", "ADV", "advmod"),
+    ("with", "ADP", "prep"),
+]
+
+# the expected number of tokens in a noun phrase: the determiner, zero
+# to two adjectives, zero or one compound noun, and the head
+_PHRASE_LEN: float = 3.5
+
+_VOCAB: typing.Optional[Vocab] = None
+
+
+def get_vocab () -> Vocab:
+    """
+Get the vocabulary shared by the synthetic documents, from a blank
+English pipeline.
+
+    returns:
+a `spaCy` vocabulary
+    """
+    global _VOCAB  # pylint: disable=W0603
+
+    if _VOCAB is None:
+        _VOCAB = spacy.blank("en").vocab
+
+    return _VOCAB
+
+
+def make_doc (
+    n_tokens: int,
+    *,
+    sent_len: int = 15,
+    vocab_size: typing.Optional[int] = None,
+    chunk_density: float = 0.7,
+    propn_ratio: float = 0.1,
+    seed: int = 0,
+    ) -> Doc:
+    """
+Generate a synthetic document.
+
+    n_tokens:
+number of tokens, rounded up to complete the last sentence
+
+    sent_len:
+mean number of tokens per sentence, where sentence lengths vary uniformly within half of that on either side
+
+    vocab_size:
+number of distinct nouns; defaults to growing with the square root of the number of tokens, following *Heaps' law*
+
+    chunk_density:
+expected fraction of the tokens which belong to noun chunks, up to `1.0`; since each sentence has a subject phrase, a root verb, and final punctuation, short sentences narrow the range which can be reached
+
+    propn_ratio:
+probability for a phrase head to be a proper noun, which also gets marked as a named entity
+
+    seed:
+seed for the random number generator
+
+    returns:
+an annotated document
+    """
+    if not 0.0 < chunk_density <= 1.0:
+        raise ValueError("chunk density must be within (0.0, 1.0]: {}".format(chunk_density))
+
+    rng = random.Random(seed)
+
+    if vocab_size is None:
+        vocab_size = max(10, int(10.0 * math.sqrt(n_tokens)))
+
+    nouns = [ "term{:05d}".format(i) for i in range(vocab_size) ]
+    names = [ "Name{:04d}".format(i) for i in range(max(1, vocab_size // 10)) ]
+    noun_weights = list(itertools.accumulate(1.0 / rank for rank in range(1, vocab_size + 1)))
+
+    words: typing.List[str] = []
+    lemmas: typing.List[str] = []
+    pos: typing.List[str] = []
+    deps: typing.List[str] = []
+    heads: typing.List[int] = []
+    sent_starts: typing.List[bool] = []
+    ents: typing.List[typing.Tuple[int, int]] = []
+
+    def add (word: str, lemma: str, tag: str, dep: str, head: int) -> int:
+        words.append(word)
+        lemmas.append(lemma)
+        pos.append(tag)
+        deps.append(dep)
+        heads.append(head)
+        sent_starts.append(False)
+        return len(words) - 1
+
+    def add_phrase (dep: str) -> int:
+        # modifiers get attached to the head, which is the next token
+        # after them, so the head index is known in advance
+        n_adj = rng.randint(0, 2)
+        n_compound = rng.randint(0, 1)
+        head = len(words) + 1 + n_adj + n_compound
+
+        add("the", "the", "DET", "det", head)
+
+        for adj in rng.sample(ADJECTIVES, n_adj):
+            add(adj, adj, "ADJ", "amod", head)
+
+        for noun in rng.choices(nouns, cum_weights=noun_weights, k=n_compound):
+            add(noun, noun, "NOUN", "compound", head)
+
+        if rng.random() < propn_ratio:
+            name = rng.choice(names)
+            add(name, name, "PROPN", dep, head)
+            ents.append((head, head + 1))
+        else:
+            noun = rng.choices(nouns, cum_weights=noun_weights)[0]
+            add(noun + "s", noun, "NOUN", dep, head)
+
+        return head
+
+    while len(words) < n_tokens:
+        sent_start = len(words)
+        length = rng.randint((sent_len + 1) // 2, max(2, sent_len + sent_len // 2))
+        sent_end = sent_start + length - 1
+
+        # probability for each of the remaining units to be a noun
+        # phrase rather than a single other token, such that the
+        # expected fraction of tokens in noun phrases matches the
+        # density, counting the subject phrase, verb and punctuation
+        body_len = length - _PHRASE_LEN - 2.0
+        body_density = min(max((chunk_density * length - _PHRASE_LEN) / body_len, 0.0), 1.0) if body_len > 0.0 else 0.0
+        chunk_prob = body_density / (_PHRASE_LEN - (_PHRASE_LEN - 1.0) * body_density)
+
+        # the phrase heads and other tokens attach to the root verb
+        attached = [ add_phrase("nsubj") ]
+        verb = rng.choice(VERBS)
+        root = add(verb + "s", verb, "VERB", "ROOT", -1)
+
+        while len(words) < sent_end:
+            if rng.random() < chunk_prob:
+                attached.append(add_phrase("dobj"))
+            else:
+                word, tag, dep = rng.choice(FILLERS)
+                attached.append(add(word, word, tag, dep, -1))
+
+        attached.append(add(".", ".", "PUNCT", "punct", -1))
+
+        for i in attached:
+            heads[i] = root
+
+        heads[root] = root
+        sent_starts[sent_start] = True
+
+    doc = Doc(
+        get_vocab(),
+        words = words,
+        spaces = [ True ] * (len(words) - 1) + [ False ],
+        lemmas = lemmas,
+        pos = pos,
+        deps = deps,
+        heads = heads,
+        sent_starts = sent_starts,
+        )
+
+    doc.ents = [ Span(doc, start, end, label="ORG") for start, end in ents ]
+    return doc
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=100, help="number of tokens")
+    parser.add_argument("--sent-len", type=int, default=15, help="mean number of tokens per sentence")
+    parser.add_argument("--vocab", type=int, default=None, help="number of distinct nouns")
+    parser.add_argument("--density", type=float, default=0.7, help="fraction of tokens in noun chunks")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the random number generator")
+    args = parser.parse_args()
+
+    sample = make_doc(
+        args.tokens,
+        sent_len = args.sent_len,
+        vocab_size = args.vocab,
+        chunk_density = args.density,
+        seed = args.seed,
+        )
+
+    for sent in sample.sents:
+        print(sent.text)
+        print("    noun chunks:", [ chunk.text for chunk in sent.noun_chunks ])
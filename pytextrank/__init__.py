@@ -11,7 +11,7 @@ import typing
 
 from spacy.language import Language  # type: ignore # pylint: disable=E0401
 
-from .base import BaseTextRankFactory, BaseTextRank, Lemma, Paragraph, Phrase, Sentence, VectorElem, StopWordsLike
+from .base import BaseTextRankFactory, BaseTextRank, Lemma, Paragraph, Phrase, PhraseTable, Sentence, SpanOffsets, Stage, VectorElem, StopWordsLike
 
 from .biasedrank import BiasedTextRankFactory, BiasedTextRank
 
@@ -19,7 +19,15 @@ from .positionrank import PositionRankFactory, PositionRank
 
 from .topicrank import TopicRankFactory, TopicRank
 
-from .util import groupby_apply, default_scrubber, maniacal_scrubber, split_grafs, filter_quotes
+from .corpus import CorpusTextRank, build_shard
+
+from .incremental import IncrementalTextRank
+
+from .streaming import StreamingTextRank
+
+from .snapshot import RankSnapshot
+
+from .util import groupby_apply, groupby_hash, pagerank_matrix, CacheInfo, LRUCache, default_scrubber, maniacal_scrubber, memoize_scrubber, split_grafs, filter_quotes
 
 from .version import get_repo_version, \
     __version__, __version_major__, __version_minor__, __version_patch__
@@ -34,12 +42,15 @@ _DEFAULT_CONFIG = {
     "token_lookback": BaseTextRankFactory._TOKEN_LOOKBACK,  # pylint: disable=W0212
     "scrubber": None,
     "stopwords": None,
+    "chunker": BaseTextRankFactory._CHUNKER,  # pylint: disable=W0212
+    "observer": None,
     }
 
 _TOPIC_DEFAULT_CONFIG = {
     **_DEFAULT_CONFIG,
     "threshold": TopicRankFactory._CLUSTER_THRESHOLD,  # pylint: disable=W0212
     "method": TopicRankFactory._CLUSTER_METHOD,  # pylint: disable=W0212
+    "cache_size": TopicRankFactory._CACHE_SIZE,  # pylint: disable=W0212
     }
 
 
@@ -56,6 +67,8 @@ try:
         token_lookback: int,
         scrubber: typing.Optional[typing.Callable],
         stopwords: typing.Optional[StopWordsLike],
+        chunker: str,
+        observer: typing.Optional[typing.Callable],
         ) -> BaseTextRankFactory:
         """
 Component factory for the `TextRank` base class.
@@ -66,6 +79,8 @@ Component factory for the `TextRank` base class.
             token_lookback = token_lookback,
             scrubber = scrubber,
             stopwords = stopwords,
+            chunker = chunker,
+            observer = observer,
         )
 
 
@@ -78,6 +93,8 @@ Component factory for the `TextRank` base class.
         token_lookback: int,
         scrubber: typing.Optional[typing.Callable],
         stopwords: typing.Optional[StopWordsLike],
+        chunker: str,
+        observer: typing.Optional[typing.Callable],
         ) -> PositionRankFactory:
         """
 Component factory for the `PositionRank` extended class.
@@ -88,6 +105,8 @@ Component factory for the `PositionRank` extended class.
             token_lookback = token_lookback,
             scrubber = scrubber,
             stopwords = stopwords,
+            chunker = chunker,
+            observer = observer,
         )
 
 
@@ -100,6 +119,8 @@ Component factory for the `PositionRank` extended class.
         token_lookback: int,
         scrubber: typing.Optional[typing.Callable],
         stopwords: typing.Optional[StopWordsLike],
+        chunker: str,
+        observer: typing.Optional[typing.Callable],
         ) -> BiasedTextRankFactory:
         """
 Component factory for the `BiasedTextRank` extended class.
@@ -110,6 +131,8 @@ Component factory for the `BiasedTextRank` extended class.
             token_lookback = token_lookback,
             scrubber = scrubber,
             stopwords = stopwords,
+            chunker = chunker,
+            observer = observer,
         )
 
 
@@ -122,8 +145,11 @@ Component factory for the `BiasedTextRank` extended class.
         token_lookback: int,
         scrubber: typing.Optional[typing.Callable],
         stopwords: typing.Optional[StopWordsLike],
+        chunker: str,
+        observer: typing.Optional[typing.Callable],
         threshold: float,
         method: str,
+        cache_size: int,
         ) -> TopicRankFactory:
         """
 Component factory for the `TopicRank` extended class.
@@ -134,8 +160,11 @@ Component factory for the `TopicRank` extended class.
             token_lookback = token_lookback,
             scrubber = scrubber,
             stopwords = stopwords,
+            chunker = chunker,
+            observer = observer,
             threshold = threshold,
             method = method,
+            cache_size = cache_size,
         )
 
 except Exception:  # pylint: disable=W0703
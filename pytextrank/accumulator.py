@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# see license https://github.com/DerwenAI/pytextrank#license-and-copyright
+
+"""
+Shared plumbing for ranking a *lemma graph* which gets accumulated from
+parsed documents that do not get kept.
+"""
+
+import typing
+
+from spacy.tokens import Doc, Span  # type: ignore # pylint: disable=E0401
+import numpy as np  # type: ignore # pylint: disable=E0401
+
+from .base import BaseTextRankFactory, BaseTextRank, Lemma, Phrase, StopWordsLike
+from .util import discounted_normalised_rank, groupby_hash
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import scipy.sparse as sp  # type: ignore # pylint: disable=E0401
+
+# the key of a distinct phrase chunk: its text, its node ids, its
+# length, and its count of tokens with parts of speech which are not kept
+ChunkKey = typing.Tuple[str, typing.Tuple[int, ...], int, int]
+
+
+class LemmaGraphAccumulator:
+    """
+Base class for `CorpusTextRank`, `IncrementalTextRank`, and
+`StreamingTextRank`, which accumulate the nodes, edges, and phrase
+chunks of parsed documents into one lemma graph.
+
+The nodes get interned into a vocabulary of ids, the documents get
+analyzed by a `BaseTextRank` with the same settings as a
+`BaseTextRankFactory`, and the node ranks get aggregated into phrase
+ranks the same as `BaseTextRank.calc_textrank()` does.
+    """
+
+    def __init__ (
+        self,
+        *,
+        edge_weight: float = BaseTextRankFactory._EDGE_WEIGHT,
+        pos_kept: typing.List[str] = None,
+        token_lookback: int = BaseTextRankFactory._TOKEN_LOOKBACK,
+        scrubber: typing.Optional[typing.Callable] = None,
+        stopwords: typing.Optional[StopWordsLike] = None,
+        chunker: str = BaseTextRankFactory._CHUNKER,
+        ) -> None:
+        """
+Constructor for the settings and the vocabulary, where the settings are
+the same as for `BaseTextRankFactory`.
+
+    edge_weight:
+default weight for an edge
+
+    pos_kept:
+parts of speech tags to be kept; adjust this if strings representing the POS tags change
+
+    token_lookback:
+the window for neighboring tokens – similar to a *skip gram*
+
+    scrubber:
+optional "scrubber" function to clean up punctuation from a token; if `None` then defaults to `pytextrank.default_scrubber`
+
+    stopwords:
+optional dictionary of `lemma: [pos]` items to define the *stop words*, where each item has a key as a lemmatized token and a value as a list of POS tags; may be a file name (string) or a [`pathlib.Path`](https://docs.python.org/3/library/pathlib.html) for a JSON file
+
+    chunker:
+how to find the candidate noun phrases: one of `"noun_chunks"`, `"pos"`, or `"auto"`
+        """
+        self.factory: BaseTextRankFactory = BaseTextRankFactory(
+            edge_weight = edge_weight,
+            pos_kept = pos_kept,
+            token_lookback = token_lookback,
+            scrubber = scrubber,
+            stopwords = stopwords,
+            chunker = chunker,
+        )
+
+        # the interned vocabulary of nodes
+        self.vocab: typing.Dict[Lemma, int] = {}
+        self.node_list: typing.List[Lemma] = []
+
+        # results of the latest ranking
+        self.ranks: typing.Dict[Lemma, float] = {}
+        self.phrases: typing.List[Phrase] = []
+
+
+    def _intern (
+        self,
+        node: Lemma,
+        ) -> int:
+        """
+Look up the id of a node in the vocabulary, adding it if needed.
+
+    node:
+a node of the lemma graph
+
+    returns:
+the node id
+        """
+        node_id = self.vocab.get(node)
+
+        if node_id is None:
+            node_id = len(self.node_list)
+            self.vocab[node] = node_id
+            self.node_list.append(node)
+
+        return node_id
+
+
+    def _analyze (
+        self,
+        doc: Doc,
+        ) -> BaseTextRank:
+        """
+Analyze one parsed document with the settings of `factory`, without
+ranking it.
+
+    doc:
+a document container, providing the annotations produced by the `spaCy` pipeline
+
+    returns:
+the lemma graph state of the document
+        """
+        return BaseTextRank(
+            doc,
+            edge_weight = self.factory.edge_weight,
+            pos_kept = self.factory.pos_kept,
+            token_lookback = self.factory.token_lookback,
+            scrubber = self.factory.scrubber,
+            stopwords = self.factory.stopwords,
+            chunker = self.factory.chunker,
+        )
+
+
+    def _doc_edges (
+        self,
+        tr: BaseTextRank,
+        ) -> typing.Dict[typing.Tuple[int, int], float]:
+        """
+Weigh each pair of nodes the same as the lemma graph of a document,
+where the last weight added for an edge wins.
+
+    tr:
+the lemma graph state of the document
+
+    returns:
+the weight of each edge, keyed by `(u, v)` with `u <= v`
+        """
+        doc_edges: typing.Dict[typing.Tuple[int, int], float] = {}
+
+        for node_u, node_v, attrs in tr.edge_list:
+            u = self._intern(node_u)
+            v = self._intern(node_v)
+            doc_edges[(u, v) if u <= v else (v, u)] = attrs["weight"]
+
+        return doc_edges
+
+
+    def _chunk_key (
+        self,
+        tr: BaseTextRank,
+        span: Span,
+        ) -> ChunkKey:
+        """
+Key a phrase chunk by everything needed to rank it once the document is
+gone.
+
+    tr:
+the lemma graph state of the document
+
+    span:
+a phrase chunk of the document
+
+    returns:
+the text, node ids, length, and count of tokens with parts of speech which are not kept
+        """
+        return (
+            tr.scrubber(span),
+            tuple(self._intern(Lemma(token.lemma_, token.pos_)) for token in span if tr._keep_token(token)),  # pylint: disable=W0212
+            len(span),
+            sum(1 for token in span if token.pos_ not in tr.pos_kept),
+        )
+
+
+    @staticmethod
+    def _symmetric_adjacency (
+        edge_u: np.ndarray,
+        edge_v: np.ndarray,
+        edge_weight: np.ndarray,
+        n_nodes: int,
+        ) -> "sp.csr_matrix":
+        """
+Build a symmetric sparse adjacency matrix from edge triplets with
+`u <= v`, where a self-loop only counts once.
+
+    edge_u:
+first node id of each edge
+
+    edge_v:
+second node id of each edge
+
+    edge_weight:
+weight of each edge
+
+    n_nodes:
+number of nodes
+
+    returns:
+the weighted adjacency matrix
+        """
+        import scipy.sparse as sp  # type: ignore # pylint: disable=C0415,E0401
+
+        off_diag = edge_u != edge_v
+
+        return sp.csr_matrix(
+            (
+                np.concatenate([ edge_weight, edge_weight[off_diag] ]),
+                (
+                    np.concatenate([ edge_u, edge_v[off_diag] ]),
+                    np.concatenate([ edge_v, edge_u[off_diag] ]),
+                ),
+            ),
+            shape=(n_nodes, n_nodes),
+        )
+
+
+    def _node_weights (
+        self,
+        personalization: typing.Optional[typing.Dict[Lemma, float]],
+        ) -> typing.Optional[np.ndarray]:
+        """
+Index the *node weights* for *Personalized PageRank* by node id.
+
+    personalization:
+optional *node weights*, where missing nodes get a weight of zero
+
+    returns:
+array of node weights, or `None` to use uniform weights
+        """
+        if personalization is None:
+            return None
+
+        return np.array([
+            personalization.get(node, 0.0)
+            for node in self.node_list
+        ], dtype=np.float64)
+
+
+    @staticmethod
+    def _group_chunks (
+        scores: np.ndarray,
+        chunks: typing.Dict[ChunkKey, typing.Any],
+        ) -> typing.List[typing.Tuple[str, float, typing.List[typing.Any]]]:
+        """
+Aggregate the node ranks into phrase ranks, the same as
+`BaseTextRank.calc_textrank()` does for the phrase spans of a document,
+where the rank of a phrase is the maximum rank of its chunks.
+
+    scores:
+array of ranks, indexed by node id
+
+    chunks:
+a value per distinct phrase chunk, e.g., its count of occurrences
+
+    returns:
+the text, rank, and chunk values of each phrase, in descending order of rank
+        """
+        keys = list(chunks)
+        n_chunks = len(keys)
+        node_ids = np.array([ node_id for key in keys for node_id in key[1] ], dtype=np.int64)
+
+        sum_rank = np.bincount(
+            np.repeat(np.arange(n_chunks), [ len(key[1]) for key in keys ]),
+            weights=scores[node_ids],
+            minlength=n_chunks,
+        )
+
+        chunk_ranks = discounted_normalised_rank(
+            np.array([ key[2] for key in keys ], dtype=np.float64),
+            np.array([ key[3] for key in keys ], dtype=np.float64),
+            sum_rank,
+        )
+
+        phrases = groupby_hash(
+            zip([ key[0] for key in keys ], chunk_ranks.tolist(), chunks.values()),
+            lambda x: x[0],
+            lambda g: list((rank, value) for text, rank, value in g),
+            sort_keys = True,
+        )
+
+        grouped = [
+            (text, max(rank for rank, value in group), [ value for rank, value in group ])
+            for text, group in phrases
+        ]
+
+        return sorted(grouped, key=lambda p: p[1], reverse=True)
@@ -7,6 +7,7 @@ Implements the base class for `TextRank` –
 with placeholder methods to be used by the subclasses for algorithm extensions.
 """
 
+from bisect import bisect_right
 from collections import Counter, defaultdict, OrderedDict
 from dataclasses import dataclass
 import json
@@ -15,25 +16,30 @@ import pathlib
 import time
 import typing
 
-from icecream import ic  # type: ignore # pylint: disable=E0401,W0611 # lgtm[py/unused-import]
+from spacy.attrs import POS, SENT_START  # type: ignore # pylint: disable=E0401
 from spacy.tokens import Doc, Span, Token  # type: ignore # pylint: disable=E0401
-import graphviz  # type: ignore # pylint: disable=E0401
-import networkx as nx  # type: ignore # pylint: disable=E0401
+import numpy as np  # type: ignore # pylint: disable=E0401
 
-from .util import groupby_apply, default_scrubber
+from .util import discounted_normalised_rank, groupby_hash, default_scrubber
 
-try:
-    import altair as alt  # type: ignore # pylint: disable=E0401
-    import pandas as pd  # type: ignore # pylint: disable=E0401
-except ImportError:
-    _has_altair_and_pandas = False
-else:
-    _has_altair_and_pandas = True
+# the graph, visualization, and debugging libraries get imported on
+# first use, to keep the startup cost of `import pytextrank` down
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import networkx as nx  # type: ignore # pylint: disable=E0401
 
 # parameter type annotation for a *stop words* source
 StopWordsLike = typing.Union[ str, pathlib.Path, typing.Dict[str, typing.List[str]] ]
 
 
+def _popcount (
+    bits: int
+    ) -> int:
+    """
+Count the bits set in a non-negative integer bitset.
+    """
+    return bin(bits).count("1")
+
+
 @dataclass(order=True, frozen=True)
 class Lemma:
     """
@@ -61,6 +67,8 @@ class Phrase:
     """
 A data class representing one ranked phrase.
     """
+    __slots__ = ( "text", "chunks", "count", "rank", )
+
     text: str
     chunks: typing.List[Span]
     count: int
@@ -72,6 +80,8 @@ class Sentence:
     """
 A data class representing the distance measure for one sentence.
     """
+    __slots__ = ( "start", "end", "sent_id", "phrases", "distance", )
+
     start: int
     end: int
     sent_id: int
@@ -113,6 +123,8 @@ class VectorElem:
     """
 A data class representing one element in the *unit vector* of the document.
     """
+    __slots__ = ( "phrase", "phrase_id", "coord", )
+
     phrase: Phrase
     phrase_id: int
     coord: float
@@ -123,12 +135,224 @@ class Paragraph:
     """
 A data class representing the distance measure for one paragraph.
     """
+    __slots__ = ( "start", "end", "para_id", "distance", )
+
     start: int
     end: int
     para_id: int
     distance: float
 
 
+class SpanOffsets (typing.NamedTuple):
+    """
+The token offsets of one phrase chunk within the source document, which
+stand in for a `spaCy` [`Span`](https://spacy.io/api/span) in the
+phrases ranked without the document, e.g., from a snapshot.
+    """
+    start: int
+    end: int
+
+
+class PhraseTable:
+    """
+A columnar table of ranked phrases: parallel arrays of their texts,
+ranks, and counts, plus the token offsets of their chunks in CSR form.
+For a large document this takes much less memory than the equivalent
+list of `Phrase` objects, which remains available as a view: indexing
+or iterating the table yields one `Phrase` per row.
+
+`RankSnapshot` fills a table directly from its arrays. The pipeline
+components still set `doc._.phrases` as a list of `Phrase` objects whose
+chunks are `Span` objects, since the summaries, `TopicRank`, and
+applications all use those spans; `from_phrases()` converts such a list
+into a table.
+    """
+
+    def __init__ (
+        self,
+        *,
+        text: np.ndarray,
+        rank: np.ndarray,
+        count: np.ndarray,
+        chunk_ptr: np.ndarray,
+        chunk_start: np.ndarray,
+        chunk_end: np.ndarray,
+        ) -> None:
+        """
+Constructor for a table of ranked phrases, in descending order.
+
+    text:
+text of each phrase
+
+    rank:
+rank of each phrase
+
+    count:
+number of chunks of each phrase
+
+    chunk_ptr:
+offsets into the chunk arrays for each phrase, in CSR form
+
+    chunk_start:
+start token offset of each chunk
+
+    chunk_end:
+end token offset of each chunk
+        """
+        self.text: np.ndarray = text
+        self.rank: np.ndarray = rank
+        self.count: np.ndarray = count
+        self.chunk_ptr: np.ndarray = chunk_ptr
+        self.chunk_start: np.ndarray = chunk_start
+        self.chunk_end: np.ndarray = chunk_end
+
+
+    @classmethod
+    def from_phrases (
+        cls,
+        phrases: typing.Sequence[Phrase],
+        ) -> "PhraseTable":
+        """
+Build a table from a list of ranked phrases.
+
+    phrases:
+ranked phrases, in descending order, whose chunks may be either `Span` or `SpanOffsets` objects
+
+    returns:
+the table of phrases
+        """
+        return cls(
+            text = np.array([ p.text for p in phrases ], dtype=str),
+            rank = np.array([ p.rank for p in phrases ], dtype=np.float64),
+            count = np.array([ p.count for p in phrases ], dtype=np.int64),
+            chunk_ptr = np.cumsum([ 0 ] + [ len(p.chunks) for p in phrases ], dtype=np.int64),
+            chunk_start = np.array([ chunk.start for p in phrases for chunk in p.chunks ], dtype=np.int64),
+            chunk_end = np.array([ chunk.end for p in phrases for chunk in p.chunks ], dtype=np.int64),
+        )
+
+
+    def __len__ (
+        self
+        ) -> int:
+        """
+Count the phrases in the table.
+
+    returns:
+number of phrases
+        """
+        return len(self.rank)
+
+
+    def __getitem__ (
+        self,
+        index: int,
+        ) -> Phrase:
+        """
+Accessor for the `Phrase` view of one row, where the chunks are
+`SpanOffsets` objects.
+
+    index:
+row of the phrase
+
+    returns:
+the ranked phrase
+        """
+        return self.phrase(index)
+
+
+    def __iter__ (
+        self
+        ) -> typing.Iterator[Phrase]:
+        """
+Iterate through the `Phrase` view of each row, in descending order.
+
+    yields:
+ranked phrases
+        """
+        for index in range(len(self)):
+            yield self.phrase(index)
+
+
+    def phrase (
+        self,
+        index: int,
+        doc: typing.Optional[Doc] = None,
+        ) -> Phrase:
+        """
+Build the `Phrase` view of one row.
+
+    index:
+row of the phrase
+
+    doc:
+optional source document; if given, the chunks are `Span` objects of this document, otherwise `SpanOffsets` objects
+
+    returns:
+the ranked phrase
+        """
+        if index < 0:
+            index += len(self)
+
+        lo = int(self.chunk_ptr[index])
+        hi = int(self.chunk_ptr[index + 1])
+        offsets = zip(self.chunk_start[lo:hi].tolist(), self.chunk_end[lo:hi].tolist())
+
+        return Phrase(
+            text = str(self.text[index]),
+            chunks = [ doc[start:end] if doc is not None else SpanOffsets(start, end) for start, end in offsets ],
+            count = int(self.count[index]),
+            rank = float(self.rank[index]),
+        )
+
+
+    def to_phrases (
+        self,
+        doc: typing.Optional[Doc] = None,
+        ) -> typing.List[Phrase]:
+        """
+Build the `Phrase` view of the whole table.
+
+    doc:
+optional source document; if given, the chunks are `Span` objects of this document, otherwise `SpanOffsets` objects
+
+    returns:
+list of ranked phrases, in descending order
+        """
+        return [ self.phrase(index, doc) for index in range(len(self)) ]
+
+
+    def columns (
+        self
+        ) -> typing.Dict[str, np.ndarray]:
+        """
+Accessor for the columns of phrase texts, counts, and ranks, e.g., to
+construct a `pandas.DataFrame`.
+
+    returns:
+a dictionary of the columns, by name
+        """
+        return {
+            "text": self.text,
+            "count": self.count,
+            "rank": self.rank,
+        }
+
+
+@dataclass
+class Stage:
+    """
+A data class describing one completed stage of a pipeline component,
+as passed to its observer: the stage name, its elapsed time in
+seconds, plus the counts of graph nodes, graph edges, and candidates
+(phrase spans, or sentences for the summary) where these apply.
+    """
+    name: str
+    elapsed: float
+    nodes: int = 0
+    edges: int = 0
+    candidates: int = 0
+
+
 class BaseTextRankFactory:
     """
 A factory class that provides the document with its instance of
@@ -138,6 +362,8 @@ A factory class that provides the document with its instance of
     _EDGE_WEIGHT: float = 1.0
     _POS_KEPT: typing.List[str] = ["ADJ", "NOUN", "PROPN", "VERB"]
     _TOKEN_LOOKBACK: int = 3
+    _CHUNKER: str = "noun_chunks"
+    _CHUNKERS: typing.Set[str] = set([ "noun_chunks", "pos", "auto" ])
 
 
     def __init__ (
@@ -148,6 +374,8 @@ A factory class that provides the document with its instance of
         token_lookback: int = _TOKEN_LOOKBACK,
         scrubber: typing.Optional[typing.Callable] = None,
         stopwords: typing.Optional[StopWordsLike] = None,
+        chunker: str = _CHUNKER,
+        observer: typing.Optional[typing.Callable] = None,
         ) -> None:
         """
 Constructor for a factory used to instantiate the PyTextRank pipeline components.
@@ -166,6 +394,12 @@ optional "scrubber" function to clean up punctuation from a token; if `None` the
 
     stopwords:
 optional dictionary of `lemma: [pos]` items to define the *stop words*, where each item has a key as a lemmatized token and a value as a list of POS tags; may be a file name (string) or a [`pathlib.Path`](https://docs.python.org/3/library/pathlib.html) for a JSON file; otherwise throws a `TypeError` exception
+
+    chunker:
+how to find the candidate noun phrases: `"noun_chunks"` uses the `noun_chunks` from the dependency parser; `"pos"` uses runs of adjectives, nouns, and proper nouns (as far as `pos_kept` includes them) which end in a noun or proper noun, which only requires a tagger plus sentence boundaries from a `senter` or `sentencizer`; `"auto"` uses `noun_chunks` when the document has a dependency parse and the language supports it, otherwise `"pos"`; defaults to `"noun_chunks"`; otherwise throws a `ValueError` exception
+
+    observer:
+optional function `observer(doc, stage)` which gets called at the end of each stage in `calc_textrank()`, `summary()`, and the *TopicRank* clustering, with a `Stage` describing the stage name, its elapsed time, and the counts of nodes, edges, and candidates; if `None` then the stages do not get timed
         """
         self.edge_weight: float = edge_weight
         self.token_lookback: int = token_lookback
@@ -185,6 +419,12 @@ optional dictionary of `lemma: [pos]` items to define the *stop words*, where ea
         else:
             self.stopwords = defaultdict(list)
 
+        if chunker not in self._CHUNKERS:
+            raise ValueError("unknown chunker: {}".format(chunker))
+
+        self.chunker: str = chunker
+        self.observer: typing.Optional[typing.Callable] = observer
+
 
     @classmethod
     def _load_stopwords (
@@ -248,6 +488,8 @@ a document container, providing the annotations produced by earlier stages of th
             token_lookback = self.token_lookback,
             scrubber = self.scrubber,
             stopwords = self.stopwords,
+            chunker = self.chunker,
+            observer = self.observer,
             )
 
         doc._.phrases = doc._.textrank.calc_textrank()
@@ -264,6 +506,11 @@ This class does not get called directly; instantiate its factory
 instead.
     """
 
+    # parts of speech which make up the noun phrases found by the
+    # `"pos"` chunker, and those which can end a noun phrase
+    _CHUNK_POS: typing.List[str] = [ "ADJ", "NOUN", "PROPN" ]
+    _CHUNK_HEAD_POS: typing.List[str] = [ "NOUN", "PROPN" ]
+
     def __init__ (
         self,
         doc: Doc,
@@ -272,6 +519,8 @@ instead.
         token_lookback: int,
         scrubber: typing.Callable,
         stopwords: typing.Dict[str, typing.List[str]],
+        chunker: str = BaseTextRankFactory._CHUNKER,
+        observer: typing.Optional[typing.Callable] = None,
         ) -> None:
         """
 Constructor for a `TextRank` object.
@@ -293,6 +542,12 @@ optional "scrubber" function to clean up punctuation from a token
 
     stopwords:
 optional dictionary of `lemma: [pos]` items to define the *stop words*, where each item has a key as a lemmatized token and a value as a list of POS tags
+
+    chunker:
+how to find the candidate noun phrases: one of `"noun_chunks"`, `"pos"`, or `"auto"`
+
+    observer:
+optional function `observer(doc, stage)` to call at the end of each stage with a `Stage` description
         """
         self.doc: Doc = doc
         self.edge_weight: float = edge_weight
@@ -300,6 +555,8 @@ optional dictionary of `lemma: [pos]` items to define the *stop words*, where ea
         self.pos_kept: typing.List[str] = pos_kept
         self.scrubber: typing.Callable = scrubber
         self.stopwords: typing.Dict[str, typing.List[str]] = stopwords
+        self.chunker: str = chunker
+        self.observer: typing.Optional[typing.Callable] = observer
 
         # internal data for BiasedTextRank
         self.focus_tokens: typing.Set[str] = set()
@@ -308,8 +565,10 @@ optional dictionary of `lemma: [pos]` items to define the *stop words*, where ea
 
         # effectively, performs the same work as the `reset()` method;
         # called explicitly here for the sake of type annotations
+        import networkx as nx  # type: ignore # pylint: disable=C0415,E0401
+
         self.elapsed_time: float = 0.0
-        self.lemma_graph: nx.Graph = nx.Graph()
+        self.lemma_graph: "nx.Graph" = nx.Graph()
         self.phrases: typing.List[Phrase] = []
         self.ranks: typing.Dict[Lemma, float] = {}
         self.seen_lemma: typing.Dict[Lemma, typing.Set[int]] = OrderedDict()
@@ -322,6 +581,8 @@ optional dictionary of `lemma: [pos]` items to define the *stop words*, where ea
 Reinitialize the data structures needed for extracting phrases,
 removing any pre-existing state.
         """
+        import networkx as nx  # type: ignore # pylint: disable=C0415,E0401
+
         self.elapsed_time = 0.0
         self.lemma_graph = nx.Graph()
         self.phrases = []
@@ -342,10 +603,24 @@ This method represents the heart of the *TextRank* algorithm.
     returns:
 list of ranked phrases, in descending order
         """
+        import networkx as nx  # type: ignore # pylint: disable=C0415,E0401
+
         t0 = time.time()
         self.reset()
+
+        # the stages only get timed for an observer
+        t_stage: float = time.perf_counter() if self.observer is not None else 0.0
+
         self.lemma_graph = self._construct_graph()
 
+        if self.observer is not None:
+            t_stage = self._observe(
+                "graph",
+                t_stage,
+                nodes = self.lemma_graph.number_of_nodes(),
+                edges = self.lemma_graph.number_of_edges(),
+            )
+
         # to run the algorithm, we use the NetworkX implementation
         # for PageRank (i.e., based on eigenvector centrality)
         # to calculate a rank for each node in the lemma graph
@@ -354,21 +629,14 @@ list of ranked phrases, in descending order
             personalization = self.get_personalization(),
             )
 
+        if self.observer is not None:
+            t_stage = self._observe("pagerank", t_stage, nodes=len(self.ranks))
+
         # agglomerate the lemmas ranked in the lemma graph into ranked
         # phrases, leveraging information from earlier stages of the
         # pipeline: noun chunks and named entities
-        nc_phrases: typing.Dict[Span, float] = {}
-
-        try:
-            nc_phrases = self._collect_phrases(self.doc.noun_chunks, self.ranks)
-        except NotImplementedError as ex:
-            # some languages don't have `noun_chunks` support in spaCy models, e.g. "ru"
-            ic.disable()
-            ic(ex)
-            ic.enable()
-
-        ent_phrases: typing.Dict[Span, float] = self._collect_phrases(self.doc.ents, self.ranks)
-        all_phrases: typing.Dict[Span, float] = { **nc_phrases, **ent_phrases }
+        phrase_spans: typing.List[Span] = self._get_phrase_spans()
+        all_phrases: typing.Dict[Span, float] = self._collect_phrases(phrase_spans, self.ranks)
 
         # since noun chunks can be expressed in different ways (e.g., may
         # have articles or prepositions), we need to find a minimum span
@@ -376,12 +644,57 @@ list of ranked phrases, in descending order
         raw_phrase_list: typing.List[Phrase] = self._get_min_phrases(all_phrases)
         phrase_list: typing.List[Phrase] = sorted(raw_phrase_list, key=lambda p: p.rank, reverse=True)
 
+        if self.observer is not None:
+            self._observe("phrases", t_stage, candidates=len(phrase_spans))
+
         t1 = time.time()
         self.elapsed_time = (t1 - t0) * 1000.0
 
         return phrase_list
 
 
+    def _observe (
+        self,
+        name: str,
+        t_stage: float,
+        *,
+        nodes: int = 0,
+        edges: int = 0,
+        candidates: int = 0,
+        ) -> float:
+        """
+Report the end of a stage to the observer, which must not be `None`.
+
+    name:
+name of the stage
+
+    t_stage:
+value of `time.perf_counter()` when the stage started
+
+    nodes:
+number of nodes in the graph, if any
+
+    edges:
+number of edges in the graph, if any
+
+    candidates:
+number of candidate phrases or sentences, if any
+
+    returns:
+the start time for the next stage, which excludes the time spent by the observer
+        """
+        stage: Stage = Stage(
+            name = name,
+            elapsed = time.perf_counter() - t_stage,
+            nodes = nodes,
+            edges = edges,
+            candidates = candidates,
+        )
+
+        self.observer(self.doc, stage)  # type: ignore
+        return time.perf_counter()
+
+
     def get_personalization (  # pylint: disable=R0201
         self
         ) -> typing.Optional[typing.Dict[Lemma, float]]:
@@ -400,7 +713,7 @@ Defaults to a no-op for the base *TextRank* algorithm.
 
     def _construct_graph (
         self
-        ) -> nx.Graph:
+        ) -> "nx.Graph":
         """
 Construct the
 [*lemma graph*](https://derwen.ai/docs/ptr/glossary/#lemma-graph).
@@ -408,6 +721,8 @@ Construct the
     returns:
 a directed graph representing the lemma graph
         """
+        import networkx as nx  # type: ignore # pylint: disable=C0415,E0401
+
         g = nx.Graph()
 
         # add nodes made of Lemma(lemma, pos)
@@ -520,6 +835,94 @@ list of weighted edges
         return weighted_edges
 
 
+    def _get_phrase_spans (
+        self
+        ) -> typing.List[Span]:
+        """
+Collect the spans which get ranked as phrases: the noun chunks followed
+by the named entities, without duplicates.
+
+    returns:
+list of phrase spans, in order
+        """
+        return list(dict.fromkeys([ *self._get_noun_chunks(), *self.doc.ents ]))
+
+
+    def _get_noun_chunks (
+        self
+        ) -> typing.List[Span]:
+        """
+Find the candidate noun phrases, using the `chunker` mode.
+
+    returns:
+list of noun phrase spans, in order
+        """
+        if self.chunker == "pos" or (self.chunker == "auto" and not self.doc.has_annotation("DEP")):
+            return self._get_pos_chunks()
+
+        try:
+            return list(self.doc.noun_chunks)
+        except NotImplementedError as ex:
+            if self.chunker == "auto":
+                return self._get_pos_chunks()
+
+            # some languages don't have `noun_chunks` support in spaCy models, e.g. "ru"
+            from icecream import ic  # type: ignore # pylint: disable=C0415,E0401
+
+            ic.disable()
+            ic(ex)
+            ic.enable()
+
+        return []
+
+
+    def _get_pos_chunks (
+        self
+        ) -> typing.List[Span]:
+        """
+Find the candidate noun phrases from the part-of-speech tags alone,
+without a dependency parse: each maximal run of tokens within a sentence
+tagged with one of `_CHUNK_POS` (as far as `pos_kept` includes them),
+trimmed to end at its last token tagged with one of `_CHUNK_HEAD_POS`.
+
+    returns:
+list of noun phrase spans, in order
+        """
+        strings = self.doc.vocab.strings
+        chunk_ids = [ strings[pos] for pos in self._CHUNK_POS if pos in self.pos_kept ]
+        head_ids = [ strings[pos] for pos in self._CHUNK_HEAD_POS if pos in self.pos_kept ]
+
+        n_tokens = len(self.doc)
+        tags = self.doc.to_array(POS)
+        in_chunk = np.isin(tags, chunk_ids)
+        positions = np.arange(n_tokens)
+
+        # a chunk starts where a run starts, or where a sentence starts
+        # within a run
+        is_start = in_chunk.copy()
+        is_start[1:] &= ~in_chunk[:-1]
+
+        if self.doc.has_annotation("SENT_START"):
+            is_start |= in_chunk & (self.doc.to_array(SENT_START) == 1)
+
+        starts = np.flatnonzero(is_start)
+
+        # each run ends at the next token outside of a chunk, or else at
+        # the next start
+        gaps = np.append(np.flatnonzero(~in_chunk), n_tokens)
+        ends = np.minimum(gaps[np.searchsorted(gaps, starts)], np.append(starts[1:], n_tokens))
+
+        # trim each run back to its last head token, if any
+        last_head = np.maximum.accumulate(np.where(np.isin(tags, head_ids), positions, -1))
+        heads = last_head[ends - 1] if len(ends) else ends
+
+        return [
+            self.doc[start:head + 1]
+            for start, head in zip(starts.tolist(), heads.tolist())
+            if head >= start
+        ]
+
+
     def _collect_phrases (
         self,
         spans: typing.Iterable[Span],
@@ -571,31 +974,9 @@ sum of the ranks for each token within this span
     returns:
 normalized rank metric
         """
-        if len(span) < 1 :
-            return 0.0
         non_lemma = len([tok for tok in span if tok.pos_ not in self.pos_kept])
-        non_lemma_discount = len(span) / (len(span) + (2.0 * non_lemma) + 1.0)
-
-        # NB:
-        # This implements a *point estimate* for the ratio of the span
-        # of an extracted phrase divided by the number of non-lemma
-        # tokens within that span.
-        #
-        # The algorithm defined as in the original paper
-        # [[mihalcea04textrank]](https://derwen.ai/docs/ptr/biblio/#mihalcea04textrank)
-        # only considered multi-word phrases which had adjacent lemmas.
-        # Early use cases in industry (circa 2009) required better recall
-        # of phrases so this approach of using a point estimate here to
-        # "normalize" the rank metric causes the longer phrases to get
-        # discounted when they included too many non-lemma tokens.
-        # In other words, we allow some non-lemmas, but avoid having
-        # the algorithm become too "greedy" as it builds phrases.
-        #
-        # Kudos to @debraj135 who asked for an explanation about this
-        # section of the code.
-        phrase_rank = math.sqrt(sum_rank / (len(span) + non_lemma))
-
-        return phrase_rank * non_lemma_discount
+
+        return discounted_normalised_rank(len(span), non_lemma, sum_rank)
 
 
     def _get_min_phrases (
@@ -627,10 +1008,11 @@ an ordered list of ranked phrases
         keyfunc = lambda x: x[0]
         applyfunc = lambda g: list((rank, spans) for text, rank, spans in g)
 
-        phrases: typing.List[typing.Tuple[str, typing.List[typing.Tuple[float, Span]]]] = groupby_apply(
+        phrases: typing.List[typing.Tuple[str, typing.List[typing.Tuple[float, Span]]]] = groupby_hash(
             data,
             keyfunc,
             applyfunc,
+            sort_keys = True,
         )
 
         phrase_list: typing.List[Phrase] = [
@@ -661,6 +1043,27 @@ normalized list of their calculated ranks, up to the specified limit.
     limit_phrases:
 maximum number of top-ranked phrases to use in the *unit vector*
 
+    returns:
+the unit vector, as a list of `VectorElem` objects
+        """
+        return self._build_unit_vector(self.doc._.phrases, limit_phrases)
+
+
+    @classmethod
+    def _build_unit_vector (
+        cls,
+        phrases: typing.List[Phrase],
+        limit_phrases: int,
+        ) -> typing.List[VectorElem]:
+        """
+Construct a *unit vector* from a list of ranked phrases.
+
+    phrases:
+ranked phrases, in descending order
+
+    limit_phrases:
+maximum number of top-ranked phrases to use in the *unit vector*
+
     returns:
 the unit vector, as a list of `VectorElem` objects
         """
@@ -670,7 +1073,7 @@ the unit vector, as a list of `VectorElem` objects
                 phrase_id = phrase_id,
                 coord = p.rank,
                 )
-            for phrase_id, p in enumerate(self.doc._.phrases)
+            for phrase_id, p in enumerate(phrases)
             ]
 
         # truncate to the specified limit
@@ -704,8 +1107,43 @@ maximum number of top-ranked phrases to use in the *unit vector*
     returns:
 a list of sentence distance measures
         """
-        unit_vector = self.get_unit_vector(limit_phrases)
+        sent_dist, _ = self._calc_sent_dist(self.get_unit_vector(limit_phrases))
+        return sent_dist
+
+
+    def calc_sent_incidence (
+        self,
+        limit_phrases: int,
+        ) -> typing.List[int]:
+        """
+Build the sentence–phrase incidence for the top-ranked phrases, as one
+integer bitset per sentence: bit `i` is set when the sentence includes
+the phrase with `phrase_id == i` in the *unit vector*.
+
+    limit_phrases:
+maximum number of top-ranked phrases to use in the *unit vector*
+
+    returns:
+a list of phrase bitsets, indexed by sentence id
+        """
+        _, sent_bits = self._calc_sent_dist(self.get_unit_vector(limit_phrases))
+        return sent_bits
+
+
+    def _calc_sent_dist (
+        self,
+        unit_vector: typing.List[VectorElem],
+        ) -> typing.Tuple[typing.List[Sentence], typing.List[int]]:
+        """
+Calculate the sentence distance measures and the sentence–phrase
+incidence bitsets for the given *unit vector*.
+
+    unit_vector:
+the unit vector, as a list of `VectorElem` objects
 
+    returns:
+a list of sentence distance measures, and a list of phrase bitsets indexed by sentence id
+        """
         sent_dist: typing.List[Sentence] = [
             Sentence(
                 start = s.start,
@@ -717,26 +1155,55 @@ a list of sentence distance measures
             for sent_id, s in enumerate(self.doc.sents)
             ]
 
-        # identify the top-ranked phrases in each sentence
+        return sent_dist, self._measure_sents(sent_dist, unit_vector)
+
+
+    @classmethod
+    def _measure_sents (
+        cls,
+        sent_dist: typing.List[Sentence],
+        unit_vector: typing.List[VectorElem],
+        ) -> typing.List[int]:
+        """
+Fill in the phrases and the distance for each sentence, given the
+sentence boundaries and the *unit vector*.
+
+    sent_dist:
+a list of Sentence data objects, in document order, which get updated
+
+    unit_vector:
+the unit vector, as a list of `VectorElem` objects
+
+    returns:
+a list of phrase bitsets, indexed by sentence id
+        """
+        sent_starts: typing.List[int] = [ sent.start for sent in sent_dist ]
+        sent_bits: typing.List[int] = [ 0 ] * len(sent_dist)
+
+        # identify the top-ranked phrases in each sentence; since
+        # sentences are contiguous, the only one which can include a
+        # chunk is the sentence where that chunk starts
         for elem in unit_vector:
             for chunk in elem.phrase.chunks:
-                for sent in sent_dist:
-                    if chunk.start >= sent.start and chunk.end <= sent.end:
-                        sent.phrases.add(elem.phrase_id)
-                        break
+                sent_id = bisect_right(sent_starts, chunk.start) - 1
+
+                if sent_id >= 0 and chunk.end <= sent_dist[sent_id].end:
+                    sent_bits[sent_id] |= 1 << elem.phrase_id
 
         # calculate a euclidean distance for each sentence; in other
         # words, test for inclusion of each phrase in the unit vector
-        for sent in sent_dist:
+        for sent, bits in zip(sent_dist, sent_bits):
             sum_sq = 0.0
 
             for elem in unit_vector:
-                if elem.phrase_id not in sent.phrases:
+                if bits >> elem.phrase_id & 1:
+                    sent.phrases.add(elem.phrase_id)
+                else:
                     sum_sq += elem.coord**2.0
 
             sent.distance = math.sqrt(sum_sq)
 
-        return sent_dist
+        return sent_bits
 
 
     def segment_paragraphs (
@@ -751,11 +1218,23 @@ a list of ranked Sentence data objects
 
     returns:
 a list of Paragraph data objects
+        """
+        return self._aggregate_paragraphs(sent_dist, self._get_para_bounds())
+
+
+    def _get_para_bounds (
+        self
+        ) -> typing.List[typing.List[int]]:
+        """
+Determine the paragraph boundaries, where a paragraph starts at a
+sentence whose first token includes more than one line break.
+
+    returns:
+a list of the sentence ids within each paragraph
         """
         para_elem: typing.List[int] = []
         para_bounds: typing.List[typing.List[int]] = []
 
-        # first, determine the paragraph boundaries
         for sent_id, s in enumerate(self.doc.sents):
             toke_0 = str(s.__getitem__(0))
             ret_count = sum(map(lambda c: 1 if c == "\n" else 0, toke_0))
@@ -774,8 +1253,28 @@ a list of Paragraph data objects
         if len(para_elem) > 0:
             para_bounds.append(para_elem)
 
-        # second, aggregate the distance measures and construct the
-        # Paragraph data objects
+        return para_bounds
+
+
+    @classmethod
+    def _aggregate_paragraphs (
+        cls,
+        sent_dist: typing.List[Sentence],
+        para_bounds: typing.List[typing.List[int]],
+        ) -> typing.List[Paragraph]:
+        """
+Aggregate the distance measures of the sentences within each
+paragraph, and construct the Paragraph data objects.
+
+    sent_dist:
+a list of ranked Sentence data objects
+
+    para_bounds:
+a list of the sentence ids within each paragraph
+
+    returns:
+a list of Paragraph data objects
+        """
         para_list: typing.List[Paragraph] = []
 
         for para_id, para_elem in enumerate(para_bounds):
@@ -794,6 +1293,63 @@ a list of Paragraph data objects
         return para_list
 
 
+    @classmethod
+    def _select_coverage (
+        cls,
+        sent_dist: typing.List[Sentence],
+        sent_bits: typing.List[int],
+        limit_sentences: int,
+        ) -> typing.List[int]:
+        """
+Greedily select the sentences which cover the most top-ranked phrases
+not yet covered by the sentences already selected, breaking ties by
+the least distance. Selection stops at the limit, or once no remaining
+sentence adds any new phrase.
+
+    sent_dist:
+a list of ranked Sentence data objects
+
+    sent_bits:
+a list of phrase bitsets, indexed by sentence id
+
+    limit_sentences:
+maximum number of sentences to select
+
+    returns:
+the selected sentence ids, in order of selection
+        """
+        # visit the candidates in order of distance, so that the first
+        # sentence found with the maximum gain also has the least distance
+        remaining: typing.List[int] = [
+            sent.sent_id
+            for sent in sorted(sent_dist, key=lambda sent: sent.distance)
+            if sent_bits[sent.sent_id]
+            ]
+
+        selected: typing.List[int] = []
+        covered = 0
+
+        while remaining and len(selected) < limit_sentences:
+            best_gain = 0
+            best_pos = -1
+
+            for pos, sent_id in enumerate(remaining):
+                gain = _popcount(sent_bits[sent_id] & ~covered)
+
+                if gain > best_gain:
+                    best_gain = gain
+                    best_pos = pos
+
+            if best_gain < 1:
+                break
+
+            sent_id = remaining.pop(best_pos)
+            covered |= sent_bits[sent_id]
+            selected.append(sent_id)
+
+        return selected
+
+
     def summary (
         self,
         *,
@@ -817,16 +1373,65 @@ total number of sentences to yield for the extractive summarization
 flag to preserve the order of sentences as they originally occurred in the source text; defaults to `False`
 
     level:
-default extractive summarization with `"sentence"` value; when set as `"paragraph`" get the average score per paragraph then sort the paragraphs to produce the summary
+default extractive summarization with `"sentence"` value; when set as `"paragraph`" get the average score per paragraph then sort the paragraphs to produce the summary; when set as `"coverage"` select sentences greedily by how many top-ranked phrases they add which were not already covered, to avoid redundancy
 
     yields:
 texts for sentences, in order
         """
+        t_stage: float = time.perf_counter() if self.observer is not None else 0.0
+
         # build a list of sentence indices sorted by distance
-        sent_dist: typing.List[Sentence] = self.calc_sent_dist(limit_phrases)
+        sent_dist, sent_bits = self._calc_sent_dist(self.get_unit_vector(limit_phrases))
+
+        top_sent_ids = self._select_summary(
+            sent_dist,
+            sent_bits,
+            self._get_para_bounds() if level == "paragraph" else [],
+            limit_sentences = limit_sentences,
+            preserve_order = preserve_order,
+            level = level,
+        )
+
+        if self.observer is not None:
+            self._observe("summary", t_stage, candidates=len(sent_dist))
+
+        # extract sentences with the least distance, up to the limit
+        # requested
+        for sent_id in top_sent_ids:
+            yield sent_dist[sent_id].text(self.doc)
+
+
+    @classmethod
+    def _select_summary (
+        cls,
+        sent_dist: typing.List[Sentence],
+        sent_bits: typing.List[int],
+        para_bounds: typing.List[typing.List[int]],
+        *,
+        limit_sentences: int,
+        preserve_order: bool,
+        level: str,
+        ) -> typing.List[int]:
+        """
+Select the sentences for an extractive summarization; see `summary()`
+for the parameters.
+
+    sent_dist:
+a list of ranked Sentence data objects
+
+    sent_bits:
+a list of phrase bitsets, indexed by sentence id
+
+    para_bounds:
+a list of the sentence ids within each paragraph, only used at the `"paragraph"` level
+
+    returns:
+the selected sentence ids, in order
+        """
+        top_sent_ids: typing.List[int] = []
 
         if level == "sentence":
-            top_sent_ids: typing.List[int] = [
+            top_sent_ids = [
                 sent.sent_id
                 for sent in sorted(sent_dist, key=lambda sent: sent.distance)
                 ]
@@ -835,20 +1440,13 @@ texts for sentences, in order
             limit = min(limit_sentences, len(top_sent_ids))
             top_sent_ids = top_sent_ids[:limit]
 
-            # optional: sort in ascending order of index to preserve
-            # the order in which sentences appear in the original text
-            if preserve_order:
-                top_sent_ids.sort()
-
-            # extract sentences with the least distance, up to the limit
-            # requested
-            for sent_id in top_sent_ids:
-                yield sent_dist[sent_id].text(self.doc)
+        if level == "coverage":
+            top_sent_ids = cls._select_coverage(sent_dist, sent_bits, limit_sentences)
 
         if level == "paragraph":
             top_sent_ids = [
                 sent_id
-                for p in sorted(self.segment_paragraphs(sent_dist), key=lambda x: x.distance)
+                for p in sorted(cls._aggregate_paragraphs(sent_dist, para_bounds), key=lambda x: x.distance)
                 for sent_id in range(p.start, p.end + 1)
             ]
 
@@ -856,16 +1454,12 @@ texts for sentences, in order
             limit_para = min(limit_sentences, len(top_sent_ids))
             top_sent_ids = top_sent_ids[:limit_para]
 
-            # optional: sort in ascending order of index to preserve
-            # the order in which the sentences appear in the original
-            # text
-            if preserve_order:
-                top_sent_ids.sort()
+        # optional: sort in ascending order of index to preserve
+        # the order in which sentences appear in the original text
+        if preserve_order:
+            top_sent_ids.sort()
 
-            # extract sentences with the least distance, up to the limit
-            # requested
-            for sent_id in top_sent_ids:
-                yield sent_dist[sent_id].text(self.doc)
+        return top_sent_ids
 
 
     def write_dot (
@@ -879,6 +1473,8 @@ Serialize the lemma graph in the `Dot` file format.
     path:
 path for the output file; defaults to `"graph.dot"`
         """
+        import graphviz  # type: ignore # pylint: disable=C0415,E0401
+
         dot = graphviz.Graph()
 
         for lemma in self.lemma_graph.nodes():
@@ -910,10 +1506,13 @@ Throws an `ImportError` if the `altair` and `pandas` libraries are not installed
     returns:
 the `altair` chart being rendered
         """
-        if not _has_altair_and_pandas:
+        try:
+            import altair as alt  # type: ignore # pylint: disable=C0415,E0401
+            import pandas as pd  # type: ignore # pylint: disable=C0415,E0401
+        except ImportError:
             raise ImportError("altair and pandas are required to use this method. Install them with `pip install 'pytextrank[viz]'`")
 
-        source = pd.DataFrame([p.__dict__ for p in self.doc._.phrases]).drop("chunks", axis=1).reset_index()
+        source = pd.DataFrame(PhraseTable.from_phrases(self.doc._.phrases).columns()).reset_index()
 
         c = (
             alt.Chart(source)
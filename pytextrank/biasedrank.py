@@ -8,7 +8,10 @@ Implements the *Biased TextRank* algorithm.
 
 import typing
 
-from spacy.tokens import Doc, Token  # type: ignore # pylint: disable=E0401
+from spacy.attrs import LOWER  # type: ignore # pylint: disable=E0401
+from spacy.matcher import PhraseMatcher  # type: ignore # pylint: disable=E0401
+from spacy.tokens import Doc  # type: ignore # pylint: disable=E0401
+import numpy as np  # type: ignore # pylint: disable=E0401
 
 from .base import BaseTextRankFactory, BaseTextRank, Lemma, Phrase
 
@@ -43,6 +46,8 @@ a document container, providing the annotations produced by earlier stages of th
             token_lookback = self.token_lookback,
             scrubber = self.scrubber,
             stopwords = self.stopwords,
+            chunker = self.chunker,
+            observer = self.observer,
             )
 
         doc._.phrases = doc._.textrank.calc_textrank()
@@ -61,28 +66,86 @@ instead.
 
     _DEFAULT_BIAS: float = 1.0
 
-
-    def _get_node_bias (
+    def __init__ (
         self,
-        token: Token,
-        ) -> float:
+        doc: Doc,
+        edge_weight: float,
+        pos_kept: typing.List[str],
+        token_lookback: int,
+        scrubber: typing.Callable,
+        stopwords: typing.Dict[str, typing.List[str]],
+        chunker: str = BaseTextRankFactory._CHUNKER,
+        observer: typing.Optional[typing.Callable] = None,
+        ) -> None:
+        """
+Constructor for a `BiasedTextRank` object.
+
+    doc:
+a document container, providing the annotations produced by earlier stages of the `spaCy` pipeline
+
+    edge_weight:
+default weight for an edge
+
+    pos_kept:
+parts of speech tags to be kept; adjust this if strings representing the POS tags change
+
+    token_lookback:
+the window for neighboring tokens – similar to a *skip gram*
+
+    scrubber:
+optional "scrubber" function to clean up punctuation from a token
+
+    stopwords:
+optional dictionary of `lemma: [pos]` items to define the *stop words*, where each item has a key as a lemmatized token and a value as a list of POS tags
+
+    chunker:
+how to find the candidate noun phrases: one of `"noun_chunks"`, `"pos"`, or `"auto"`
+
+    observer:
+optional function `observer(doc, stage)` to call at the end of each stage with a `Stage` description
         """
-Assign the bias to use, where focus nodes get the preset bias and
-other nodes get the default (`1.0`) value.
+        super().__init__(
+            doc, edge_weight, pos_kept, token_lookback, scrubber, stopwords, chunker, observer
+        )
+
+        # the focus, compiled by `change_focus()` into the ids of the
+        # focus tokens plus a matcher for the multi-token focus phrases
+        self.focus_phrases: typing.List[str] = []
+        self._focus_ids: np.ndarray = np.zeros(0, dtype=np.uint64)
+        self._focus_matcher: typing.Optional[PhraseMatcher] = None
 
-    token:
-`spaCy` token to use for lookup in the *focus set*
+        # table of the kept tokens, built once per instance
+        self._token_table: typing.Optional[typing.Tuple[typing.List[Lemma], np.ndarray, np.ndarray, np.ndarray]] = None
+
+
+    def _get_token_table (
+        self,
+        ) -> typing.Tuple[typing.List[Lemma], np.ndarray, np.ndarray, np.ndarray]:
+        """
+Get the table of kept tokens used to look up the *focus set*, which
+only depends on the document so gets built once.
 
     returns:
-bias to apply for the *node weight*
+the node for each kept token, along with its position in the document, the id of its lowercase text, and the id of its lowercase lemma
         """
-        if token.text.lower() in self.focus_tokens:
-            return self.node_bias
+        if self._token_table is None:
+            strings = self.doc.vocab.strings
+            nodes: typing.List[Lemma] = []
+            positions: typing.List[int] = []
+            lemma_ids: typing.List[int] = []
+
+            for token in self.doc:
+                if token.pos_ in self.pos_kept:
+                    nodes.append(Lemma(token.lemma_, token.pos_))
+                    positions.append(token.i)
+                    lemma_ids.append(strings[token.lemma_.lower()])
+
+            token_pos = np.array(positions, dtype=np.intp)
+            lower_ids = self.doc.to_array(LOWER).astype(np.uint64)[token_pos]
 
-        if token.lemma_.lower() in self.focus_tokens:
-            return self.node_bias
+            self._token_table = (nodes, token_pos, lower_ids, np.array(lemma_ids, dtype=np.uint64))
 
-        return self.default_bias
+        return self._token_table
 
 
     def get_personalization (
@@ -93,17 +156,34 @@ Get the *node weights* for initializing the use of the
 [*Personalized PageRank*](https://derwen.ai/docs/ptr/glossary/#personalized-pagerank)
 algorithm.
 
+Focus nodes get the preset bias and other nodes get the default bias,
+where a token is in focus if either its text or its lemma matches one
+of the focus tokens (ignoring case), and a node is also in focus if any
+of its tokens belongs to a match for one of the focus phrases.
+
     returns:
 biased restart probabilities to use in the *PageRank* algorithm.
         """
         # TODO: # pylint: disable=W0511
         # => lookup bias based on (lemma, pos) instead, similar to *PositionRank*?
 
-        weighted_nodes: typing.Dict[Lemma, float] = {
-            Lemma(token.lemma_, token.pos_): self._get_node_bias(token)
-            for token in self.doc
-            if token.pos_ in self.pos_kept
-        }
+        nodes, token_pos, lower_ids, lemma_ids = self._get_token_table()
+
+        in_focus = np.isin(lower_ids, self._focus_ids) | np.isin(lemma_ids, self._focus_ids)
+        biases = np.where(in_focus, self.node_bias, self.default_bias).tolist()
+
+        # the last occurrence of each node determines its weight
+        weighted_nodes: typing.Dict[Lemma, float] = dict(zip(nodes, biases))
+
+        # while any occurrence within a focus phrase puts its node in focus
+        if self._focus_matcher is not None:
+            in_phrase = np.zeros(len(self.doc), dtype=bool)
+
+            for _, start, end in self._focus_matcher(self.doc):
+                in_phrase[start:end] = True
+
+            for row in np.flatnonzero(in_phrase[token_pos]).tolist():
+                weighted_nodes[nodes[row]] = self.node_bias
 
         # normalize weights
         total_weight = sum(weighted_nodes.values())
@@ -124,6 +204,7 @@ biased restart probabilities to use in the *PageRank* algorithm.
         focus: str = None,
         bias: float = _DEFAULT_BIAS,
         default_bias: float = _DEFAULT_BIAS,
+        focus_phrases: typing.Optional[typing.List[str]] = None,
         ) -> typing.List[Phrase]:
         """
 Re-runs the *Biased TextRank* algorithm with the given focus.
@@ -131,7 +212,7 @@ This approach allows an application to "change focus" without
 re-running the entire pipeline.
 
     focus:
-optional text (string) with space-delimited tokens to use for the *focus set*; defaults to `None`
+optional text (string) with whitespace-delimited tokens to use for the *focus set*; defaults to `None`
 
     bias:
 optional bias for *node weight* values on tokens found within the *focus set*; defaults to `1.0`
@@ -139,15 +220,35 @@ optional bias for *node weight* values on tokens found within the *focus set*; d
     default_bias:
 optional bias for *node weight* values on tokens not found within the *focus set*; set to `0.0` to enhance the focus, especially in the case of long documents; defaults to `1.0`
 
+    focus_phrases:
+optional list of multi-token phrases, each with whitespace-delimited tokens, where every token within a match of a phrase (ignoring case) is in focus; defaults to `None`
+
     returns:
 list of ranked phrases, in descending order
         """
-        # update the focus parameters
+        # update the focus parameters, compiled once per change
         if focus:
-            self.focus_tokens = set(focus.lower().split(" "))
+            self.focus_tokens = set(focus.lower().split())
         else:
             self.focus_tokens = set()
 
+        strings = self.doc.vocab.strings
+
+        self._focus_ids = np.array(
+            [ strings[text] for text in self.focus_tokens ],
+            dtype=np.uint64,
+        )
+
+        self.focus_phrases = [ phrase for phrase in focus_phrases or [] if phrase.split() ]
+        self._focus_matcher = None
+
+        if self.focus_phrases:
+            self._focus_matcher = PhraseMatcher(self.doc.vocab, attr="LOWER")
+            self._focus_matcher.add("FOCUS", [
+                Doc(self.doc.vocab, words=phrase.split())
+                for phrase in self.focus_phrases
+            ])
+
         self.node_bias = bias
         self.default_bias = default_bias
 
@@ -0,0 +1,431 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# see license https://github.com/DerwenAI/pytextrank#license-and-copyright
+
+"""
+Rank phrases across a corpus, by accumulating one global *lemma graph*
+from the documents one at a time.
+"""
+
+import pathlib
+import typing
+
+from spacy.tokens import Doc  # type: ignore # pylint: disable=E0401
+import numpy as np  # type: ignore # pylint: disable=E0401
+
+from .accumulator import ChunkKey, LemmaGraphAccumulator
+from .base import Lemma, Phrase
+from .util import pagerank_matrix
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import scipy.sparse as sp  # type: ignore # pylint: disable=E0401
+
+
+class CorpusTextRank (LemmaGraphAccumulator):
+    """
+Accumulates the co-occurrence counts of the documents in a corpus into
+one global *lemma graph*, then ranks the phrases of the whole corpus on
+demand.
+
+Each document contributes the same nodes and edge weights as its own
+lemma graph in `BaseTextRank`, using the same `pos_kept`, `stopwords`,
+and `token_lookback` settings, and these get summed across documents.
+The nodes get interned into a vocabulary, and the edges kept as sparse
+triplets which get compacted as they accumulate, so that the memory
+used is bounded by the vocabulary and its co-occurrences rather than
+by the size of the corpus. The documents themselves do not get kept.
+
+Documents may be parsed or already ranked by a pipeline component;
+either way, only their annotations get used.
+
+The accumulated counts can get saved as a *shard*, so that separate
+worker processes can each build a shard from part of the corpus, then
+the shards get merged into one lemma graph to rank; see `build_shard()`.
+    """
+
+    # number of pending edge triplets which triggers a compaction
+    _COMPACT_ELEMS: int = 1 << 20
+
+    _SHARD_VERSION: int = 1
+
+    def __init__ (
+        self,
+        **settings: typing.Any,
+        ) -> None:
+        """
+Constructor for a `CorpusTextRank` object.
+
+    settings:
+settings for analyzing the documents, the same as for `BaseTextRankFactory`: `edge_weight`, `pos_kept`, `token_lookback`, `scrubber`, `stopwords`, and `chunker`
+        """
+        super().__init__(**settings)
+
+        self.n_docs: int = 0
+
+        # the compacted edges as `(u, v, weight)` triplets with `u <= v`,
+        # plus the triplets added since the last compaction
+        self._edge_u: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._edge_v: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._edge_weight: np.ndarray = np.zeros(0, dtype=np.float64)
+        self._pending: typing.List[typing.Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._n_pending: int = 0
+
+        # the number of occurrences of each distinct phrase chunk
+        self.chunk_counts: typing.Dict[ChunkKey, int] = {}
+
+
+    def add_doc (
+        self,
+        doc: Doc,
+        ) -> None:
+        """
+Add the co-occurrence counts and phrase chunks of one document.
+
+    doc:
+a document container, providing the annotations produced by the `spaCy` pipeline
+        """
+        tr = self._analyze(doc)
+
+        for node in tr.node_list:
+            self._intern(node)
+
+        doc_edges = self._doc_edges(tr)
+
+        if doc_edges:
+            pairs = np.array(list(doc_edges), dtype=np.int64)
+            weights = np.fromiter(doc_edges.values(), dtype=np.float64, count=len(doc_edges))
+
+            self._pending.append((pairs[:, 0], pairs[:, 1], weights))
+            self._n_pending += len(weights)
+
+        for span in tr._get_phrase_spans():  # pylint: disable=W0212
+            key = self._chunk_key(tr, span)
+            self.chunk_counts[key] = self.chunk_counts.get(key, 0) + 1
+
+        self.n_docs += 1
+
+        if self._n_pending >= self._COMPACT_ELEMS:
+            self._compact()
+
+
+    def _add_counts (
+        self,
+        node_list: typing.List[Lemma],
+        edge_u: np.ndarray,
+        edge_v: np.ndarray,
+        edge_weight: np.ndarray,
+        chunk_counts: typing.Dict[ChunkKey, int],
+        n_docs: int,
+        ) -> None:
+        """
+Add the counts accumulated for other documents, remapping their node
+ids onto this vocabulary.
+
+    node_list:
+the vocabulary of the other documents, indexed by their node ids
+
+    edge_u:
+first node id of each edge
+
+    edge_v:
+second node id of each edge
+
+    edge_weight:
+weight of each edge
+
+    chunk_counts:
+number of occurrences of each distinct phrase chunk
+
+    n_docs:
+number of documents counted
+        """
+        id_map = np.array([ self._intern(node) for node in node_list ], dtype=np.int64)
+
+        if len(edge_weight) > 0:
+            u = id_map[edge_u]
+            v = id_map[edge_v]
+
+            self._pending.append((np.minimum(u, v), np.maximum(u, v), edge_weight.astype(np.float64)))
+            self._n_pending += len(edge_weight)
+
+        for (text, node_ids, length, non_lemma), count in chunk_counts.items():
+            key = (text, tuple(id_map[list(node_ids)].tolist()), length, non_lemma)
+            self.chunk_counts[key] = self.chunk_counts.get(key, 0) + count
+
+        self.n_docs += n_docs
+
+        if self._n_pending >= self._COMPACT_ELEMS:
+            self._compact()
+
+
+    def merge (
+        self,
+        other: "CorpusTextRank",
+        ) -> None:
+        """
+Merge the counts accumulated by another corpus into this one.
+
+    other:
+the corpus to merge
+        """
+        other._compact()  # pylint: disable=W0212
+
+        self._add_counts(
+            other.node_list,
+            other._edge_u,  # pylint: disable=W0212
+            other._edge_v,  # pylint: disable=W0212
+            other._edge_weight,  # pylint: disable=W0212
+            other.chunk_counts,
+            other.n_docs,
+        )
+
+
+    def save_shard (
+        self,
+        path: typing.Union[ str, pathlib.Path ],
+        ) -> None:
+        """
+Save the accumulated counts as a shard, in a compressed `.npz` file
+which holds the vocabulary table, the edges as COO triplets, and the
+phrase chunk counts.
+
+    path:
+path for the output file
+        """
+        self._compact()
+
+        keys = list(self.chunk_counts)
+
+        np.savez_compressed(
+            path,
+            version = np.array(self._SHARD_VERSION),
+            n_docs = np.array(self.n_docs),
+            node_lemma = np.array([ node.lemma for node in self.node_list ], dtype=str),
+            node_pos = np.array([ node.pos for node in self.node_list ], dtype=str),
+            edge_u = self._edge_u,
+            edge_v = self._edge_v,
+            edge_weight = self._edge_weight,
+            chunk_text = np.array([ key[0] for key in keys ], dtype=str),
+            chunk_node_ptr = np.cumsum([ 0 ] + [ len(key[1]) for key in keys ], dtype=np.int64),
+            chunk_node_ids = np.array([ node_id for key in keys for node_id in key[1] ], dtype=np.int64),
+            chunk_len = np.array([ key[2] for key in keys ], dtype=np.int64),
+            chunk_non_lemma = np.array([ key[3] for key in keys ], dtype=np.int64),
+            chunk_count = np.array([ self.chunk_counts[key] for key in keys ], dtype=np.int64),
+        )
+
+
+    def merge_shard (
+        self,
+        path: typing.Union[ str, pathlib.Path ],
+        ) -> None:
+        """
+Load a shard from a `.npz` file, and merge its counts into this corpus.
+
+Throws a `ValueError` if the file uses an unsupported format version.
+
+    path:
+path for the input file
+        """
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["version"])
+
+            if version != self._SHARD_VERSION:
+                raise ValueError("unsupported shard version: {}".format(version))
+
+            ptr = data["chunk_node_ptr"].tolist()
+            node_ids = data["chunk_node_ids"].tolist()
+
+            chunk_counts = {
+                (text, tuple(node_ids[ptr[i]:ptr[i + 1]]), length, non_lemma): count
+                for i, (text, length, non_lemma, count) in enumerate(zip(
+                    data["chunk_text"].tolist(),
+                    data["chunk_len"].tolist(),
+                    data["chunk_non_lemma"].tolist(),
+                    data["chunk_count"].tolist(),
+                ))
+            }
+
+            self._add_counts(
+                [ Lemma(lemma, pos) for lemma, pos in zip(data["node_lemma"].tolist(), data["node_pos"].tolist()) ],
+                data["edge_u"],
+                data["edge_v"],
+                data["edge_weight"],
+                chunk_counts,
+                int(data["n_docs"]),
+            )
+
+
+    @classmethod
+    def from_shards (
+        cls,
+        paths: typing.Iterable[typing.Union[ str, pathlib.Path ]],
+        **settings: typing.Any,
+        ) -> "CorpusTextRank":
+        """
+Merge shards into one corpus, i.e., the *reduce* step after
+`build_shard()`.
+
+    paths:
+paths for the shard files
+
+    settings:
+settings for the merged corpus, as for the constructor, which only apply to documents added later
+
+    returns:
+the merged corpus
+        """
+        corpus = cls(**settings)
+
+        for path in paths:
+            corpus.merge_shard(path)
+
+        return corpus
+
+
+    def add_docs (
+        self,
+        docs: typing.Iterable[Doc],
+        ) -> None:
+        """
+Add a stream of documents, e.g., from `nlp.pipe()`.
+
+    docs:
+the documents
+        """
+        for doc in docs:
+            self.add_doc(doc)
+
+
+    def _compact (
+        self
+        ) -> None:
+        """
+Sum the pending edge triplets into the compacted edges.
+        """
+        import scipy.sparse as sp  # type: ignore # pylint: disable=C0415,E0401
+
+        if not self._pending:
+            return
+
+        n_nodes = len(self.node_list)
+        edge_u, edge_v, edge_weight = zip(*self._pending)
+
+        coo = sp.coo_matrix(
+            (
+                np.concatenate([ self._edge_weight, *edge_weight ]),
+                (np.concatenate([ self._edge_u, *edge_u ]), np.concatenate([ self._edge_v, *edge_v ])),
+            ),
+            shape=(n_nodes, n_nodes),
+        )
+
+        coo.sum_duplicates()
+
+        self._edge_u = coo.row.astype(np.int64)
+        self._edge_v = coo.col.astype(np.int64)
+        self._edge_weight = coo.data
+        self._pending = []
+        self._n_pending = 0
+
+
+    @property
+    def adjacency (
+        self
+        ) -> "sp.csr_matrix":
+        """
+Accessor for the global lemma graph as a symmetric sparse adjacency
+matrix, indexed by node id, where a self-loop only counts once.
+
+    returns:
+the weighted adjacency matrix
+        """
+        self._compact()
+
+        return self._symmetric_adjacency(self._edge_u, self._edge_v, self._edge_weight, len(self.node_list))
+
+
+    def rank (
+        self,
+        personalization: typing.Optional[typing.Dict[Lemma, float]] = None,
+        ) -> typing.List[Phrase]:
+        """
+Run *PageRank* on the global lemma graph, then rank the phrases of the
+whole corpus.
+
+Since the documents do not get kept, the phrases have no `chunks`, and
+their `count` sums the occurrences across the corpus.
+
+    personalization:
+optional *node weights* for the
+[*Personalized PageRank*](https://derwen.ai/docs/ptr/glossary/#personalized-pagerank)
+algorithm, where missing nodes get a weight of zero; defaults to uniform weights
+
+    returns:
+list of ranked phrases, in descending order
+        """
+        scores = pagerank_matrix(self.adjacency, personalization=self._node_weights(personalization))
+
+        self.ranks = dict(zip(self.node_list, scores.tolist()))
+        self.phrases = [
+            Phrase(
+                text = text,
+                rank = rank,
+                count = sum(counts),
+                chunks = [],
+            )
+            for text, rank, counts in self._group_chunks(scores, self.chunk_counts)
+        ]
+
+        return self.phrases
+
+
+def build_shard (
+    path: typing.Union[ str, pathlib.Path ],
+    texts: typing.Iterable[str],
+    *,
+    model: str = "en_core_web_sm",
+    batch_size: int = 64,
+    **settings: typing.Any,
+    ) -> str:
+    """
+Parse a batch of texts, accumulate their counts, then save these as a
+shard, i.e., the *map* step of building a corpus across processes.
+Since this is a module-level function, it can get run by the workers
+of a [`multiprocessing.Pool`](https://docs.python.org/3/library/multiprocessing.html#multiprocessing.pool.Pool),
+after which `CorpusTextRank.from_shards()` merges the shards:
+
+    with multiprocessing.Pool() as pool:
+        paths = pool.starmap(build_shard, [
+            ("shard{}.npz".format(i), batch)
+            for i, batch in enumerate(batches)
+        ])
+
+    corpus = CorpusTextRank.from_shards(paths)
+    phrases = corpus.rank()
+
+    path:
+path for the output file
+
+    texts:
+the texts to parse
+
+    model:
+name or path of the `spaCy` pipeline used to parse the texts, which gets loaded by each worker
+
+    batch_size:
+number of texts to buffer while parsing
+
+    settings:
+settings for the corpus, as for the `CorpusTextRank` constructor
+
+    returns:
+the path of the shard
+    """
+    import spacy  # type: ignore # pylint: disable=C0415,E0401
+
+    nlp = spacy.load(model)
+
+    corpus = CorpusTextRank(**settings)
+    corpus.add_docs(nlp.pipe(texts, batch_size=batch_size))
+    corpus.save_shard(path)
+
+    return str(path)
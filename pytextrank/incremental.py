@@ -0,0 +1,436 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# see license https://github.com/DerwenAI/pytextrank#license-and-copyright
+
+"""
+Re-rank a document which only grows by appending text, e.g., a live
+transcript, without re-parsing or re-ranking it from scratch.
+"""
+
+from collections import OrderedDict
+import bisect
+import typing
+
+from spacy.tokens import Doc  # type: ignore # pylint: disable=E0401
+import numpy as np  # type: ignore # pylint: disable=E0401
+
+from .accumulator import ChunkKey, LemmaGraphAccumulator
+from .base import BaseTextRank, Lemma, Phrase, Sentence, SpanOffsets
+from .util import discounted_normalised_rank, pagerank_matrix
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import scipy.sparse as sp  # type: ignore # pylint: disable=E0401
+
+
+class IncrementalTextRank (LemmaGraphAccumulator):
+    """
+Maintains the *lemma graph* of a document which grows by appending
+segments of text, where each segment gets parsed by itself as a `Doc`
+made of whole sentences.
+
+Appending a segment only adds the co-occurrence edges, `seen_lemma`
+positions, phrase chunks, and sentences of that segment, and then
+`rank()` runs *PageRank* starting from the previous ranks, which
+converges in fewer iterations than starting from uniform values.
+The results are the same as `BaseTextRank` would get for the whole
+document, within the error tolerance of *PageRank*.
+
+Since the segments do not get kept, the token offsets of each phrase
+chunk stand in for its `Span`, the same as for a `RankSnapshot`, and
+these offsets count tokens from the start of the first segment.
+    """
+
+    def __init__ (
+        self,
+        **settings: typing.Any,
+        ) -> None:
+        """
+Constructor for an `IncrementalTextRank` object.
+
+    settings:
+settings for analyzing the segments, the same as for `BaseTextRankFactory`: `edge_weight`, `pos_kept`, `token_lookback`, `scrubber`, `stopwords`, and `chunker`
+        """
+        super().__init__(**settings)
+
+        # number of tokens appended so far
+        self.n_tokens: int = 0
+
+        self.seen_lemma: typing.Dict[Lemma, typing.Set[int]] = OrderedDict()
+
+        # the count of each directed pair of neighboring nodes, plus the
+        # order in which each pair first occurred: as for the edges of
+        # `BaseTextRank`, the weight of an edge is the count of whichever
+        # direction occurred first later on
+        self._pair_counts: typing.Dict[typing.Tuple[int, int], typing.List[int]] = {}
+
+        # the weight of each edge, keyed by `(u, v)` with `u <= v`, and
+        # the same edges as a symmetric sparse adjacency matrix, where
+        # the new edges wait in a buffer until the matrix gets used
+        self.edges: typing.Dict[typing.Tuple[int, int], float] = {}
+        self._adjacency: typing.Optional["sp.csr_matrix"] = None
+        self._new_edges: typing.Dict[typing.Tuple[int, int], float] = {}
+
+        # the distinct phrase chunks, indexed by chunk id: the phrase id
+        # of each chunk, its length, its count of tokens with parts of
+        # speech which are not kept, and its node ids, as parallel lists
+        # of the chunk id and the node id for each kept token
+        self._chunk_ids: typing.Dict[ChunkKey, int] = {}
+        self._chunk_phrase: typing.List[int] = []
+        self._chunk_length: typing.List[int] = []
+        self._chunk_non_lemma: typing.List[int] = []
+        self._chunk_node_owner: typing.List[int] = []
+        self._chunk_node_ids: typing.List[int] = []
+
+        # the phrases, indexed by phrase id: the text of each phrase, and
+        # the token offsets of its chunks in document order; plus the
+        # phrase ids in sorted order of their texts, for breaking ties
+        self._phrase_ids: typing.Dict[str, int] = {}
+        self.phrase_text: typing.List[str] = []
+        self.phrase_chunks: typing.List[typing.List[SpanOffsets]] = []
+        self._sorted_text: typing.List[str] = []
+        self._sorted_phrase_ids: typing.List[int] = []
+
+        # the sentences, with their paragraph ids
+        self.sent_start: typing.List[int] = []
+        self.sent_end: typing.List[int] = []
+        self.sent_text: typing.List[str] = []
+        self.sent_para: typing.List[int] = []
+
+        # node ranks of the latest ranking, indexed by node id
+        self.scores: np.ndarray = np.zeros(0, dtype=np.float64)
+
+
+    def append (
+        self,
+        doc: Doc,
+        ) -> None:
+        """
+Append a segment of text to the document, at a cost proportional to
+the size of the segment.
+
+    doc:
+the segment, parsed by the `spaCy` pipeline, which must end at a sentence boundary
+        """
+        tr = self._analyze(doc)
+
+        offset = self.n_tokens
+        touched: typing.Set[typing.Tuple[int, int]] = set()
+
+        for sent in doc.sents:
+            h = [
+                self._intern(Lemma(token.lemma_, token.pos_))
+                for token in sent
+                if tr._keep_token(token)  # pylint: disable=W0212
+            ]
+
+            # the same order of pairs as `BaseTextRank.edge_list`
+            for hop in range(tr.token_lookback):
+                for idx, node in enumerate(h[: -1 - hop]):
+                    pair = (node, h[hop + idx + 1])
+                    counts = self._pair_counts.get(pair)
+
+                    if counts is None:
+                        self._pair_counts[pair] = [ len(self._pair_counts), 1 ]
+                    else:
+                        counts[1] += 1
+
+                    touched.add(pair if pair[0] <= pair[1] else (pair[1], pair[0]))
+
+            # a new paragraph starts at a sentence whose first token
+            # includes more than one line break
+            para_id = self.sent_para[-1] if self.sent_para else 0
+
+            if self.sent_para and sent[0].text.count("\n") > 1:
+                para_id += 1
+
+            self.sent_start.append(sent.start + offset)
+            self.sent_end.append(sent.end + offset)
+            self.sent_text.append(sent.text)
+            self.sent_para.append(para_id)
+
+        self._update_adjacency(touched)
+
+        for key, positions in tr.seen_lemma.items():
+            self.seen_lemma.setdefault(key, set()).update(i + offset for i in positions)
+
+        # the segments arrive in document order, so appending the spans
+        # of each segment in order keeps the chunks of each phrase sorted
+        spans = sorted(tr._get_phrase_spans(), key=lambda span: (span.start, span.end))  # pylint: disable=W0212
+
+        for span in spans:
+            chunk_id = self._add_chunk(self._chunk_key(tr, span))
+            self.phrase_chunks[self._chunk_phrase[chunk_id]].append(SpanOffsets(span.start + offset, span.end + offset))
+
+        self.n_tokens += len(doc)
+
+
+    def _add_chunk (
+        self,
+        key: ChunkKey,
+        ) -> int:
+        """
+Look up the id of a distinct phrase chunk, adding the chunk – and its
+phrase – if needed.
+
+    key:
+the key of the phrase chunk
+
+    returns:
+the chunk id
+        """
+        chunk_id = self._chunk_ids.get(key)
+
+        if chunk_id is not None:
+            return chunk_id
+
+        text, node_ids, length, non_lemma = key
+        phrase_id = self._phrase_ids.get(text)
+
+        if phrase_id is None:
+            phrase_id = len(self.phrase_text)
+            self._phrase_ids[text] = phrase_id
+            self.phrase_text.append(text)
+            self.phrase_chunks.append([])
+
+            pos = bisect.bisect(self._sorted_text, text)
+            self._sorted_text.insert(pos, text)
+            self._sorted_phrase_ids.insert(pos, phrase_id)
+
+        chunk_id = len(self._chunk_phrase)
+        self._chunk_ids[key] = chunk_id
+        self._chunk_phrase.append(phrase_id)
+        self._chunk_length.append(length)
+        self._chunk_non_lemma.append(non_lemma)
+        self._chunk_node_owner.extend([ chunk_id ] * len(node_ids))
+        self._chunk_node_ids.extend(node_ids)
+
+        return chunk_id
+
+
+    def _update_adjacency (
+        self,
+        touched: typing.Set[typing.Tuple[int, int]],
+        ) -> None:
+        """
+Update the weights of the edges between pairs of nodes, from the counts
+of their directed pairs: the weights of edges which are already in the
+adjacency matrix get set in place, while the new edges get buffered
+until `adjacency` gets used.
+
+    touched:
+pairs of nodes `(u, v)` with `u <= v` whose counts changed
+        """
+        updated: typing.List[typing.Tuple[int, int, float]] = []
+
+        for u, v in touched:
+            forward = self._pair_counts.get((u, v))
+            backward = self._pair_counts.get((v, u))
+
+            if forward is None or (backward is not None and backward[0] > forward[0]):
+                forward = backward
+
+            weight = forward[1] * self.factory.edge_weight  # type: ignore
+
+            if (u, v) in self.edges and (u, v) not in self._new_edges:
+                updated.append((u, v, weight))
+            else:
+                self._new_edges[(u, v)] = weight
+
+            self.edges[(u, v)] = weight
+
+        if updated:
+            edge_u, edge_v, edge_weight = (np.array(col) for col in zip(*updated))
+            self._adjacency[edge_u, edge_v] = edge_weight  # type: ignore
+            self._adjacency[edge_v, edge_u] = edge_weight  # type: ignore
+
+
+    def _merge_new_edges (
+        self
+        ) -> None:
+        """
+Merge the buffered new edges into the adjacency matrix, in one pass
+over its entries, however many segments got appended since the last
+merge: so each `rank()` rebuilds the matrix at most once, at a cost
+linear in the number of edges, which *PageRank* already pays to build
+its transition matrix.
+        """
+        import scipy.sparse as sp  # type: ignore # pylint: disable=C0415,E0401
+
+        n_nodes = len(self.node_list)
+
+        if self._adjacency is None:
+            self._adjacency = sp.csr_matrix((n_nodes, n_nodes), dtype=np.float64)
+        else:
+            self._adjacency.resize((n_nodes, n_nodes))
+
+        if self._new_edges:
+            pairs = np.array(list(self._new_edges), dtype=np.int64).reshape(-1, 2)
+
+            self._adjacency = self._adjacency + self._symmetric_adjacency(
+                pairs[:, 0],
+                pairs[:, 1],
+                np.array(list(self._new_edges.values()), dtype=np.float64),
+                n_nodes,
+            )
+
+            self._new_edges = {}
+
+
+    @property
+    def adjacency (
+        self
+        ) -> "sp.csr_matrix":
+        """
+Accessor for the lemma graph as a symmetric sparse adjacency matrix,
+indexed by node id, where a self-loop only counts once.
+
+    returns:
+the weighted adjacency matrix
+        """
+        if self._adjacency is None or self._new_edges or self._adjacency.shape[0] != len(self.node_list):
+            self._merge_new_edges()
+
+        return self._adjacency  # type: ignore
+
+
+    def rank (
+        self,
+        personalization: typing.Optional[typing.Dict[Lemma, float]] = None,
+        ) -> typing.List[Phrase]:
+        """
+Run *PageRank* on the lemma graph, starting from the ranks of the
+previous call, then re-rank the phrases.
+
+    personalization:
+optional *node weights* for the
+[*Personalized PageRank*](https://derwen.ai/docs/ptr/glossary/#personalized-pagerank)
+algorithm, where missing nodes get a weight of zero; defaults to uniform weights
+
+    returns:
+list of ranked phrases, in descending order
+        """
+        n_nodes = len(self.node_list)
+        nstart: typing.Optional[np.ndarray] = None
+
+        # the nodes added since then start from a uniform value
+        if len(self.scores) > 0:
+            nstart = np.concatenate([
+                self.scores * len(self.scores) / n_nodes,
+                np.repeat(1.0 / n_nodes, n_nodes - len(self.scores)),
+            ])
+
+        self.scores = pagerank_matrix(self.adjacency, personalization=self._node_weights(personalization), nstart=nstart)
+        self.ranks = dict(zip(self.node_list, self.scores.tolist()))
+
+        self.phrases = [
+            Phrase(
+                text = self.phrase_text[phrase_id],
+                rank = rank,
+                count = len(self.phrase_chunks[phrase_id]),
+                chunks = list(self.phrase_chunks[phrase_id]),  # type: ignore
+            )
+            for phrase_id, rank in self._rank_phrases()
+        ]
+
+        return self.phrases
+
+
+    def _rank_phrases (
+        self
+        ) -> typing.List[typing.Tuple[int, float]]:
+        """
+Aggregate the node ranks into phrase ranks, the same as
+`BaseTextRank.calc_textrank()` does for the phrase spans of a document,
+where the rank of a phrase is the maximum rank of its chunks.
+
+    returns:
+the phrase id and rank of each phrase, in descending order of rank, then in sorted order of text
+        """
+        n_chunks = len(self._chunk_phrase)
+        n_phrases = len(self.phrase_text)
+
+        sum_rank = np.bincount(
+            np.array(self._chunk_node_owner, dtype=np.int64),
+            weights=self.scores[np.array(self._chunk_node_ids, dtype=np.int64)],
+            minlength=n_chunks,
+        )
+
+        chunk_ranks = discounted_normalised_rank(
+            np.array(self._chunk_length, dtype=np.float64),
+            np.array(self._chunk_non_lemma, dtype=np.float64),
+            sum_rank,
+        )
+
+        phrase_ranks = np.full(n_phrases, -np.inf)
+        np.maximum.at(phrase_ranks, np.array(self._chunk_phrase, dtype=np.int64), chunk_ranks)
+
+        text_order = np.empty(n_phrases, dtype=np.int64)
+        text_order[np.array(self._sorted_phrase_ids, dtype=np.int64)] = np.arange(n_phrases)
+
+        order = np.lexsort((text_order, -phrase_ranks))
+
+        return list(zip(order.tolist(), phrase_ranks[order].tolist()))
+
+
+    def summary (
+        self,
+        *,
+        limit_phrases: int = 10,
+        limit_sentences: int = 4,
+        preserve_order: bool = False,
+        level: str = "sentence",
+        ) -> typing.Iterator[str]:
+        """
+Run an
+[*extractive summarization*](https://derwen.ai/docs/ptr/glossary/#extractive-summarization)
+on the current phrase ranks, the same as `BaseTextRank.summary()`.
+
+    limit_phrases:
+maximum number of top-ranked phrases to use in the distance vectors
+
+    limit_sentences:
+total number of sentences to yield for the extractive summarization
+
+    preserve_order:
+flag to preserve the order of sentences as they originally occurred in the source text; defaults to `False`
+
+    level:
+one of `"sentence"`, `"paragraph"`, or `"coverage"`; see `BaseTextRank.summary()`
+
+    yields:
+texts for sentences, in order
+        """
+        unit_vector = BaseTextRank._build_unit_vector(self.phrases, limit_phrases)  # pylint: disable=W0212
+
+        sent_dist: typing.List[Sentence] = [
+            Sentence(
+                start = start,
+                end = end,
+                sent_id = sent_id,
+                phrases = set(),
+                distance = 0.0,
+                )
+            for sent_id, (start, end) in enumerate(zip(self.sent_start, self.sent_end))
+            ]
+
+        sent_bits = BaseTextRank._measure_sents(sent_dist, unit_vector)  # pylint: disable=W0212
+
+        para_bounds: typing.List[typing.List[int]] = []
+
+        for sent_id, para_id in enumerate(self.sent_para):
+            if para_id == len(para_bounds):
+                para_bounds.append([])
+
+            para_bounds[para_id].append(sent_id)
+
+        top_sent_ids = BaseTextRank._select_summary(  # pylint: disable=W0212
+            sent_dist,
+            sent_bits,
+            para_bounds,
+            limit_sentences = limit_sentences,
+            preserve_order = preserve_order,
+            level = level,
+        )
+
+        for sent_id in top_sent_ids:
+            yield self.sent_text[sent_id]
@@ -9,9 +9,9 @@ Implements the *PositionRank* algorithm.
 import typing
 
 from spacy.tokens import Doc  # type: ignore # pylint: disable=E0401
+import numpy as np  # type: ignore # pylint: disable=E0401
 
 from .base import BaseTextRankFactory, BaseTextRank, Lemma
-from .util import groupby_apply
 
 
 class PositionRankFactory (BaseTextRankFactory):
@@ -45,6 +45,8 @@ a document container, providing the annotations produced by earlier stages of th
             token_lookback = self.token_lookback,
             scrubber = self.scrubber,
             stopwords = self.stopwords,
+            chunker = self.chunker,
+            observer = self.observer,
             )
 
         doc._.phrases = doc._.textrank.calc_textrank()
@@ -86,30 +88,23 @@ From the cited reference:
     returns:
 Biased restart probabilities to use in the *PageRank* algorithm.
         """
-        weighted_tokens: typing.List[typing.Tuple[str, float]] = [
-            (tok, 1 / (i + 1))
-            for i, tok in enumerate(
-                token.lemma_ for token in self.doc if token.pos_ in self.pos_kept
-            )
-        ]
-
-        keyfunc = lambda x: x[0]
-        applyfunc = lambda g: sum(w for text, w in g)
+        # one pass over the kept tokens, assigning an id to each lemma
+        lemma_ids: typing.Dict[str, int] = {}
+        nodes: typing.List[Lemma] = []
+        token_ids: typing.List[int] = []
 
-        accumulated_weighted_tokens: typing.List[typing.Tuple[str, float]] = groupby_apply(
-            weighted_tokens,
-            keyfunc,
-            applyfunc,
-        )
+        for token in self.doc:
+            if token.pos_ in self.pos_kept:
+                nodes.append(Lemma(token.lemma_, token.pos_))
+                token_ids.append(lemma_ids.setdefault(token.lemma_, len(lemma_ids)))
 
-        accumulated_weighted_tokens = sorted(
-            accumulated_weighted_tokens, key=lambda x: x[1]
-        )
+        if len(token_ids) < 1:
+            return {}
 
-        norm_weighted_tokens = {
-            k: w / sum(w_ for _, w_ in accumulated_weighted_tokens)
-            for k, w in accumulated_weighted_tokens
-        }
+        # sum the inverse positions per lemma, then normalize once
+        positions = np.arange(1, len(token_ids) + 1, dtype=np.float64)
+        lemma_weights = np.bincount(token_ids, weights=1.0 / positions, minlength=len(lemma_ids))
+        lemma_weights /= lemma_weights.sum()
 
         # while the authors assign higher probability to a "word",
         # our *lemma graph* vertices are (lemma, pos) tuples,
@@ -119,10 +114,11 @@ Biased restart probabilities to use in the *PageRank* algorithm.
         # TODO: # pylint: disable=W0511
         # => should this map to (lemma, pos) pairs instead?
 
+        weights = lemma_weights.tolist()
+
         weighted_nodes: typing.Dict[Lemma, float] = {
-            Lemma(token.lemma_, token.pos_): norm_weighted_tokens[token.lemma_]
-            for token in self.doc
-            if token.pos_ in self.pos_kept
+            node: weights[lemma_id]
+            for node, lemma_id in zip(nodes, token_ids)
         }
 
         return weighted_nodes
@@ -0,0 +1,678 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# see license https://github.com/DerwenAI/pytextrank#license-and-copyright
+
+"""
+Persist the ranking state of a document, for re-ranking at query time
+without `spaCy` or the original `Doc`.
+"""
+
+import pathlib
+import typing
+
+import numpy as np  # type: ignore # pylint: disable=E0401
+
+from .base import BaseTextRank, Lemma, Phrase, PhraseTable, Sentence, SpanOffsets
+from .util import discounted_normalised_rank, pagerank_matrix
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import scipy.sparse as sp  # type: ignore # pylint: disable=E0401
+
+
+class RankSnapshot:
+    """
+A compact snapshot of the ranking state for one document: the *lemma
+graph* as a sparse adjacency matrix, the nodes and kept tokens, the
+offsets of the phrase spans, and the sentence boundaries.
+
+Each distinct string – the lemmas, parts of speech, lowercase token
+texts, and phrase texts – gets stored once in a sorted string table, so
+that the other arrays hold integer ids into it, and the sentences are
+character offsets into the text of the document; in the file, the
+string table and the text are each one UTF-8 encoded array of bytes.
+
+A snapshot gets saved in the `numpy` [`.npz`](https://numpy.org/doc/stable/reference/generated/numpy.savez.html)
+file format, then loaded later to re-rank the phrases with a different
+focus – in the manner of `BiasedTextRank.change_focus()` – or to run an
+extractive summarization, without re-parsing the document.
+
+Snapshots only apply to the algorithms which rank a *lemma graph*, so
+not to `TopicRank`.
+    """
+
+    _VERSION: int = 1
+    _DEFAULT_BIAS: float = 1.0
+
+    def __init__ (
+        self,
+        *,
+        adjacency: "sp.csr_matrix",
+        strings: typing.List[str],
+        node_lemma: np.ndarray,
+        node_pos: np.ndarray,
+        ranks: np.ndarray,
+        token_node: np.ndarray,
+        token_lower: np.ndarray,
+        token_lemma: np.ndarray,
+        token_offset: np.ndarray,
+        doc_lower: np.ndarray,
+        chunk_start: np.ndarray,
+        chunk_end: np.ndarray,
+        chunk_text: np.ndarray,
+        chunk_non_lemma: np.ndarray,
+        chunk_node_ptr: np.ndarray,
+        chunk_node_ids: np.ndarray,
+        sent_start: np.ndarray,
+        sent_end: np.ndarray,
+        text: str,
+        sent_char_start: np.ndarray,
+        sent_char_end: np.ndarray,
+        sent_para: np.ndarray,
+        ) -> None:
+        """
+Constructor for a snapshot; use `from_textrank()` or `load()` instead.
+
+    adjacency:
+sparse matrix of edge weights in the *lemma graph*, indexed by node
+
+    strings:
+table of the distinct strings, in sorted order, so that the order of the string ids is the order of the strings
+
+    node_lemma:
+string id of the lemma of each node
+
+    node_pos:
+string id of the part of speech of each node
+
+    ranks:
+rank of each node
+
+    token_node:
+node of each kept token, in document order
+
+    token_lower:
+string id of the lowercase text of each kept token
+
+    token_lemma:
+string id of the lowercase lemma of each kept token
+
+    token_offset:
+token offset of each kept token within the document
+
+    doc_lower:
+string id of the lowercase text of every token in the document, for matching focus phrases
+
+    chunk_start:
+start token offset of each phrase chunk
+
+    chunk_end:
+end token offset of each phrase chunk
+
+    chunk_text:
+string id of the scrubbed text of each phrase chunk
+
+    chunk_non_lemma:
+number of tokens within each phrase chunk which have a part of speech that was not kept
+
+    chunk_node_ptr:
+offsets into `chunk_node_ids` for each phrase chunk, in CSR form
+
+    chunk_node_ids:
+nodes of the kept tokens within each phrase chunk
+
+    sent_start:
+start token offset of each sentence
+
+    sent_end:
+end token offset of each sentence
+
+    text:
+text of the document
+
+    sent_char_start:
+start character offset of each sentence within `text`
+
+    sent_char_end:
+end character offset of each sentence within `text`
+
+    sent_para:
+paragraph id of each sentence
+        """
+        self.adjacency: "sp.csr_matrix" = adjacency
+        self.strings: typing.List[str] = strings
+        self.node_lemma: np.ndarray = node_lemma
+        self.node_pos: np.ndarray = node_pos
+        self.ranks: np.ndarray = ranks
+        self.token_node: np.ndarray = token_node
+        self.token_lower: np.ndarray = token_lower
+        self.token_lemma: np.ndarray = token_lemma
+        self.token_offset: np.ndarray = token_offset
+        self.doc_lower: np.ndarray = doc_lower
+        self.chunk_start: np.ndarray = chunk_start
+        self.chunk_end: np.ndarray = chunk_end
+        self.chunk_text: np.ndarray = chunk_text
+        self.chunk_non_lemma: np.ndarray = chunk_non_lemma
+        self.chunk_node_ptr: np.ndarray = chunk_node_ptr
+        self.chunk_node_ids: np.ndarray = chunk_node_ids
+        self.sent_start: np.ndarray = sent_start
+        self.sent_end: np.ndarray = sent_end
+        self.text: str = text
+        self.sent_char_start: np.ndarray = sent_char_start
+        self.sent_char_end: np.ndarray = sent_char_end
+        self.sent_para: np.ndarray = sent_para
+
+        # look up the id of a string, e.g., for the focus tokens
+        self.string_ids: typing.Dict[str, int] = { string: i for i, string in enumerate(strings) }
+
+        self.phrase_table: PhraseTable = self._rank_phrases()
+        self._phrases: typing.Optional[typing.List[Phrase]] = None
+
+
+    @property
+    def phrases (
+        self
+        ) -> typing.List[Phrase]:
+        """
+Accessor for the `Phrase` view of `phrase_table`, built on first use.
+
+    returns:
+list of ranked phrases, in descending order, whose chunks are `SpanOffsets` objects
+        """
+        if self._phrases is None:
+            self._phrases = self.phrase_table.to_phrases()
+
+        return self._phrases
+
+
+    @classmethod
+    def from_textrank (
+        cls,
+        textrank: BaseTextRank,
+        ) -> "RankSnapshot":
+        """
+Take a snapshot of a document which has already been ranked.
+
+Throws a `TypeError` if the graph nodes are not `Lemma` objects, e.g.,
+for `TopicRank`.
+
+    textrank:
+the ranking state of the document, i.e., its `doc._.textrank` value
+
+    returns:
+the snapshot
+        """
+        import scipy.sparse as sp  # type: ignore # pylint: disable=C0415,E0401
+
+        graph = textrank.lemma_graph
+        nodes: typing.List[Lemma] = list(graph.nodes())
+
+        if not all(isinstance(node, Lemma) for node in nodes):
+            raise TypeError("snapshots require a lemma graph, where each node is a `Lemma`")
+
+        node_index: typing.Dict[Lemma, int] = { node: i for i, node in enumerate(nodes) }
+
+        # symmetric adjacency, where a self-loop only counts once
+        rows: typing.List[int] = []
+        cols: typing.List[int] = []
+        weights: typing.List[float] = []
+
+        for node_u, node_v, weight in graph.edges(data="weight", default=1.0):
+            u = node_index[node_u]
+            v = node_index[node_v]
+            rows.append(u)
+            cols.append(v)
+            weights.append(weight)
+
+            if u != v:
+                rows.append(v)
+                cols.append(u)
+                weights.append(weight)
+
+        adjacency = sp.csr_matrix(
+            (np.array(weights, dtype=np.float64), (rows, cols)),
+            shape=(len(nodes), len(nodes)),
+        )
+
+        # the kept tokens, i.e., those represented by a node
+        token_node: typing.List[int] = []
+        token_lower: typing.List[str] = []
+        token_lemma: typing.List[str] = []
+        token_offset: typing.List[int] = []
+
+        for token in textrank.doc:
+            node_id = node_index.get(Lemma(token.lemma_, token.pos_))
+
+            if node_id is not None:
+                token_node.append(node_id)
+                token_lower.append(token.text.lower())
+                token_lemma.append(token.lemma_.lower())
+                token_offset.append(token.i)
+
+        doc_lower: typing.List[str] = [ token.lower_ for token in textrank.doc ]
+
+        # the phrase chunks, with the nodes of their kept tokens
+        chunks = textrank._get_phrase_spans()  # pylint: disable=W0212
+        chunk_text: typing.List[str] = [ textrank.scrubber(span) for span in chunks ]
+        chunk_node_ptr: typing.List[int] = [ 0 ]
+        chunk_node_ids: typing.List[int] = []
+
+        for span in chunks:
+            for token in span:
+                node_id = node_index.get(Lemma(token.lemma_, token.pos_))
+
+                if node_id is not None:
+                    chunk_node_ids.append(node_id)
+
+            chunk_node_ptr.append(len(chunk_node_ids))
+
+        # the sentences, with their paragraph ids
+        sents = list(textrank.doc.sents)
+        sent_para = np.zeros(len(sents), dtype=np.int64)
+
+        for para_id, para_elem in enumerate(textrank._get_para_bounds()):  # pylint: disable=W0212
+            sent_para[para_elem] = para_id
+
+        # intern every string into a sorted table of ids
+        node_lemma: typing.List[str] = [ node.lemma for node in nodes ]
+        node_pos: typing.List[str] = [ node.pos for node in nodes ]
+
+        strings: typing.List[str] = sorted(set(
+            node_lemma + node_pos + token_lower + token_lemma + doc_lower + chunk_text
+        ))
+
+        string_ids: typing.Dict[str, int] = { string: i for i, string in enumerate(strings) }
+
+        def intern (values: typing.List[str]) -> np.ndarray:
+            """look up the string ids of a list of strings"""
+            return np.array([ string_ids[value] for value in values ], dtype=np.int64)
+
+        return cls(
+            adjacency = adjacency,
+            strings = strings,
+            node_lemma = intern(node_lemma),
+            node_pos = intern(node_pos),
+            ranks = np.array([ textrank.ranks.get(node, 0.0) for node in nodes ], dtype=np.float64),
+            token_node = np.array(token_node, dtype=np.int64),
+            token_lower = intern(token_lower),
+            token_lemma = intern(token_lemma),
+            token_offset = np.array(token_offset, dtype=np.int64),
+            doc_lower = intern(doc_lower),
+            chunk_start = np.array([ span.start for span in chunks ], dtype=np.int64),
+            chunk_end = np.array([ span.end for span in chunks ], dtype=np.int64),
+            chunk_text = intern(chunk_text),
+            chunk_non_lemma = np.array([
+                sum(1 for token in span if token.pos_ not in textrank.pos_kept)
+                for span in chunks
+            ], dtype=np.int64),
+            chunk_node_ptr = np.array(chunk_node_ptr, dtype=np.int64),
+            chunk_node_ids = np.array(chunk_node_ids, dtype=np.int64),
+            sent_start = np.array([ sent.start for sent in sents ], dtype=np.int64),
+            sent_end = np.array([ sent.end for sent in sents ], dtype=np.int64),
+            text = textrank.doc.text,
+            sent_char_start = np.array([ sent.start_char for sent in sents ], dtype=np.int64),
+            sent_char_end = np.array([ sent.end_char for sent in sents ], dtype=np.int64),
+            sent_para = sent_para,
+        )
+
+
+    def save (
+        self,
+        path: typing.Union[ str, pathlib.Path ],
+        ) -> None:
+        """
+Save the snapshot to a compressed `.npz` file.
+
+    path:
+path for the output file
+        """
+        # the string table as one UTF-8 blob, with character offsets
+        string_ptr = np.cumsum([ 0 ] + [ len(string) for string in self.strings ], dtype=np.int64)
+
+        np.savez_compressed(
+            path,
+            version = np.array(self._VERSION),
+            adj_data = self.adjacency.data,
+            adj_indices = self.adjacency.indices,
+            adj_indptr = self.adjacency.indptr,
+            adj_shape = np.array(self.adjacency.shape),
+            string_data = np.frombuffer("".join(self.strings).encode("utf-8"), dtype=np.uint8),
+            string_ptr = string_ptr,
+            text_data = np.frombuffer(self.text.encode("utf-8"), dtype=np.uint8),
+            node_lemma = self.node_lemma,
+            node_pos = self.node_pos,
+            ranks = self.ranks,
+            token_node = self.token_node,
+            token_lower = self.token_lower,
+            token_lemma = self.token_lemma,
+            token_offset = self.token_offset,
+            doc_lower = self.doc_lower,
+            chunk_start = self.chunk_start,
+            chunk_end = self.chunk_end,
+            chunk_text = self.chunk_text,
+            chunk_non_lemma = self.chunk_non_lemma,
+            chunk_node_ptr = self.chunk_node_ptr,
+            chunk_node_ids = self.chunk_node_ids,
+            sent_start = self.sent_start,
+            sent_end = self.sent_end,
+            sent_char_start = self.sent_char_start,
+            sent_char_end = self.sent_char_end,
+            sent_para = self.sent_para,
+        )
+
+
+    @classmethod
+    def load (
+        cls,
+        path: typing.Union[ str, pathlib.Path ],
+        ) -> "RankSnapshot":
+        """
+Load a snapshot from a `.npz` file.
+
+Throws a `ValueError` if the file uses an unsupported format version.
+
+    path:
+path for the input file
+
+    returns:
+the snapshot
+        """
+        import scipy.sparse as sp  # type: ignore # pylint: disable=C0415,E0401
+
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["version"])
+
+            if version != cls._VERSION:
+                raise ValueError("unsupported snapshot version: {}".format(version))
+
+            adjacency = sp.csr_matrix(
+                (data["adj_data"], data["adj_indices"], data["adj_indptr"]),
+                shape=tuple(data["adj_shape"]),
+            )
+
+            blob = data["string_data"].tobytes().decode("utf-8")
+            string_ptr = data["string_ptr"].tolist()
+
+            return cls(
+                adjacency = adjacency,
+                strings = [ blob[lo:hi] for lo, hi in zip(string_ptr[:-1], string_ptr[1:]) ],
+                text = data["text_data"].tobytes().decode("utf-8"),
+                **{
+                    key: data[key]
+                    for key in data.files
+                    if key not in ("version", "string_data", "string_ptr", "text_data")
+                    and not key.startswith("adj_")
+                },
+            )
+
+
+    @property
+    def node_list (
+        self
+        ) -> typing.List[Lemma]:
+        """
+Build a list of the nodes in the lemma graph, in the order used to
+index the adjacency matrix.
+
+    returns:
+list of nodes
+        """
+        return [
+            Lemma(self.strings[lemma], self.strings[pos])
+            for lemma, pos in zip(self.node_lemma.tolist(), self.node_pos.tolist())
+        ]
+
+
+    def rank (
+        self,
+        personalization: typing.Optional[typing.Dict[Lemma, float]] = None,
+        ) -> typing.List[Phrase]:
+        """
+Re-run *PageRank* on the lemma graph, then re-rank the phrases.
+
+    personalization:
+optional *node weights* for the
+[*Personalized PageRank*](https://derwen.ai/docs/ptr/glossary/#personalized-pagerank)
+algorithm, where missing nodes get a weight of zero; defaults to uniform weights
+
+    returns:
+list of ranked phrases, in descending order
+        """
+        node_weights: typing.Optional[np.ndarray] = None
+
+        if personalization is not None:
+            node_weights = np.array([
+                personalization.get(node, 0.0)
+                for node in self.node_list
+            ], dtype=np.float64)
+
+        return self._rank_nodes(node_weights)
+
+
+    def change_focus (
+        self,
+        focus: str = None,
+        bias: float = _DEFAULT_BIAS,
+        default_bias: float = _DEFAULT_BIAS,
+        focus_phrases: typing.Optional[typing.List[str]] = None,
+        ) -> typing.List[Phrase]:
+        """
+Re-rank the phrases with the given focus, the same as
+`BiasedTextRank.change_focus()` for the document this snapshot was taken
+from.
+
+    focus:
+optional text (string) with whitespace-delimited tokens to use for the *focus set*; defaults to `None`
+
+    bias:
+optional bias for *node weight* values on tokens found within the *focus set*; defaults to `1.0`
+
+    default_bias:
+optional bias for *node weight* values on tokens not found within the *focus set*; defaults to `1.0`
+
+    focus_phrases:
+optional list of multi-token phrases, each with whitespace-delimited tokens, where every token within a match of a phrase (ignoring case) is in focus; defaults to `None`
+
+    returns:
+list of ranked phrases, in descending order
+        """
+        focus_tokens = np.array([
+            self.string_ids[word]
+            for word in (focus.lower().split() if focus else [])
+            if word in self.string_ids
+        ], dtype=np.int64)
+
+        in_focus = np.isin(self.token_lower, focus_tokens) | np.isin(self.token_lemma, focus_tokens)
+        biases = np.where(in_focus, bias, default_bias)
+
+        # the last occurrence of each node determines its weight
+        last = np.full(len(self.node_lemma), -1, dtype=np.int64)
+        np.maximum.at(last, self.token_node, np.arange(len(self.token_node)))
+
+        node_weights = np.where(last >= 0, biases[last], 0.0)
+
+        # while any occurrence within a focus phrase puts its node in focus
+        in_phrase = self._match_phrases(focus_phrases or [])
+        node_weights[self.token_node[in_phrase[self.token_offset]]] = bias
+
+        if node_weights.sum() == 0.0:
+            return self._rank_nodes(None)
+
+        return self._rank_nodes(node_weights)
+
+
+    def _match_phrases (
+        self,
+        focus_phrases: typing.List[str],
+        ) -> np.ndarray:
+        """
+Find the tokens within a match of any of the focus phrases, comparing
+the lowercase text of each token, the same as a `spaCy` `PhraseMatcher`
+on the `LOWER` attribute.
+
+    focus_phrases:
+list of multi-token phrases, each with whitespace-delimited tokens
+
+    returns:
+boolean mask over the tokens of the document
+        """
+        n_tokens = len(self.doc_lower)
+        in_phrase = np.zeros(n_tokens, dtype=bool)
+
+        for phrase in focus_phrases:
+            words = [ self.string_ids.get(word.lower(), -1) for word in phrase.split() ]
+            n_starts = n_tokens - len(words) + 1
+
+            # a word which is not in the string table never matches
+            if not words or n_starts < 1 or -1 in words:
+                continue
+
+            is_match = np.ones(n_starts, dtype=bool)
+
+            for pos, word in enumerate(words):
+                is_match &= self.doc_lower[pos:pos + n_starts] == word
+
+            starts = np.flatnonzero(is_match)
+
+            for pos in range(len(words)):
+                in_phrase[starts + pos] = True
+
+        return in_phrase
+
+
+    def _rank_nodes (
+        self,
+        node_weights: typing.Optional[np.ndarray],
+        ) -> typing.List[Phrase]:
+        """
+Run *PageRank* with the given node weights, then re-rank the phrases.
+
+    node_weights:
+optional array of *node weights*, indexed by node
+
+    returns:
+list of ranked phrases, in descending order
+        """
+        self.ranks = pagerank_matrix(self.adjacency, personalization=node_weights)
+        self.phrase_table = self._rank_phrases()
+        self._phrases = None
+
+        return self.phrases
+
+
+    def _rank_phrases (
+        self
+        ) -> PhraseTable:
+        """
+Aggregate the node ranks into phrase ranks, the same as
+`BaseTextRank.calc_textrank()` does for the phrase spans, filling a
+table of phrases directly from the arrays of phrase chunks.
+
+    returns:
+table of ranked phrases, in descending order
+        """
+        n_chunks = len(self.chunk_start)
+        lengths = (self.chunk_end - self.chunk_start).astype(np.float64)
+        non_lemma = self.chunk_non_lemma.astype(np.float64)
+
+        sum_rank = np.bincount(
+            np.repeat(np.arange(n_chunks), np.diff(self.chunk_node_ptr)),
+            weights=self.ranks[self.chunk_node_ids],
+            minlength=n_chunks,
+        )
+
+        chunk_ranks = discounted_normalised_rank(lengths, non_lemma, sum_rank)
+
+        # group the chunks by text, in sorted order – since the string
+        # table is sorted – where the rank of a phrase is the maximum
+        # rank of its chunks
+        text_ids, group, counts = np.unique(self.chunk_text, return_inverse=True, return_counts=True)
+        texts = np.array([ self.strings[text_id] for text_id in text_ids.tolist() ], dtype=str)
+        group = group.ravel()
+
+        group_ranks = np.full(len(texts), -np.inf)
+        np.maximum.at(group_ranks, group, chunk_ranks)
+
+        # a stable sort in descending order of rank, then the chunks of
+        # each phrase in document order
+        order = np.argsort(-group_ranks, kind="stable")
+        row = np.empty(len(texts), dtype=np.int64)
+        row[order] = np.arange(len(texts))
+        chunk_order = np.argsort(row[group], kind="stable")
+
+        return PhraseTable(
+            text = texts[order],
+            rank = group_ranks[order],
+            count = counts[order].astype(np.int64),
+            chunk_ptr = np.concatenate([ [ 0 ], np.cumsum(counts[order]) ]).astype(np.int64),
+            chunk_start = self.chunk_start[chunk_order],
+            chunk_end = self.chunk_end[chunk_order],
+        )
+
+
+    def summary (
+        self,
+        *,
+        limit_phrases: int = 10,
+        limit_sentences: int = 4,
+        preserve_order: bool = False,
+        level: str = "sentence",
+        ) -> typing.Iterator[str]:
+        """
+Run an
+[*extractive summarization*](https://derwen.ai/docs/ptr/glossary/#extractive-summarization)
+on the current phrase ranks, the same as `BaseTextRank.summary()`.
+
+    limit_phrases:
+maximum number of top-ranked phrases to use in the distance vectors
+
+    limit_sentences:
+total number of sentences to yield for the extractive summarization
+
+    preserve_order:
+flag to preserve the order of sentences as they originally occurred in the source text; defaults to `False`
+
+    level:
+one of `"sentence"`, `"paragraph"`, or `"coverage"`; see `BaseTextRank.summary()`
+
+    yields:
+texts for sentences, in order
+        """
+        top_phrases: typing.List[Phrase] = [
+            self.phrase_table[index]
+            for index in range(min(limit_phrases, len(self.phrase_table)))
+        ]
+
+        unit_vector = BaseTextRank._build_unit_vector(top_phrases, limit_phrases)  # pylint: disable=W0212
+
+        sent_dist: typing.List[Sentence] = [
+            Sentence(
+                start = start,
+                end = end,
+                sent_id = sent_id,
+                phrases = set(),
+                distance = 0.0,
+                )
+            for sent_id, (start, end) in enumerate(zip(self.sent_start.tolist(), self.sent_end.tolist()))
+            ]
+
+        sent_bits = BaseTextRank._measure_sents(sent_dist, unit_vector)  # pylint: disable=W0212
+
+        para_bounds: typing.List[typing.List[int]] = []
+
+        for sent_id, para_id in enumerate(self.sent_para.tolist()):
+            if para_id == len(para_bounds):
+                para_bounds.append([])
+
+            para_bounds[para_id].append(sent_id)
+
+        top_sent_ids = BaseTextRank._select_summary(  # pylint: disable=W0212
+            sent_dist,
+            sent_bits,
+            para_bounds,
+            limit_sentences = limit_sentences,
+            preserve_order = preserve_order,
+            level = level,
+        )
+
+        for sent_id in top_sent_ids:
+            yield self.text[self.sent_char_start[sent_id]:self.sent_char_end[sent_id]]
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# see license https://github.com/DerwenAI/pytextrank#license-and-copyright
+
+"""
+Rank the phrases trending across a stream of documents, where older
+co-occurrence evidence decays over time.
+"""
+
+import math
+import time
+import typing
+
+from spacy.tokens import Doc  # type: ignore # pylint: disable=E0401
+import numpy as np  # type: ignore # pylint: disable=E0401
+
+from .accumulator import ChunkKey, LemmaGraphAccumulator
+from .base import Lemma, Phrase
+from .util import pagerank_matrix
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import scipy.sparse as sp  # type: ignore # pylint: disable=E0401
+
+
+class StreamingTextRank (LemmaGraphAccumulator):
+    """
+Accumulates the co-occurrence counts of a stream of timestamped
+documents into one *lemma graph*, the same as `CorpusTextRank` does,
+except that the weights of the edges and the counts of the phrase
+chunks decay exponentially with the age of the document which added
+them.
+
+Each time the stream gets ranked, any edge or phrase chunk whose
+weight has decayed below `min_weight` gets dropped, along with any
+node left unused, so the memory used is bounded by the evidence from
+the last few `half_life` periods rather than by the length of the
+stream. *PageRank* then starts from the ranks of the previous call.
+
+Adding a document costs the same however long the stream has run: the
+weights get stored relative to a reference time, and only get rescaled
+when ranking, or when the reference time gets too old.
+    """
+
+    # the maximum number of half lives between the reference time and
+    # the time of a document, before the stored weights get rescaled
+    _MAX_HALF_LIVES: float = 64.0
+
+    def __init__ (
+        self,
+        *,
+        half_life: float = 3600.0,
+        min_weight: float = 0.01,
+        rank_interval: typing.Optional[float] = None,
+        **settings: typing.Any,
+        ) -> None:
+        """
+Constructor for a `StreamingTextRank` object, which takes the rate of
+decay plus the same settings as `BaseTextRankFactory`.
+
+    half_life:
+time for a weight to decay by half, in the same units as the timestamps, e.g., seconds
+
+    min_weight:
+threshold below which a decayed edge or phrase chunk gets dropped
+
+    rank_interval:
+optional time between the automatic calls to `rank()` while adding documents; if `None` then only rank when called
+
+    settings:
+settings for analyzing the documents, the same as for `BaseTextRankFactory`: `edge_weight`, `pos_kept`, `token_lookback`, `scrubber`, `stopwords`, and `chunker`
+        """
+        super().__init__(**settings)
+
+        self.half_life: float = half_life
+        self.min_weight: float = min_weight
+        self.rank_interval: typing.Optional[float] = rank_interval
+
+        # the decay rate per unit of time
+        self._decay: float = math.log(2.0) / half_life
+
+        # the weights get stored as of the reference time
+        self._t_ref: typing.Optional[float] = None
+        self.last_ranked: typing.Optional[float] = None
+        self.n_docs: int = 0
+
+        # the weight of each edge, keyed by `(u, v)` with `u <= v`
+        self.edges: typing.Dict[typing.Tuple[int, int], float] = {}
+
+        # the decayed count of each distinct phrase chunk
+        self.chunk_counts: typing.Dict[ChunkKey, float] = {}
+
+
+    def add_doc (
+        self,
+        doc: Doc,
+        timestamp: typing.Optional[float] = None,
+        ) -> None:
+        """
+Add the co-occurrence counts and phrase chunks of one document, at a
+cost proportional to the size of the document, then rank the stream if
+`rank_interval` has elapsed since the previous ranking.
+
+    doc:
+a document container, providing the annotations produced by the `spaCy` pipeline
+
+    timestamp:
+optional time of the document, in the same units as `half_life`; defaults to the current time in seconds
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        if self._t_ref is None:
+            self._t_ref = timestamp
+        elif abs(timestamp - self._t_ref) * self._decay > self._MAX_HALF_LIVES * math.log(2.0):
+            self._rescale(timestamp)
+
+        scale = math.exp(self._decay * (timestamp - self._t_ref))
+
+        tr = self._analyze(doc)
+
+        for pair, weight in self._doc_edges(tr).items():
+            self.edges[pair] = self.edges.get(pair, 0.0) + weight * scale
+
+        for span in tr._get_phrase_spans():  # pylint: disable=W0212
+            key = self._chunk_key(tr, span)
+            self.chunk_counts[key] = self.chunk_counts.get(key, 0.0) + scale
+
+        self.n_docs += 1
+
+        if self.rank_interval is not None:
+            if self.last_ranked is None or timestamp - self.last_ranked >= self.rank_interval:
+                self.rank(timestamp)
+
+
+    def _rescale (
+        self,
+        now: float,
+        ) -> None:
+        """
+Decay the stored weights to a new reference time.
+
+    now:
+the new reference time
+        """
+        factor = math.exp(-self._decay * (now - self._t_ref))  # type: ignore
+
+        self.edges = { pair: weight * factor for pair, weight in self.edges.items() }
+        self.chunk_counts = { key: count * factor for key, count in self.chunk_counts.items() }
+        self._t_ref = now
+
+
+    def prune (
+        self,
+        now: typing.Optional[float] = None,
+        ) -> None:
+        """
+Decay the weights to the given time, then drop the edges and phrase
+chunks whose weights are below `min_weight`, along with any nodes which
+these no longer use; the remaining nodes get renumbered.
+
+    now:
+optional time to decay to; defaults to the current time in seconds
+        """
+        if self._t_ref is None:
+            return
+
+        self._rescale(time.time() if now is None else now)
+
+        edges = { pair: weight for pair, weight in self.edges.items() if weight >= self.min_weight }
+        chunk_counts = { key: count for key, count in self.chunk_counts.items() if count >= self.min_weight }
+
+        used: typing.Set[int] = set()
+
+        for u, v in edges:
+            used.add(u)
+            used.add(v)
+
+        for key in chunk_counts:
+            used.update(key[1])
+
+        node_list = [ node for node_id, node in enumerate(self.node_list) if node_id in used ]
+        id_map = { self.vocab[node]: node_id for node_id, node in enumerate(node_list) }
+
+        self.node_list = node_list
+        self.vocab = { node: node_id for node_id, node in enumerate(node_list) }
+
+        self.edges = {
+            (id_map[u], id_map[v]): weight
+            for (u, v), weight in edges.items()
+        }
+
+        self.chunk_counts = {
+            (text, tuple(id_map[node_id] for node_id in node_ids), length, non_lemma): count
+            for (text, node_ids, length, non_lemma), count in chunk_counts.items()
+        }
+
+
+    @property
+    def adjacency (
+        self
+        ) -> "sp.csr_matrix":
+        """
+Accessor for the lemma graph as a symmetric sparse adjacency matrix,
+indexed by node id, where a self-loop only counts once. The weights are
+as of the reference time, i.e., the latest ranking.
+
+    returns:
+the weighted adjacency matrix
+        """
+        pairs = np.array(list(self.edges), dtype=np.int64).reshape(-1, 2)
+        weights = np.fromiter(self.edges.values(), dtype=np.float64, count=len(self.edges))
+
+        return self._symmetric_adjacency(pairs[:, 0], pairs[:, 1], weights, len(self.node_list))
+
+
+    def rank (
+        self,
+        now: typing.Optional[float] = None,
+        personalization: typing.Optional[typing.Dict[Lemma, float]] = None,
+        ) -> typing.List[Phrase]:
+        """
+Prune the lemma graph as of the given time, run *PageRank* starting
+from the ranks of the previous call, then rank the phrases.
+
+Since the documents do not get kept, the phrases have no `chunks`, and
+their `count` is the decayed number of occurrences, rounded.
+
+    now:
+optional time to rank as of; defaults to the current time in seconds
+
+    personalization:
+optional *node weights* for the
+[*Personalized PageRank*](https://derwen.ai/docs/ptr/glossary/#personalized-pagerank)
+algorithm, where missing nodes get a weight of zero; defaults to uniform weights
+
+    returns:
+list of ranked phrases, in descending order
+        """
+        if now is None:
+            now = time.time()
+
+        self.prune(now)
+        self.last_ranked = now
+
+        n_nodes = len(self.node_list)
+        nstart: typing.Optional[np.ndarray] = None
+
+        # the nodes added since then start from a uniform value
+        if self.ranks and n_nodes > 0:
+            nstart = np.array([
+                self.ranks.get(node, 1.0 / n_nodes)
+                for node in self.node_list
+            ], dtype=np.float64)
+
+        scores = pagerank_matrix(self.adjacency, personalization=self._node_weights(personalization), nstart=nstart)
+
+        self.ranks = dict(zip(self.node_list, scores.tolist()))
+        self.phrases = [
+            Phrase(
+                text = text,
+                rank = rank,
+                count = round(sum(counts)),
+                chunks = [],
+            )
+            for text, rank, counts in self._group_chunks(scores, self.chunk_counts)
+        ]
+
+        return self.phrases
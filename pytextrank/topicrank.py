@@ -7,17 +7,292 @@ Implements the *TopicRank* algorithm.
 """
 
 from collections import defaultdict
-from functools import lru_cache
+import threading
 import time
 import typing
 
-from icecream import ic  # type: ignore # pylint: disable=E0401,W0611 # lgtm[py/unused-import]
-from scipy.cluster.hierarchy import fcluster, linkage  # type: ignore # pylint: disable=E0401
-from scipy.spatial.distance import pdist  # type: ignore # pylint: disable=E0401
 from spacy.tokens import Doc, Span  # type: ignore # pylint: disable=E0401
-import networkx as nx  # type: ignore # pylint: disable=E0401
+import numpy as np  # type: ignore # pylint: disable=E0401
 
 from .base import BaseTextRank, BaseTextRankFactory, Phrase, StopWordsLike
+from .util import LRUCache, pagerank_matrix
+
+# `scipy` and `networkx` get imported on first use, to keep the startup
+# cost of `import pytextrank` down
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import networkx as nx  # type: ignore # pylint: disable=E0401
+    import scipy.sparse as sp  # type: ignore # pylint: disable=E0401
+
+
+def _term_incidence (
+    term_sets: typing.Sequence[typing.AbstractSet[str]],
+    ) -> "sp.csr_matrix":
+    """
+Build a sparse boolean `rows x terms` incidence matrix in one pass,
+with a column index from a dictionary lookup per term.
+
+    term_sets:
+list of bag-of-words rows, as sets of terms
+
+    returns:
+sparse incidence matrix
+    """
+    import scipy.sparse as sp  # type: ignore # pylint: disable=C0415,E0401
+
+    cols: typing.Dict[str, int] = {}
+    row_ind: typing.List[int] = []
+    col_ind: typing.List[int] = []
+
+    for row, terms in enumerate(term_sets):
+        for term in terms:
+            row_ind.append(row)
+            col_ind.append(cols.setdefault(term, len(cols)))
+
+    return sp.csr_matrix(
+        (np.ones(len(row_ind), dtype=np.float64), (row_ind, col_ind)),
+        shape=(len(term_sets), len(cols)),
+    )
+
+
+def _overlap_pairs (
+    term_sets: typing.Sequence[typing.AbstractSet[str]],
+    ) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+Find the pairs of bag-of-words rows which share at least one term,
+i.e., the only pairs which can be closer than a *Jaccard* distance of
+`1.0`, through the sparse product of the term incidence matrix with its
+transpose.
+
+    term_sets:
+list of bag-of-words rows, as sets of terms
+
+    returns:
+the first row, the second row, and the distance of each pair, where the first row is less than the second
+    """
+    import scipy.sparse as sp  # type: ignore # pylint: disable=C0415,E0401
+
+    incidence = _term_incidence(term_sets)
+    lengths = np.asarray(incidence.sum(axis=1)).ravel()
+
+    overlap = sp.triu(incidence @ incidence.T, k=1).tocoo()
+    union = lengths[overlap.row] + lengths[overlap.col] - overlap.data
+
+    return (
+        overlap.row.astype(np.int64),
+        overlap.col.astype(np.int64),
+        (union - overlap.data) / union,
+    )
+
+
+def _jaccard_pdist (
+    term_sets: typing.Sequence[typing.AbstractSet[str]],
+    ) -> np.ndarray:
+    """
+Calculate the pairwise *Jaccard* distances between bag-of-words rows,
+in the condensed form returned by
+[`scipy.spatial.distance.pdist`](https://docs.scipy.org/doc/scipy/reference/generated/scipy.spatial.distance.pdist.html).
+
+The distances only get computed once per pair of distinct sets of
+terms which overlap, then each row of the condensed upper triangle
+gets filled from these, so that no square matrix gets allocated beyond
+the condensed vector itself.
+
+    term_sets:
+list of bag-of-words rows, as sets of terms
+
+    returns:
+condensed vector of pairwise distances
+    """
+    import scipy.sparse as sp  # type: ignore # pylint: disable=C0415,E0401
+
+    n_rows = len(term_sets)
+    unique_rows: typing.Dict[typing.FrozenSet[str], int] = {}
+
+    row_ids = np.array([
+        unique_rows.setdefault(frozenset(terms), len(unique_rows))
+        for terms in term_sets
+    ], dtype=np.int64)
+
+    n_unique = len(unique_rows)
+    pair_u, pair_v, pair_dist = _overlap_pairs(list(unique_rows))
+
+    neighbors = sp.csr_matrix(
+        (
+            np.concatenate([ pair_dist, pair_dist ]),
+            (np.concatenate([ pair_u, pair_v ]), np.concatenate([ pair_v, pair_u ])),
+        ),
+        shape=(n_unique, n_unique),
+    )
+
+    # identical sets have a distance of 0.0, including two empty sets
+    # the same as `pdist`, and sets which do not overlap 1.0
+    dist = np.empty(n_rows * (n_rows - 1) // 2, dtype=np.float64)
+    lookup = np.ones(n_unique, dtype=np.float64)
+    lo = 0
+
+    for row in range(n_rows - 1):
+        unique_id = row_ids[row]
+        cols = neighbors.indices[neighbors.indptr[unique_id]:neighbors.indptr[unique_id + 1]]
+
+        lookup[cols] = neighbors.data[neighbors.indptr[unique_id]:neighbors.indptr[unique_id + 1]]
+        lookup[unique_id] = 0.0
+
+        hi = lo + n_rows - 1 - row
+        dist[lo:hi] = lookup[row_ids[row + 1:]]
+        lo = hi
+
+        lookup[cols] = 1.0
+        lookup[unique_id] = 1.0
+
+    return dist
+
+
+def _sparse_clusters (
+    term_sets: typing.Sequence[typing.AbstractSet[str]],
+    max_dist: float,
+    method: str,
+    cache: typing.Optional[LRUCache] = None,
+    ) -> np.ndarray:
+    """
+Cluster bag-of-words rows without materializing all of the pairwise
+distances.
+
+Only the pairs of rows which share at least one term can be closer than
+a *Jaccard* distance of `1.0`, so these pairs get found by joining the
+rows through the inverted index from each term to its rows, i.e., the
+sparse product of the incidence matrix with its transpose.
+The pairs within `max_dist` link the rows into connected blocks:
+
+  * `"single"` linkage takes each block as one cluster, which matches the flat clusters of the `"single"` method of [`scipy.cluster.hierarchy.linkage`](https://docs.scipy.org/doc/scipy/reference/generated/scipy.cluster.hierarchy.linkage.html) exactly
+  * `"average"` and `"complete"` linkage run `linkage` only within each block, since neither merges two clusters unless some pair of their rows is within the cut distance
+
+Running the linkage per block approximates running it on all of the
+rows: when several merges within a block are tied at the same
+distance, `linkage` may order them differently depending on the other
+blocks, which can change the flat clusters. Otherwise the results are
+the same, while memory and time scale with the number of overlapping
+pairs and the size of the largest block, rather than the square of the
+number of rows.
+
+    term_sets:
+list of bag-of-words rows, as sets of terms
+
+    max_dist:
+maximum distance at which clusters get merged
+
+    method:
+one of `"single"`, `"average"`, or `"complete"`
+
+    cache:
+optional cache of the flat clusters of each block for `"average"` and `"complete"` linkage, keyed by the sets of terms of its rows, which can be shared across documents
+
+    returns:
+flat cluster id for each row
+    """
+    from scipy.sparse.csgraph import connected_components  # type: ignore # pylint: disable=C0415,E0401
+    import scipy.sparse as sp  # type: ignore # pylint: disable=C0415,E0401
+
+    n_rows = len(term_sets)
+
+    # pairs of distinct rows which share terms, with their distance
+    pair_u, pair_v, pair_dist = _overlap_pairs(term_sets)
+    linked = pair_dist <= max_dist
+    link_u = pair_u[linked]
+    link_v = pair_v[linked]
+
+    # empty rows share no terms, although their distance is 0.0 the
+    # same as `pdist`, so chain these into one block
+    empty_rows = np.array([ row for row, terms in enumerate(term_sets) if not terms ], dtype=np.int64)
+
+    if max_dist >= 0.0 and len(empty_rows) > 1:
+        link_u = np.concatenate([ link_u, empty_rows[:-1] ])
+        link_v = np.concatenate([ link_v, empty_rows[1:] ])
+
+    n_blocks, block_ids = connected_components(
+        sp.coo_matrix(
+            (np.ones(len(link_u)), (link_u, link_v)),
+            shape=(n_rows, n_rows),
+        ),
+        directed=False,
+    )
+
+    if method == "single":
+        return block_ids
+
+    # run the linkage within each block
+    cluster_ids = np.arange(n_rows)
+    order = np.argsort(block_ids, kind="stable")
+    bounds = np.searchsorted(block_ids[order], np.arange(n_blocks + 1))
+
+    for block in range(n_blocks):
+        rows = order[bounds[block]:bounds[block + 1]]
+
+        if len(rows) < 2:
+            continue
+
+        local_ids = _block_clusters(term_sets, rows, max_dist, method, cache=cache)
+        cluster_ids[rows] = rows[local_ids]
+
+    return cluster_ids
+
+
+def _block_clusters (
+    term_sets: typing.Sequence[typing.AbstractSet[str]],
+    rows: np.ndarray,
+    max_dist: float,
+    method: str,
+    cache: typing.Optional[LRUCache] = None,
+    ) -> np.ndarray:
+    """
+Cluster one block of bag-of-words rows, using all of their pairwise
+distances.
+
+    term_sets:
+list of bag-of-words rows, as sets of terms
+
+    rows:
+the rows within the block
+
+    max_dist:
+maximum distance at which clusters get merged
+
+    method:
+either `"average"` or `"complete"`
+
+    cache:
+optional cache of the flat clusters of each block, keyed by the sets of terms of its rows
+
+    returns:
+flat cluster id for each row in the block, as a position within the block
+    """
+    from scipy.cluster.hierarchy import fcluster, linkage  # type: ignore # pylint: disable=C0415,E0401
+
+    # keyed apart from the clusters of all of the candidates for the
+    # dense method of the same name, which get labeled differently
+    block_sets = tuple(frozenset(term_sets[row]) for row in rows)
+    key = ("sparse_" + method, max_dist, block_sets)
+
+    if cache is not None:
+        local_ids = cache.get(key)
+
+        if local_ids is not None:
+            return local_ids
+
+    pairwise_dist = _jaccard_pdist(block_sets)
+
+    # remap the flat cluster ids onto positions within the block
+    flat_ids = fcluster(linkage(pairwise_dist, method=method), t=max_dist, criterion="distance")
+    first_pos: typing.Dict[int, int] = {}
+
+    local_ids = np.array([
+        first_pos.setdefault(flat_id, pos)
+        for pos, flat_id in enumerate(flat_ids)
+    ])
+
+    if cache is not None:
+        cache.put(key, local_ids)
+
+    return local_ids
 
 
 class TopicRankFactory (BaseTextRankFactory):
@@ -28,6 +303,7 @@ A factory class that provides the document with its instance of
 
     _CLUSTER_THRESHOLD: float = 0.25
     _CLUSTER_METHOD: str = "average"
+    _CACHE_SIZE: int = 0
 
     def __init__ (
         self,
@@ -37,11 +313,23 @@ A factory class that provides the document with its instance of
         token_lookback: int = BaseTextRankFactory._TOKEN_LOOKBACK,
         scrubber: typing.Optional[typing.Callable] = None,
         stopwords: typing.Optional[StopWordsLike] = None,
+        chunker: str = BaseTextRankFactory._CHUNKER,
+        observer: typing.Optional[typing.Callable] = None,
         threshold: float = _CLUSTER_THRESHOLD,
         method: str = _CLUSTER_METHOD,
+        cache_size: int = _CACHE_SIZE,
         ) -> None:
         """
 Constructor for the factory class.
+
+    threshold:
+threshold used in *TopicRank* candidate clustering; the original algorithm uses 0.25
+
+    method:
+clustering method used in *TopicRank* candidate clustering: see `TopicRank` for the valid methods; only single linkage, i.e., `"single"` or `"sparse_single"`, clusters the candidates which have the same set of terms once per set, since the other methods, including the default `"average"`, get run on every candidate to keep the clusters exact
+
+    cache_size:
+maximum number of clustering results to cache across the documents processed by this factory, for streams of documents where the same candidates recur: for `"sparse_average"` the flat clusters of each block of overlapping candidates, and for the other methods except `"sparse_single"` the flat clusters of all of the candidates in a document, each keyed by the sets of terms of the candidates, so that a hit skips the `linkage`; the clusters stay the same as without the cache; defaults to `0` which disables the cache
         """
         super().__init__(
             edge_weight=edge_weight,
@@ -49,12 +337,22 @@ Constructor for the factory class.
             token_lookback=token_lookback,
             scrubber=scrubber,
             stopwords=stopwords,
+            chunker=chunker,
+            observer=observer,
         )
 
         # TopicRank clustering parameters
         self.threshold: float = threshold
         self.method: str = method
 
+        # optional cache of the clustering results for candidate term
+        # sets, shared across documents;
+        # see `cache.cache_info()` for the hits and misses
+        self.cache: typing.Optional[LRUCache] = None
+
+        if cache_size > 0:
+            self.cache = LRUCache(cache_size)
+
 
     def __call__ (
         self,
@@ -80,8 +378,11 @@ a document container, providing the annotations produced by earlier stages of th
             token_lookback=self.token_lookback,
             scrubber=self.scrubber,
             stopwords=self.stopwords,
+            chunker=self.chunker,
+            observer=self.observer,
             threshold=self.threshold,
             method=self.method,
+            cache=self.cache,
         )
 
         doc._.phrases = doc._.textrank.calc_textrank()
@@ -118,6 +419,23 @@ Algorithm Overview:
    the topic.
     """
 
+    _WEIGHT_BLOCK_ELEMS: int = 1 << 22
+
+    # linkage methods where candidates having the same set of terms
+    # can get clustered once per set: single linkage joins each pair of
+    # rows within the cut distance regardless of the order of merges,
+    # while the other methods break ties between merges by the order
+    # and multiplicity of the rows, so their results can change
+    _DEDUPE_METHODS: typing.Set[str] = set([ "single", "sparse_single" ])
+
+    # clustering backends which avoid computing all of the pairwise
+    # distances, mapped to the linkage method they run per block of
+    # overlapping candidates
+    _SPARSE_METHODS: typing.Dict[str, str] = {
+        "sparse_average": "average",
+        "sparse_single": "single",
+    }
+
     def __init__(
         self,
         doc: Doc,
@@ -128,6 +446,9 @@ Algorithm Overview:
         stopwords: typing.Dict[str, typing.List[str]],
         threshold: float,
         method: str,
+        cache: typing.Optional[LRUCache] = None,
+        chunker: str = BaseTextRankFactory._CHUNKER,
+        observer: typing.Optional[typing.Callable] = None,
         ) -> None:
         """
 Constructor for a factory used to instantiate the PyTextRank pipeline components.
@@ -151,15 +472,29 @@ optional dictionary of `lemma: [pos]` items to define the *stop words*, where ea
 threshold used in *TopicRank* candidate clustering; the original algorithm uses 0.25
 
     method:
-clustering method used in *TopicRank* candidate clustering: see [`scipy.cluster.hierarchy.linkage`](https://docs.scipy.org/doc/scipy/reference/generated/scipy.cluster.hierarchy.linkage.html) for valid methods; the original algorithm uses "average"
+clustering method used in *TopicRank* candidate clustering: see [`scipy.cluster.hierarchy.linkage`](https://docs.scipy.org/doc/scipy/reference/generated/scipy.cluster.hierarchy.linkage.html) for valid methods; the original algorithm uses "average"; use "sparse_single" for the same results as "single" on large documents, without computing all of the pairwise distances, or "sparse_average" for an approximation of "average" which can differ where merges are tied; only "single" and "sparse_single" cluster the candidates which have the same set of terms once per set
+
+    cache:
+optional cache of the clustering results for the candidate term sets, shared across documents; see `TopicRankFactory`
+
+    chunker:
+how to find the candidate noun phrases: one of `"noun_chunks"`, `"pos"`, or `"auto"`
+
+    observer:
+optional function `observer(doc, stage)` to call at the end of each stage with a `Stage` description
         """
         super().__init__(
-            doc, edge_weight, pos_kept, token_lookback, scrubber, stopwords
+            doc, edge_weight, pos_kept, token_lookback, scrubber, stopwords, chunker, observer
         )
 
         # TopicRank candidate clustering parameters
         self.threshold: float = threshold
         self.method: str = method
+        self.cache: typing.Optional[LRUCache] = cache
+
+        # clustered topics, memoized per instance by `node_list`
+        self._topics: typing.Optional[typing.List[typing.Tuple[Span, ...]]] = None
+        self._topics_lock: threading.Lock = threading.Lock()
 
 
     def _cluster (
@@ -173,7 +508,14 @@ where similarity is defined by overlap of lemmas in candidates.
 The `threshold` and `method` parameters influence the clustering
 behaviour. A `threshold` of 0.25 means that there must at least be
 a 25% overlap of lemmas between two candidates for them to be allowed
-in the same cluster.
+in the same cluster. The `"sparse_average"` and `"sparse_single"`
+methods only compare candidates which share terms, so that memory and
+time scale with the overlap between candidates instead of quadratically.
+
+Each candidate gets compared as the set of its terms, so that a term
+repeated within a candidate only counts once: e.g., "big data big data"
+and "big data" have a distance of 0.0, whereas the earlier vectors of
+term counts made them differ in every term, for a distance of 1.0.
 
     candidates:
 list of spans, where each span is a candidate topic.
@@ -184,51 +526,117 @@ list of clusters of candidates.
         if not candidates:
             return []
 
-        bag_of_words = list(
-            {
-                word.text
-                for candidate in candidates
-                for word in candidate
-                if not word.is_stop
-            }
-        )
+        # Create a bag-of-words representation for each candidate, as
+        # the set of its terms, without counting repeated terms
+        term_sets: typing.List[typing.FrozenSet[str]] = [
+            frozenset(term.text for term in candidate if not term.is_stop)
+            for candidate in candidates
+        ]
+
+        cluster_ids = self._cluster_term_sets(term_sets)
+
+        # Map cluster_ids to the corresponding candidates, and then
+        # ignore the cluster id keys.
+        clusters = defaultdict(list)
 
-        # Create a bag-of-words representation with a
-        # |candidates|x|bag_of_words| matrix
-        # matrix = [[0] * len(bag_of_words) for _ in candidates]
-        matrix = []
+        for cluster_id, candidate in zip(cluster_ids, candidates):
+            clusters[cluster_id].append(candidate)
+
+        return list(clusters.values())
 
-        for candidate in candidates:
-            matrix.append([0] * len(bag_of_words))
 
-            for term in candidate:
-                if not term.is_stop:
-                    try:
-                        matrix[-1][bag_of_words.index(term.text)] += 1
-                    except IndexError:
-                        pass
+    def _cluster_term_sets (
+        self,
+        term_sets: typing.List[typing.FrozenSet[str]],
+        ) -> np.ndarray:
+        """
+Run the clustering of `_cluster()` on the bag-of-words representations
+of the candidates.
+
+    term_sets:
+list of bag-of-words rows, as sets of terms, one per candidate
 
+    returns:
+flat cluster id for each candidate
+        """
         # Apply average clustering on pairwise distance,
         # using a threshold of 0.01 below 1 - threshold.
         # So, 0.74 for the default 0.25 threshold.
-        pairwise_dist = pdist(matrix, "jaccard")
+        max_dist = 0.99 - self.threshold
 
-        if not pairwise_dist.size:
-            return [[candidate] for candidate in candidates]
+        row_ids: typing.List[int] = list(range(len(term_sets)))
+        dedupe = self.method in self._DEDUPE_METHODS and max_dist >= 0.0
 
-        raw_clusters = linkage(pairwise_dist, method=self.method)
-        cluster_ids = fcluster(
-            raw_clusters, t=0.99 - self.threshold, criterion="distance"
-        )
+        if dedupe:
+            # group the candidates which have the same set of terms, so
+            # that each distinct set gets clustered only once
+            unique_rows: typing.Dict[typing.FrozenSet[str], int] = {}
 
-        # Map cluster_ids to the corresponding candidates, and then
-        # ignore the cluster id keys.
-        clusters = defaultdict(list)
+            row_ids = [
+                unique_rows.setdefault(terms, len(unique_rows))
+                for terms in term_sets
+            ]
 
-        for cluster_id, candidate in zip(cluster_ids, candidates):
-            clusters[cluster_id].append(candidate)
+            term_sets = list(unique_rows)
 
-        return list(clusters.values())
+        block_method: typing.Optional[str] = self._SPARSE_METHODS.get(self.method)
+
+        if block_method is not None:
+            cluster_ids = _sparse_clusters(
+                term_sets,
+                max_dist,
+                block_method,
+                cache=self.cache,
+            )
+        else:
+            cluster_ids = self._linkage_clusters(term_sets, max_dist)
+
+        return np.asarray(cluster_ids)[row_ids]
+
+
+    def _linkage_clusters (
+        self,
+        term_sets: typing.List[typing.FrozenSet[str]],
+        max_dist: float,
+        ) -> np.ndarray:
+        """
+Run `linkage` on all of the pairwise distances between the candidates,
+reusing the flat clusters from the cache if the same sets of terms have
+been clustered before.
+
+    term_sets:
+list of bag-of-words rows, as sets of terms, one per candidate
+
+    max_dist:
+maximum distance at which clusters get merged
+
+    returns:
+flat cluster id for each candidate
+        """
+        from scipy.cluster.hierarchy import fcluster, linkage  # type: ignore # pylint: disable=C0415,E0401
+
+        key = (self.method, max_dist, tuple(term_sets))
+
+        if self.cache is not None:
+            cluster_ids = self.cache.get(key)
+
+            if cluster_ids is not None:
+                return cluster_ids
+
+        pairwise_dist = _jaccard_pdist(term_sets)
+
+        if not pairwise_dist.size:
+            cluster_ids = np.arange(len(term_sets))
+        else:
+            raw_clusters = linkage(pairwise_dist, method=self.method)
+            cluster_ids = fcluster(
+                raw_clusters, t=max_dist, criterion="distance"
+            )
+
+        if self.cache is not None:
+            self.cache.put(key, cluster_ids)
+
+        return cluster_ids
 
 
     def _get_candidates (
@@ -244,45 +652,109 @@ list of candidate spans
         """
         candidates: typing.List[Span] = []
 
-        try:
-            noun_chunks = list(self.doc.noun_chunks)
-
-            for chunk in noun_chunks:
-                for token in chunk:
-                    if self._keep_token(token):
-                        candidates.append(self.doc[token.i : chunk.end])
-                        break
-        except NotImplementedError as ex:
-            # some languages don't have `noun_chunks` support in spaCy models, e.g. "ru"
-            ic.disable()
-            ic(ex)
-            ic.enable()
+        for chunk in self._get_noun_chunks():
+            for token in chunk:
+                if self._keep_token(token):
+                    candidates.append(self.doc[token.i : chunk.end])
+                    break
 
         return candidates
 
 
-    @property  # type: ignore
-    @lru_cache(maxsize=1)
+    @property
     def node_list (  # type: ignore
         self
         ) -> typing.List[typing.Tuple[Span, ...]]:
         """
 Build a list of vertices for the graph, cached for efficiency.
+The topics get clustered once per instance, until the next `reset()`,
+and concurrent callers wait for the result rather than clustering again.
 
     returns:
 list of nodes
         """
-        # Rely on spaCy to perform *preprocessing* and *candidate extraction*
-        # through ``noun_chunks``, thus completing the first two steps of
-        # the *TopicRank* algorithm.
-        candidates = self._get_candidates()
+        with self._topics_lock:
+            if self._topics is None:
+                t_stage: float = time.perf_counter() if self.observer is not None else 0.0
+
+                # Rely on spaCy to perform *preprocessing* and *candidate extraction*
+                # through ``noun_chunks``, thus completing the first two steps of
+                # the *TopicRank* algorithm.
+                candidates = self._get_candidates()
+
+                if self.observer is not None:
+                    t_stage = self._observe("candidates", t_stage, candidates=len(candidates))
+
+                # Cluster candidates together using a simple set-based overlap of
+                # lemmas. Clustering can occur if the overlap is more than 25%.
+                # Map to a tuple so these clusters are hashable.
+                self._topics = [tuple(cluster) for cluster in self._cluster(candidates)]
+
+                if self.observer is not None:
+                    self._observe("cluster", t_stage, nodes=len(self._topics), candidates=len(candidates))
+
+            return self._topics
+
+
+    def calc_topic_weights (
+        self,
+        ) -> np.ndarray:
+        """
+Calculate the weights for the edges of the complete graph of topics,
+as a dense matrix indexed by the topic order in `node_list`.
+
+The weight between two topics sums the inverse distances between the
+starts of each pair of their candidates, computed in blocks of
+candidates over arrays of start offsets and topic labels.
+
+    returns:
+symmetric `T x T` matrix of edge weights, with zeros on the diagonal
+        """
+        import scipy.sparse as sp  # type: ignore # pylint: disable=C0415,E0401
+
+        topics = self.node_list  # type: ignore
+        n_topics = len(topics)
+
+        starts = np.array(
+            [ member.start for topic in topics for member in topic ],
+            dtype=np.float64,
+        )
+
+        labels = np.array(
+            [ topic_id for topic_id, topic in enumerate(topics) for _ in topic ],
+            dtype=np.intp,
+        )
+
+        n_members = len(starts)
+        weights = np.zeros((n_topics, n_topics), dtype=np.float64)
+
+        # sparse `members x topics` indicator, used to sum the inverse
+        # distances per target topic
+        indicator = sp.csr_matrix(
+            (np.ones(n_members, dtype=np.float64), (np.arange(n_members), labels)),
+            shape=(n_members, n_topics),
+        )
+
+        # bound the size of each block of pairwise distances
+        block_size = max(1, self._WEIGHT_BLOCK_ELEMS // max(1, n_members))
+
+        for lo in range(0, n_members, block_size):
+            hi = min(lo + block_size, n_members)
+            distance = np.abs(starts[lo:hi, None] - starts[None, :])
+
+            inverse = np.divide(
+                1.0,
+                distance,
+                out=np.zeros_like(distance),
+                where=distance > 0.0,
+            )
+
+            np.add.at(weights, labels[lo:hi], (indicator.T @ inverse.T).T)
 
-        # Cluster candidates together using a simple set-based overlap of
-        # lemmas. Clustering can occur if the overlap is more than 25%.
-        # Map to a tuple so these clusters are hashable.
-        clustered = [tuple(cluster) for cluster in self._cluster(candidates)]
+        # a topic does not link to itself
+        np.fill_diagonal(weights, 0.0)
 
-        return clustered
+        return weights * self.edge_weight
 
 
     @property
@@ -295,22 +767,13 @@ Build a list of weighted edges for the graph.
     returns:
 list of weighted edges
         """
-        weighted_edges = []
-
-        for i, source_topic in enumerate(self.node_list):  # type: ignore
-            for target_topic in self.node_list[i + 1 :]:  # type: ignore
-                weight = 0.0
-
-                for source_member in source_topic:
-                    for target_member in target_topic:
-                        distance = abs(source_member.start - target_member.start)
+        topics = self.node_list  # type: ignore
+        weights = self.calc_topic_weights()
 
-                        if distance:
-                            weight += 1.0 / distance
-
-                weight_dict = {"weight": weight * self.edge_weight}
-                weighted_edges.append((source_topic, target_topic, weight_dict))
-                weighted_edges.append((target_topic, source_topic, weight_dict))
+        weighted_edges = [
+            (topics[i], topics[j], {"weight": float(weights[i, j])})
+            for i, j in zip(*np.triu_indices(len(topics), 1))
+        ]
 
         return weighted_edges
 
@@ -332,17 +795,81 @@ list of ranked phrases, in descending order
 
         # for *TopicRank*, the constructed graph is complete
         # with topics as nodes and a distance measure between
-        # two topics as the weights for the edge between them.
-        self.lemma_graph = self._construct_graph()
-
-        # to run the algorithm, we use the NetworkX implementation
-        # for PageRank (i.e., based on eigenvector centrality)
-        # to calculate a rank for each node in the lemma graph
-        self.ranks: typing.Dict[typing.List[Span], float] = nx.pagerank(  # type: ignore
-            self.lemma_graph,
-            personalization=self.get_personalization(),
+        # two topics as the weights for the edge between them;
+        # since the graph is complete, PageRank gets calculated
+        # directly on the dense matrix of edge weights, while
+        # the `lemma_graph` only gets built if it's accessed
+        topics = self.node_list  # type: ignore
+
+        # the stages only get timed for an observer, after the
+        # clustering which reports its own stages
+        t_stage: float = time.perf_counter() if self.observer is not None else 0.0
+
+        weights = self.calc_topic_weights()
+
+        if self.observer is not None:
+            t_stage = self._observe(
+                "graph",
+                t_stage,
+                nodes = len(topics),
+                edges = len(topics) * (len(topics) - 1) // 2,
+            )
+
+        scores = pagerank_matrix(
+            weights,
+            personalization=self._get_node_weights(topics),
         )
 
+        self.ranks: typing.Dict[typing.List[Span], float] = dict(zip(topics, scores.tolist()))  # type: ignore
+
+        if self.observer is not None:
+            t_stage = self._observe("pagerank", t_stage, nodes=len(topics))
+
+        phrase_list: typing.List[Phrase] = self._get_topic_phrases()
+
+        if self.observer is not None:
+            self._observe("phrases", t_stage, candidates=sum(map(len, topics)))
+
+        t1 = time.time()
+        self.elapsed_time = (t1 - t0) * 1000.0
+
+        return phrase_list
+
+
+    def _get_node_weights (
+        self,
+        topics: typing.List[typing.Tuple[Span, ...]],
+        ) -> typing.Optional[np.ndarray]:
+        """
+Get the *node weights* for the *Personalized PageRank* algorithm as an
+array, indexed by the topic order in `node_list`.
+
+    topics:
+the clustered topics
+
+    returns:
+restart probabilities per topic, or `None` to use the uniform default
+        """
+        personalization = self.get_personalization()
+
+        if personalization is None:
+            return None
+
+        return np.array([
+            personalization.get(topic, 0.0)  # type: ignore
+            for topic in topics
+        ])
+
+
+    def _get_topic_phrases (
+        self
+        ) -> typing.List[Phrase]:
+        """
+Select a phrase to represent each of the ranked topics.
+
+    returns:
+list of ranked phrases, in descending order
+        """
         # we convert the topics into a list of Phrases,
         # such that the Phrase text is the first occurring
         # candidate keyphrase of that topic.
@@ -365,15 +892,10 @@ list of ranked phrases, in descending order
             for topic, score in self.ranks.items()
         ]
 
-        phrase_list: typing.List[Phrase] = sorted(
+        return sorted(
             raw_phrase_list, key=lambda p: p.rank, reverse=True
         )
 
-        t1 = time.time()
-        self.elapsed_time = (t1 - t0) * 1000.0
-
-        return phrase_list
-
 
     def reset (
         self
@@ -383,4 +905,38 @@ Reinitialize the data structures needed for extracting phrases,
 removing any pre-existing state.
         """
         super().reset()
-        TopicRank.node_list.fget.cache_clear()  # type: ignore # pylint: disable=E1101
+        self._lemma_graph = None
+
+        with self._topics_lock:
+            self._topics = None
+
+
+    @property
+    def lemma_graph (  # type: ignore
+        self
+        ) -> "nx.Graph":
+        """
+Accessor for the complete graph of topics, which gets constructed on
+demand since *TopicRank* does not need it to calculate the ranks.
+
+    returns:
+a graph with topics as nodes, weighted by the distances between topics
+        """
+        if self._lemma_graph is None:
+            self._lemma_graph = self._construct_graph()
+
+        return self._lemma_graph
+
+
+    @lemma_graph.setter
+    def lemma_graph (
+        self,
+        graph: typing.Optional["nx.Graph"],
+        ) -> None:
+        """
+Replace the graph of topics.
+
+    graph:
+the graph to use, or `None` to construct it again on demand
+        """
+        self._lemma_graph = graph
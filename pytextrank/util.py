@@ -2,13 +2,18 @@
 # -*- coding: utf-8 -*-
 # see license https://github.com/DerwenAI/pytextrank#license-and-copyright
 
+from collections import OrderedDict
+import functools
 import itertools
+import math
 import re
 import string
+import threading
 import typing
 import unicodedata
 
 from spacy.tokens import Span  # type: ignore # pylint: disable=E0401
+import numpy as np  # type: ignore # pylint: disable=E0401
 
 
 def groupby_apply (
@@ -43,6 +48,339 @@ an iterable with the accumulated values
     return accum
 
 
+def groupby_hash (
+    data: typing.Iterable[typing.Any],
+    keyfunc: typing.Callable,
+    applyfunc: typing.Callable,
+    *,
+    sort_keys: bool = False,
+    ) -> typing.List[typing.Tuple[typing.Any, typing.Any]]:
+    """
+GroupBy using a key function and an apply function, accumulating the
+groups in one pass through a dictionary instead of sorting all of the
+data, so the key function gets called once per item and the cost is
+linear in the number of items.
+
+The items within each group stay in their input order, so with
+`sort_keys` set this returns the same results as `groupby_apply()`.
+
+    data:
+iterable
+
+    keyfunc:
+callable to define the key by which you want to group; the keys must be hashable
+
+    applyfunc:
+callable to apply to the list of items in each group
+
+    sort_keys:
+flag to order the groups by key, which only sorts the distinct keys; otherwise the groups follow the order in which each key first occurs
+
+    returns:
+an iterable with the accumulated values
+    """
+    groups: typing.Dict[typing.Any, typing.List[typing.Any]] = {}
+
+    for item in data:
+        key = keyfunc(item)
+        group = groups.get(key)
+
+        if group is None:
+            groups[key] = [ item ]
+        else:
+            group.append(item)
+
+    keys: typing.Iterable[typing.Any] = sorted(groups) if sort_keys else groups
+
+    accum: typing.List[typing.Tuple[typing.Any, typing.Any]] = [
+        (k, applyfunc(groups[k]),)
+        for k in keys
+        ]
+
+    return accum
+
+
+def pagerank_matrix (
+    adjacency: typing.Any,
+    *,
+    alpha: float = 0.85,
+    personalization: typing.Optional[np.ndarray] = None,
+    nstart: typing.Optional[np.ndarray] = None,
+    max_iter: int = 100,
+    tol: float = 1.0e-6,
+    ) -> np.ndarray:
+    """
+Calculate *PageRank* by power iteration directly on a weighted adjacency
+matrix, without building a graph object.
+This follows the same steps and convergence test as
+[`networkx.pagerank`](https://networkx.org/documentation/stable/reference/algorithms/generated/networkx.algorithms.link_analysis.pagerank_alg.pagerank.html),
+so the results match for a graph with the same adjacency.
+
+Throws a `networkx.PowerIterationFailedConvergence` exception if the
+power iteration does not converge within `max_iter` iterations, or a
+`ZeroDivisionError` exception if the `personalization` weights sum to
+zero, the same as `networkx.pagerank`.
+
+    adjacency:
+square matrix of edge weights, either a dense `numpy` array or a `scipy.sparse` matrix
+
+    alpha:
+damping parameter
+
+    personalization:
+optional array of *node weights* for the
+[*Personalized PageRank*](https://derwen.ai/docs/ptr/glossary/#personalized-pagerank)
+algorithm; defaults to uniform weights
+
+    nstart:
+optional array of starting values for the power iteration, e.g., the ranks from a previous solution; defaults to uniform values
+
+    max_iter:
+maximum number of iterations
+
+    tol:
+error tolerance used to check convergence
+
+    returns:
+array of ranks, indexed the same as the rows of `adjacency`
+    """
+    import scipy.sparse as sp  # type: ignore # pylint: disable=C0415,E0401
+
+    n_nodes = adjacency.shape[0]
+
+    if n_nodes == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    out_weight = np.asarray(adjacency.sum(axis=1), dtype=np.float64).ravel()
+    inverse = np.divide(1.0, out_weight, out=np.zeros(n_nodes), where=out_weight != 0.0)
+
+    # row-normalize into a transition matrix, then transpose it
+    if sp.issparse(adjacency):
+        transition = sp.csr_matrix(sp.diags(inverse) @ adjacency).T.tocsr()
+    else:
+        transition = (np.asarray(adjacency, dtype=np.float64) * inverse[:, None]).T
+
+    if nstart is None:
+        x = np.repeat(1.0 / n_nodes, n_nodes)
+    else:
+        x = np.asarray(nstart, dtype=np.float64)
+        x = x / x.sum()
+
+    if personalization is None:
+        p = np.repeat(1.0 / n_nodes, n_nodes)
+    else:
+        p = np.asarray(personalization, dtype=np.float64)
+
+        if p.sum() == 0.0:
+            raise ZeroDivisionError("personalization weights sum to zero")
+
+        p = p / p.sum()
+
+    # nodes without any outbound weight distribute their rank
+    # according to the personalization
+    is_dangling = np.flatnonzero(out_weight == 0.0)
+
+    for _ in range(max_iter):
+        x_last = x
+        x = alpha * (transition @ x + x[is_dangling].sum() * p) + (1.0 - alpha) * p
+
+        if np.absolute(x - x_last).sum() < n_nodes * tol:
+            return x
+
+    import networkx as nx  # type: ignore # pylint: disable=C0415,E0401
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+
+def discounted_normalised_rank (
+    length: typing.Any,
+    non_lemma: typing.Any,
+    sum_rank: typing.Any,
+    ) -> typing.Any:
+    """
+Since the noun chunking is greedy, we discount the ranks using a point
+estimate based on the number of non-lemma tokens within a phrase.
+
+This applies either to one phrase, or elementwise to `numpy` arrays
+describing many phrases, where a phrase without any tokens ranks zero.
+
+    length:
+number of tokens within the phrase
+
+    non_lemma:
+number of tokens within the phrase which have a part of speech that was not kept
+
+    sum_rank:
+sum of the ranks for each token within the phrase
+
+    returns:
+normalized rank metric
+    """
+    if isinstance(sum_rank, np.ndarray):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(length < 1, 0.0, _discount_rank(length, non_lemma, sum_rank, np.sqrt))
+
+    if length < 1:
+        return 0.0
+
+    return _discount_rank(length, non_lemma, sum_rank, math.sqrt)
+
+
+def _discount_rank (
+    length: typing.Any,
+    non_lemma: typing.Any,
+    sum_rank: typing.Any,
+    sqrt: typing.Callable,
+    ) -> typing.Any:
+    """
+Calculate the discounted rank of `discounted_normalised_rank()`, for
+scalars or arrays depending on the `sqrt` function.
+    """
+    non_lemma_discount = length / (length + (2.0 * non_lemma) + 1.0)
+
+    # NB:
+    # This implements a *point estimate* for the ratio of the span
+    # of an extracted phrase divided by the number of non-lemma
+    # tokens within that span.
+    #
+    # The algorithm defined as in the original paper
+    # [[mihalcea04textrank]](https://derwen.ai/docs/ptr/biblio/#mihalcea04textrank)
+    # only considered multi-word phrases which had adjacent lemmas.
+    # Early use cases in industry (circa 2009) required better recall
+    # of phrases so this approach of using a point estimate here to
+    # "normalize" the rank metric causes the longer phrases to get
+    # discounted when they included too many non-lemma tokens.
+    # In other words, we allow some non-lemmas, but avoid having
+    # the algorithm become too "greedy" as it builds phrases.
+    #
+    # Kudos to @debraj135 who asked for an explanation about this
+    # section of the code.
+    phrase_rank = sqrt(sum_rank / (length + non_lemma))
+
+    return phrase_rank * non_lemma_discount
+
+
+class CacheInfo (typing.NamedTuple):
+    """
+Statistics for tuning the size of a `LRUCache`, in the same form as
+[`functools.lru_cache`](https://docs.python.org/3/library/functools.html#functools.lru_cache)
+reports them.
+    """
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """
+A bounded, thread-safe mapping which evicts the least recently used
+item once full, and counts the hits and misses of its lookups.
+Instances may be shared across documents and pipeline components.
+    """
+
+    def __init__ (
+        self,
+        maxsize: int,
+        ) -> None:
+        """
+Constructor for a bounded cache.
+
+    maxsize:
+maximum number of items to keep
+        """
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self._data: typing.OrderedDict[typing.Hashable, typing.Any] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+
+    def __len__ (
+        self
+        ) -> int:
+        """
+Number of items currently in the cache.
+        """
+        return len(self._data)
+
+
+    def get (
+        self,
+        key: typing.Hashable,
+        default: typing.Any = None,
+        ) -> typing.Any:
+        """
+Look up an item, marking it as the most recently used.
+
+    key:
+key for the item
+
+    default:
+value to return when the key is not in the cache
+
+    returns:
+the cached value, otherwise the default
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+
+    def put (
+        self,
+        key: typing.Hashable,
+        value: typing.Any,
+        ) -> None:
+        """
+Add or replace an item, evicting the least recently used item if the
+cache is full.
+
+    key:
+key for the item
+
+    value:
+value to cache
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+    def clear (
+        self
+        ) -> None:
+        """
+Remove all of the items and reset the statistics.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+    def cache_info (
+        self
+        ) -> CacheInfo:
+        """
+Report the cache statistics.
+
+    returns:
+the hits, misses, maximum size, and current size
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
 ######################################################################
 ## utility functions
 
@@ -62,6 +400,17 @@ scrubbed text
     return span.text.replace("'", "")
 
 
+# typographic punctuation mapped onto its ASCII equivalent
+_MANIACAL_TABLE: typing.Tuple[typing.Tuple[str, str], ...] = (
+    ("“", '"'),
+    ("”", '"'),
+    ("‘", "'"),
+    ("’", "'"),
+    ("…", "..."),
+    ("–", "-"),
+)
+
+
 def maniacal_scrubber (
     span: Span
     ) -> str:
@@ -69,6 +418,8 @@ def maniacal_scrubber (
 Applies multiple approaches for aggressively removing garbled Unicode
 and spurious punctuation from the given text.
 
+Throws a `TypeError` if the text of the span is not a string.
+
 OH: "It scrubs the garble from its stream... or it gets the debugger again!"
 
     span:
@@ -83,18 +434,69 @@ scrubbed text
     # have been found in the wild -- YMMV
     text = span.text
 
-    if type(text).__name__ != "str":
-        print("not a string?", type(text), text)
+    if not isinstance(text, str):
+        raise TypeError("span text is not a string: {}".format(type(text)))
+
+    # join the lines, each stripped of surrounding whitespace
+    if "\n" in text:
+        text = " ".join(line.strip() for line in text.split("\n"))
+
+    x = text.strip().replace("`", "'")
+
+    # the rest only applies to non-ASCII text
+    if x.isascii():
+        return x
+
+    # one `str.replace` pass per typographic character which is
+    # present: for short span texts this beats `str.translate` with a
+    # dict table, which dispatches per character
+    for old, new in _MANIACAL_TABLE:
+        if old in x:
+            x = x.replace(old, new)
+
+    return unicodedata.normalize("NFKD", x).encode("ascii", "ignore").decode("utf-8")
+
+
+def memoize_scrubber (
+    scrubber: typing.Callable[[Span], str],
+    maxsize: int = 10000,
+    ) -> typing.Callable[[Span], str]:
+    """
+Wrap a scrubber function with a bounded cache keyed by the span text,
+since the same phrase texts recur heavily within and across documents.
+The returned function has a `cache` attribute, which reports its hits
+and misses through `cache.cache_info()`.
+
+Only use this for scrubbers whose results depend on nothing more than
+the span text, e.g., `default_scrubber` or `maniacal_scrubber` – not
+for scrubbers which inspect the tokens, such as their POS tags.
+
+    scrubber:
+a scrubber function, which takes a `Span` and returns its scrubbed text
+
+    maxsize:
+maximum number of span texts to cache
+
+    returns:
+the memoized scrubber function
+    """
+    cache = LRUCache(maxsize)
 
-    x = " ".join(map(lambda s: s.strip(), text.split("\n"))).strip()
+    @functools.wraps(scrubber)
+    def memoized (
+        span: Span
+        ) -> str:
+        text = span.text
+        scrubbed = cache.get(text)
 
-    x = x.replace('“', '"').replace('”', '"')
-    x = x.replace("‘", "'").replace("’", "'").replace("`", "'")
-    x = x.replace("…", "...").replace("–", "-")
+        if scrubbed is None:
+            scrubbed = scrubber(span)
+            cache.put(text, scrubbed)
 
-    x = str(unicodedata.normalize("NFKD", x).encode("ascii", "ignore").decode("utf-8"))
+        return scrubbed
 
-    return x
+    memoized.cache = cache  # type: ignore
+    return memoized
 
 
 def split_grafs (
@@ -4,11 +4,15 @@
 
 """Shared fixture functions."""
 import pathlib
+import sys
 import pytest  # pylint: disable=E0401
 import spacy  # pylint: disable=E0401
 from spacy.language import Language  # pylint: disable=E0401
 from spacy.tokens import Doc  # pylint: disable=E0401
 
+# the benchmark harnesses in `bench/` get shared with the tests
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
 
 @pytest.fixture(scope="module")
 def nlp () -> Language:
@@ -10,7 +10,7 @@ import spacy  # pylint: disable=E0401
 import sys
 sys.path.insert(0, "../pytextrank")
 
-from pytextrank.base import BaseTextRankFactory  # pylint: disable=E0401
+from pytextrank.base import BaseTextRankFactory, PhraseTable, SpanOffsets  # pylint: disable=E0401
 
 
 def test_base_text_rank (doc: Doc):
@@ -219,3 +219,168 @@ Works as a pipeline component and can be disabled.
     ]
 
     assert "test" in phrases and "a test" not in phrases
+
+
+def test_coverage_summary (long_doc: Doc):
+    """
+Coverage summarization selects sentences which each add top-ranked
+phrases not already covered.
+    """
+    # given
+    LIMIT_PHRASES = 10
+    LIMIT_SENTENCES = 4
+
+    tr = long_doc._.textrank
+    sent_ids = { sent.start: sent_id for sent_id, sent in enumerate(long_doc.sents) }
+
+    # when
+    sent_bits = tr.calc_sent_incidence(limit_phrases=LIMIT_PHRASES)
+    summary = list(tr.summary(
+        limit_phrases=LIMIT_PHRASES,
+        limit_sentences=LIMIT_SENTENCES,
+        level="coverage",
+    ))
+
+    # then
+    assert 0 < len(summary) <= LIMIT_SENTENCES
+    assert len(sent_bits) == len(sent_ids)
+
+    covered = 0
+
+    for sent in summary:
+        bits = sent_bits[sent_ids[sent.start]]
+        assert bits & ~covered
+        covered |= bits
+
+
+def test_pos_chunker ():
+    """
+The `"pos"` chunker finds noun phrases from the part-of-speech tags
+alone, within sentences, ending at a noun or proper noun.
+    """
+    # given
+    nlp = spacy.blank("en")
+
+    doc = Doc(
+        nlp.vocab,
+        words=["the", "big", "red", "data", "models", "of", "Paris", "London", "fast", "."],
+        pos=["DET", "ADJ", "ADJ", "NOUN", "NOUN", "ADP", "PROPN", "PROPN", "ADJ", "PUNCT"],
+        lemmas=["the", "big", "red", "datum", "model", "of", "Paris", "London", "fast", "."],
+        sent_starts=[True, False, False, False, False, False, False, True, False, False],
+    )
+
+    # when
+    processed_doc = BaseTextRankFactory(chunker="pos")(doc)
+    chunks = [ chunk.text for chunk in processed_doc._.textrank._get_noun_chunks() ]
+
+    # then
+    assert chunks == ["big red data models", "Paris", "London"]
+    assert len(processed_doc._.phrases) == 3
+
+
+def test_auto_chunker ():
+    """
+The `"auto"` chunker falls back to the part-of-speech tags for
+documents without a dependency parse, and unknown chunkers get rejected.
+    """
+    # given
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+
+    doc = nlp("student loan rates rise. fixed rates stay.")
+
+    for token, (pos, lemma) in zip(doc, [
+        ("NOUN", "student"), ("NOUN", "loan"), ("NOUN", "rate"), ("VERB", "rise"), ("PUNCT", "."),
+        ("ADJ", "fixed"), ("NOUN", "rate"), ("VERB", "stay"), ("PUNCT", "."),
+    ]):
+        token.pos_ = pos
+        token.lemma_ = lemma
+
+    # when
+    processed_doc = BaseTextRankFactory(chunker="auto")(doc)
+    phrases = [ p.text for p in processed_doc._.phrases ]
+
+    # then
+    assert set(phrases) == {"student loan rates", "fixed rates"}
+    assert len(list(processed_doc._.textrank.summary(limit_sentences=1))) == 1
+
+    try:
+        BaseTextRankFactory(chunker="unknown")
+        assert False, "expected a ValueError"
+    except ValueError:
+        pass
+
+
+def test_observer ():
+    """
+An observer gets called at the end of each stage, with its elapsed time
+and counts, without changing the results.
+    """
+    # given
+    nlp = spacy.blank("en")
+
+    def make_doc () -> Doc:
+        return Doc(
+            nlp.vocab,
+            words=["the", "big", "data", "models", "rank", "data", ".", "models", "rank", "Paris", "."],
+            pos=["DET", "ADJ", "NOUN", "NOUN", "VERB", "NOUN", "PUNCT", "NOUN", "VERB", "PROPN", "PUNCT"],
+            lemmas=["the", "big", "datum", "model", "rank", "datum", ".", "model", "rank", "Paris", "."],
+            sent_starts=[True, False, False, False, False, False, False, True, False, False, False],
+        )
+
+    stages = []
+    expected_doc = BaseTextRankFactory(chunker="pos")(make_doc())
+
+    # when
+    processed_doc = BaseTextRankFactory(
+        chunker="pos",
+        observer=lambda doc, stage: stages.append(stage),
+    )(make_doc())
+
+    summary = list(processed_doc._.textrank.summary(limit_sentences=1))
+
+    # then
+    assert [ stage.name for stage in stages ] == ["graph", "pagerank", "phrases", "summary"]
+    assert all(stage.elapsed >= 0.0 for stage in stages)
+
+    graph = processed_doc._.textrank.lemma_graph
+    assert (stages[0].nodes, stages[0].edges) == (graph.number_of_nodes(), graph.number_of_edges())
+    assert stages[2].candidates == 4
+    assert stages[3].candidates == 2
+
+    assert [ (p.text, p.rank) for p in processed_doc._.phrases ] == [ (p.text, p.rank) for p in expected_doc._.phrases ]
+    assert len(summary) == 1
+
+
+def test_phrase_table ():
+    """
+The result objects have no per-instance `__dict__`, and a table of
+phrases keeps their texts, ranks, counts, and chunk offsets in parallel
+arrays, from which the `Phrase` view gets rebuilt.
+    """
+    # given
+    nlp = spacy.blank("en")
+
+    doc = Doc(
+        nlp.vocab,
+        words=["big", "data", "models", "rank", "data", ".", "models", "rank", "big", "data", "."],
+        pos=["ADJ", "NOUN", "NOUN", "VERB", "NOUN", "PUNCT", "NOUN", "VERB", "ADJ", "NOUN", "PUNCT"],
+        lemmas=["big", "datum", "model", "rank", "datum", ".", "model", "rank", "big", "datum", "."],
+        sent_starts=[True, False, False, False, False, False, True, False, False, False, False],
+    )
+
+    phrases = BaseTextRankFactory(chunker="pos")(doc)._.phrases
+
+    # when
+    table = PhraseTable.from_phrases(phrases)
+
+    # then
+    assert not hasattr(phrases[0], "__dict__")
+    assert len(table) == len(phrases)
+    assert list(table.columns()) == [ "text", "count", "rank" ]
+    assert table.to_phrases(doc) == phrases
+    assert table[-1].text == phrases[-1].text
+
+    for phrase, row in zip(phrases, table):
+        assert (row.text, row.count, row.rank) == (phrase.text, phrase.count, phrase.rank)
+        assert row.chunks == [ SpanOffsets(span.start, span.end) for span in phrase.chunks ]
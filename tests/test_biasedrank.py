@@ -85,3 +85,37 @@ Rank phrases close to 'focus' higher.
     # then
     # shifting the focus to chess bring Gary Kasparov in top ranks
     assert "Gary Kasparov" in [p.text for p in biased_phrases][:3]
+
+
+def test_focus_phrases (long_doc: Doc):
+    """
+Focus phrases put the nodes of their matched tokens in focus, and
+changing the focus back restores the default ranking.
+    """
+    # given
+    biased_rank = BiasedTextRankFactory()
+    processed_doc = biased_rank(long_doc)
+    tr = processed_doc._.textrank
+    phrases = [ p.text for p in processed_doc._.phrases ]
+
+    # when
+    tr.change_focus(
+        focus_phrases=["Gary Kasparov"],
+        bias=10.0,
+        default_bias=0.0)
+
+    focused_nodes = {
+        node.lemma
+        for node, weight in tr.get_personalization().items()
+        if weight > 0.0
+    }
+
+    # then
+    assert focused_nodes == {"Gary", "Kasparov"}
+    assert "Gary Kasparov" in [p.text for p in processed_doc._.phrases][:3]
+
+    # when
+    tr.change_focus()
+
+    # then
+    assert [ p.text for p in processed_doc._.phrases ] == phrases
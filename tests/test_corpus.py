@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# type: ignore
+
+"""Unit tests for CorpusTextRank."""
+import numpy as np  # pylint: disable=E0401
+
+import sys
+sys.path.insert(0, "../pytextrank")
+
+from bench.synth import make_doc  # pylint: disable=E0401
+from pytextrank.base import BaseTextRankFactory  # pylint: disable=E0401
+from pytextrank.corpus import CorpusTextRank, build_shard  # pylint: disable=E0401
+
+
+def test_single_doc_corpus ():
+    """
+A corpus of one document ranks the same phrases as `BaseTextRank` does
+for that document.
+    """
+    # given
+    doc = make_doc(2000)
+    expected = BaseTextRankFactory()(doc)._.phrases
+
+    # when
+    corpus = CorpusTextRank()
+    corpus.add_doc(doc)
+    phrases = corpus.rank()
+
+    # then
+    assert [ (p.text, p.count) for p in phrases ] == [ (p.text, p.count) for p in expected ]
+    assert np.allclose([ p.rank for p in phrases ], [ p.rank for p in expected ])
+    assert set(corpus.ranks) == set(doc._.textrank.ranks)
+
+
+def test_corpus_accumulation ():
+    """
+The counts get summed across documents regardless of their order or
+when the pending edges get compacted, while the memory for the edges
+stays bounded by the vocabulary.
+    """
+    # given
+    docs = [ make_doc(1000, seed=seed) for seed in range(4) ]
+
+    # when
+    corpus = CorpusTextRank()
+    corpus.add_docs(docs)
+    phrases = corpus.rank()
+
+    reversed_corpus = CorpusTextRank()
+    reversed_corpus._COMPACT_ELEMS = 100  # pylint: disable=W0212
+    reversed_corpus.add_docs(reversed(docs))
+    reversed_ranks = { p.text: (p.rank, p.count) for p in reversed_corpus.rank() }
+
+    doubled_corpus = CorpusTextRank()
+    doubled_corpus.add_docs(docs + docs)
+    doubled_ranks = { p.text: (p.rank, p.count) for p in doubled_corpus.rank() }
+
+    # then
+    assert corpus.n_docs == 4
+    assert (corpus.adjacency != corpus.adjacency.T).nnz == 0
+    assert sum(p.count for p in phrases) == sum(len(doc._.textrank._get_phrase_spans()) for doc in map(BaseTextRankFactory(), docs))  # pylint: disable=W0212
+
+    for p in phrases:
+        assert np.isclose(reversed_ranks[p.text][0], p.rank)
+        assert reversed_ranks[p.text][1] == p.count
+        assert np.isclose(doubled_ranks[p.text][0], p.rank)
+        assert doubled_ranks[p.text][1] == 2 * p.count
+
+    assert doubled_corpus.adjacency.nnz == corpus.adjacency.nnz
+    assert len(doubled_corpus.chunk_counts) == len(corpus.chunk_counts)
+
+
+def test_merge_shards (tmp_path):
+    """
+Shards saved from parts of a corpus merge into the same lemma graph as
+the whole corpus, even though each shard has its own vocabulary.
+    """
+    # given
+    docs = [ make_doc(1000, seed=seed) for seed in range(4) ]
+
+    corpus = CorpusTextRank()
+    corpus.add_docs(docs)
+    expected = { p.text: (p.rank, p.count) for p in corpus.rank() }
+
+    # when
+    paths = []
+
+    for shard_id, shard_docs in enumerate([ docs[:1], docs[1:] ]):
+        shard = CorpusTextRank()
+        shard.add_docs(reversed(shard_docs))
+        path = tmp_path / "shard{}.npz".format(shard_id)
+        shard.save_shard(path)
+        paths.append(path)
+
+    merged = CorpusTextRank.from_shards(reversed(paths))
+    ranks = { p.text: (p.rank, p.count) for p in merged.rank() }
+
+    # then
+    assert merged.n_docs == 4
+    assert merged.node_list != corpus.node_list
+    assert set(merged.vocab) == set(corpus.vocab)
+    assert merged.adjacency.nnz == corpus.adjacency.nnz
+    assert set(ranks) == set(expected)
+
+    for text, (rank, count) in expected.items():
+        assert np.isclose(ranks[text][0], rank)
+        assert ranks[text][1] == count
+
+
+def test_build_shards (tmp_path):
+    """
+Worker processes build shards from batches of texts, which merge into
+the same lemma graph as parsing all of the texts in one process.
+    """
+    # given
+    import functools
+    import multiprocessing
+    import spacy  # pylint: disable=E0401
+
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    ruler = nlp.add_pipe("attribute_ruler")
+
+    for word, pos in [ ("graph", "NOUN"), ("rank", "NOUN"), ("node", "NOUN"), ("edge", "NOUN"),
+                       ("sparse", "ADJ"), ("large", "ADJ"), ("links", "VERB"), ("scores", "VERB") ]:
+        ruler.add(patterns=[[ { "LOWER": word } ]], attrs={ "POS": pos, "LEMMA": word })
+
+    model = tmp_path / "model"
+    nlp.to_disk(model)
+
+    texts = [
+        "A large graph links sparse node.",
+        "Sparse edge scores large node rank.",
+        "Node rank scores graph edge.",
+        "Large edge links sparse graph rank.",
+    ]
+
+    corpus = CorpusTextRank(chunker="pos")
+    corpus.add_docs(nlp.pipe(texts))
+    expected = { p.text: (p.rank, p.count) for p in corpus.rank() }
+
+    # when
+    with multiprocessing.get_context("spawn").Pool(2) as pool:
+        paths = pool.starmap(
+            functools.partial(build_shard, model=str(model), chunker="pos"),
+            [ (tmp_path / "shard{}.npz".format(i), texts[i::2]) for i in range(2) ],
+        )
+
+    merged = CorpusTextRank.from_shards(paths)
+    ranks = { p.text: (p.rank, p.count) for p in merged.rank() }
+
+    # then
+    assert merged.n_docs == len(texts)
+    assert len(expected) > 0
+    assert set(ranks) == set(expected)
+
+    for text, (rank, count) in expected.items():
+        assert np.isclose(ranks[text][0], rank)
+        assert ranks[text][1] == count
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# type: ignore
+
+"""Unit tests for the equivalence of the alternative computation paths."""
+import pytest  # pylint: disable=E0401
+
+from bench.equiv import MODES, RankResult, check_doc, compare_results  # pylint: disable=E0401
+from bench.synth import make_doc  # pylint: disable=E0401
+
+
+@pytest.mark.parametrize("mode", list(MODES))
+def test_equivalent_paths (mode: str):
+    """
+Each alternative path returns the same phrases, ranks, and summary as
+its reference path.
+    """
+    # given
+    doc = make_doc(2000)
+
+    # when
+    report = check_doc(mode, doc, input_name="synth-2000")
+
+    # then
+    assert report.ok, str(report)
+
+
+def test_diff_report ():
+    """
+Divergent results get reported as differences, while ties may appear
+in either order.
+    """
+    # given
+    reference = RankResult(
+        phrases=[ ("alpha", 0.4), ("beta", 0.3), ("gamma", 0.3), ("delta", 0.1) ],
+        summary=[ 0, 2 ],
+    )
+
+    # when
+    tied = RankResult(
+        phrases=[ ("alpha", 0.4), ("gamma", 0.3), ("beta", 0.3), ("delta", 0.1) ],
+        summary=[ 0, 2 ],
+    )
+
+    diverged = RankResult(
+        phrases=[ ("beta", 0.3), ("alpha", 0.35), ("epsilon", 0.2), ("delta", 0.1) ],
+        summary=[ 2, 0 ],
+    )
+
+    report = compare_results(reference, diverged, mode="test")
+
+    # then
+    assert compare_results(reference, tied).ok
+
+    assert not report.ok
+    assert report.missing == [ "gamma" ]
+    assert report.extra == [ "epsilon" ]
+    assert report.rank_diffs == [ ("alpha", 0.4, 0.35) ]
+    assert report.inversions == [ ("beta", "alpha") ]
+    assert report.summary_diff == [ [ 0, 2 ], [ 2, 0 ] ]
+    assert "- phrase 'gamma'" in str(report)
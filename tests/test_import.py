@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# type: ignore
+
+"""Unit tests for the startup cost of importing the library."""
+from bench.import_time import LAZY_MODULES, probe  # pylint: disable=E0401
+
+
+def test_lazy_imports ():
+    """
+The graph, clustering, visualization, and debugging libraries do not
+get loaded by `import pytextrank`, while the eager dependencies do; the
+import time itself gets measured by `bench/import_time.py`.
+    """
+    # when
+    result = probe()
+
+    # then
+    assert not set(LAZY_MODULES).intersection(result["loaded"])
+    assert set([ "numpy", "pytextrank", "spacy" ]).issubset(result["loaded"])
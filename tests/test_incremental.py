@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# type: ignore
+
+"""Unit tests for IncrementalTextRank."""
+from spacy.tokens import Doc  # pylint: disable=E0401
+import networkx as nx  # pylint: disable=E0401
+import numpy as np  # pylint: disable=E0401
+
+import sys
+sys.path.insert(0, "../pytextrank")
+
+from bench.synth import make_doc  # pylint: disable=E0401
+from pytextrank.base import BaseTextRankFactory  # pylint: disable=E0401
+from pytextrank.incremental import IncrementalTextRank  # pylint: disable=E0401
+
+
+def test_append_segments ():
+    """
+Appending the segments of a document one at a time, re-ranking after
+each, gets the same phrases, chunks, summary, and `seen_lemma` as
+ranking the whole document.
+    """
+    # given
+    segments = [ make_doc(1000, seed=seed) for seed in range(4) ]
+    doc = BaseTextRankFactory()(Doc.from_docs(segments))
+    tr = doc._.textrank
+
+    expected = {
+        p.text: (p.rank, p.count, sorted((span.start, span.end) for span in p.chunks))
+        for p in doc._.phrases
+    }
+
+    # when
+    incremental = IncrementalTextRank()
+
+    for segment in segments:
+        incremental.append(segment)
+        phrases = incremental.rank()
+
+    # then
+    assert incremental.n_tokens == len(doc)
+    assert incremental.adjacency.nnz == 2 * tr.lemma_graph.number_of_edges() - nx.number_of_selfloops(tr.lemma_graph)
+
+    pairs = np.array(list(incremental.edges), dtype=np.int64)
+    weights = np.array(list(incremental.edges.values()), dtype=np.float64)
+    rebuilt = incremental._symmetric_adjacency(pairs[:, 0], pairs[:, 1], weights, len(incremental.node_list))  # pylint: disable=W0212
+    assert (incremental.adjacency != rebuilt).nnz == 0
+
+    assert incremental.seen_lemma == tr.seen_lemma
+    assert set(p.text for p in phrases) == set(expected)
+
+    for p in phrases:
+        rank, count, chunks = expected[p.text]
+        assert np.isclose(p.rank, rank, rtol=1e-3)
+        assert p.count == count
+        assert [ tuple(chunk) for chunk in p.chunks ] == chunks
+
+    assert list(incremental.summary(preserve_order=True)) == [ str(sent) for sent in tr.summary(preserve_order=True) ]
+
+
+def test_append_buffers_new_edges ():
+    """
+Appending a segment updates the weights of the existing edges in place,
+while new edges wait in a buffer until the adjacency matrix gets used.
+    """
+    # given
+    segment = make_doc(500, seed=0)
+    incremental = IncrementalTextRank()
+    incremental.append(segment)
+    adjacency = incremental.adjacency
+    weights = adjacency.copy()
+
+    # when
+    incremental.append(segment)
+
+    # then
+    assert not incremental._new_edges  # pylint: disable=W0212
+    assert incremental.adjacency is adjacency
+    assert np.allclose(adjacency.toarray(), 2.0 * weights.toarray())
+
+    # when
+    incremental.append(make_doc(500, seed=1))
+
+    # then
+    assert incremental._new_edges  # pylint: disable=W0212
+    assert incremental._adjacency is adjacency  # pylint: disable=W0212
+    assert incremental.adjacency.nnz > adjacency.nnz
+    assert not incremental._new_edges  # pylint: disable=W0212
@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# type: ignore
+
+"""Unit tests for the memory retained by ranked documents."""
+import pytest  # pylint: disable=E0401
+
+from bench.memory import LEAK_BUDGET, RETAINED_BUDGET, measure_doc, warm_up  # pylint: disable=E0401
+from bench.pipeline import ALGORITHMS  # pylint: disable=E0401
+
+
+@pytest.mark.parametrize("algorithm", list(ALGORITHMS))
+def test_retained_memory (algorithm: str):
+    """
+Each ranked document should retain no more memory per token than the
+budget, and release all of it along with the document.
+    """
+    # given
+    n_tokens = 5000
+    warm_up(algorithm)
+
+    # when
+    result = measure_doc(algorithm, n_tokens)
+
+    # then
+    assert result["peak"] >= result["retained"] > 0
+    assert result["retained"] / n_tokens <= RETAINED_BUDGET
+    assert result["leaked"] <= LEAK_BUDGET
@@ -41,3 +41,25 @@ does.
     assert "Chelsea" not in [p.text for p in comparison_phrases[:10]]
     assert "Shanghai Shenhua" not in ";".join(p.text for p in phrases[:10])
     assert "Shanghai Shenhua" in ";".join(p.text for p in comparison_phrases[:10])
+
+
+def test_personalization (doc: Doc):
+    """
+Each node gets the normalized sum of the inverse positions of its
+lemma within the document.
+    """
+    # given
+    position_rank = PositionRankFactory()(doc)._.textrank
+    lemmas = [ token.lemma_ for token in doc if token.pos_ in position_rank.pos_kept ]
+
+    # when
+    weighted_nodes = position_rank.get_personalization()
+
+    # then
+    total = sum(1 / (i + 1) for i in range(len(lemmas)))
+
+    for node, weight in weighted_nodes.items():
+        expected = sum(1 / (i + 1) for i, lemma in enumerate(lemmas) if lemma == node.lemma)
+        assert abs(weight - expected / total) < 1e-12
+
+    assert abs(sum({ node.lemma: w for node, w in weighted_nodes.items() }.values()) - 1.0) < 1e-9
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# type: ignore
+
+"""Unit tests for RankSnapshot."""
+from spacy.tokens import Doc  # pylint: disable=E0401
+
+import sys
+sys.path.insert(0, "../pytextrank")
+
+from pytextrank.biasedrank import BiasedTextRankFactory  # pylint: disable=E0401
+from pytextrank.snapshot import RankSnapshot  # pylint: disable=E0401
+from pytextrank.topicrank import TopicRankFactory  # pylint: disable=E0401
+
+
+def phrase_trace (phrases):
+    """
+Summarize a list of phrases for comparison.
+    """
+    return [
+        (p.text, round(p.rank, 9), p.count, [ (c.start, c.end) for c in p.chunks ])
+        for p in phrases
+    ]
+
+
+def test_snapshot_round_trip (doc: Doc, tmp_path):
+    """
+A saved snapshot reproduces the ranked phrases and the summaries of the
+document it was taken from.
+    """
+    # given
+    processed_doc = BiasedTextRankFactory()(doc)
+    tr = processed_doc._.textrank
+    path = tmp_path / "snapshot.npz"
+
+    # when
+    RankSnapshot.from_textrank(tr).save(path)
+    snapshot = RankSnapshot.load(path)
+
+    # then
+    assert phrase_trace(snapshot.phrases) == phrase_trace(processed_doc._.phrases)
+
+    for level in [ "sentence", "paragraph", "coverage" ]:
+        expected = [ str(sent) for sent in tr.summary(level=level) ]
+        assert list(snapshot.summary(level=level)) == expected
+
+
+def test_snapshot_change_focus (long_doc: Doc, tmp_path):
+    """
+Re-ranking a snapshot with a focus matches `BiasedTextRank` on the
+parsed document.
+    """
+    # given
+    processed_doc = BiasedTextRankFactory()(long_doc)
+    tr = processed_doc._.textrank
+    path = tmp_path / "snapshot.npz"
+    RankSnapshot.from_textrank(tr).save(path)
+    snapshot = RankSnapshot.load(path)
+
+    # when
+    tr.change_focus("Chess", bias=10.0, default_bias=0.0)
+    phrases = snapshot.change_focus("Chess", bias=10.0, default_bias=0.0)
+
+    # then
+    assert phrase_trace(phrases) == phrase_trace(processed_doc._.phrases)
+    assert "Gary Kasparov" in [ p.text for p in phrases ][:3]
+
+
+def test_snapshot_change_focus_phrases (long_doc: Doc, tmp_path):
+    """
+Re-ranking a snapshot with focus phrases matches `BiasedTextRank` on the
+parsed document.
+    """
+    # given
+    processed_doc = BiasedTextRankFactory()(long_doc)
+    tr = processed_doc._.textrank
+    path = tmp_path / "snapshot.npz"
+    RankSnapshot.from_textrank(tr).save(path)
+    snapshot = RankSnapshot.load(path)
+    focus_phrases = [ "world chess champion", "Deep Blue supercomputer" ]
+
+    # when
+    tr.change_focus("Kasparov", bias=10.0, default_bias=0.0, focus_phrases=focus_phrases)
+    phrases = snapshot.change_focus("Kasparov", bias=10.0, default_bias=0.0, focus_phrases=focus_phrases)
+
+    # then
+    assert phrase_trace(phrases) == phrase_trace(processed_doc._.phrases)
+
+
+def test_snapshot_requires_lemma_graph (doc: Doc):
+    """
+Snapshots get rejected for graphs whose nodes are not lemmas.
+    """
+    # given
+    processed_doc = TopicRankFactory()(doc)
+
+    # then
+    try:
+        RankSnapshot.from_textrank(processed_doc._.textrank)
+        assert False, "expected a TypeError"
+    except TypeError:
+        pass
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# type: ignore
+
+"""Unit tests for StreamingTextRank."""
+import numpy as np  # pylint: disable=E0401
+
+import sys
+sys.path.insert(0, "../pytextrank")
+
+from bench.synth import make_doc  # pylint: disable=E0401
+from pytextrank.corpus import CorpusTextRank  # pylint: disable=E0401
+from pytextrank.streaming import StreamingTextRank  # pylint: disable=E0401
+
+
+def test_stream_without_decay ():
+    """
+Without any noticeable decay, a stream ranks the same phrases as a
+corpus of the same documents.
+    """
+    # given
+    docs = [ make_doc(1000, seed=seed) for seed in range(3) ]
+
+    corpus = CorpusTextRank()
+    corpus.add_docs(docs)
+    expected = { p.text: p.rank for p in corpus.rank() }
+
+    # when
+    stream = StreamingTextRank(half_life=1.0e9, min_weight=0.0)
+
+    for timestamp, doc in enumerate(docs):
+        stream.add_doc(doc, timestamp)
+
+    phrases = stream.rank(now=len(docs))
+
+    # then
+    assert stream.n_docs == 3
+    assert set(p.text for p in phrases) == set(expected)
+    assert sum(p.count for p in phrases) == sum(corpus.chunk_counts.values())
+
+    for p in phrases:
+        assert np.isclose(p.rank, expected[p.text], rtol=1e-2)
+
+
+def test_stream_decay ():
+    """
+The evidence from old documents decays until it gets dropped, so the
+lemma graph stays bounded however long the stream runs, and only the
+recent documents determine the ranks.
+    """
+    # given
+    old_doc, new_doc = make_doc(1000, seed=0), make_doc(1000, seed=1)
+
+    corpus = CorpusTextRank()
+    corpus.add_doc(new_doc)
+    expected = { p.text: p.rank for p in corpus.rank() }
+
+    # when
+    stream = StreamingTextRank(half_life=1.0, min_weight=0.01, rank_interval=5.0)
+    stream.add_doc(old_doc, 0.0)
+    n_edges = len(stream.edges)
+    ranked = stream.last_ranked
+
+    stream.add_doc(new_doc, 20.0)
+    phrases = { p.text: p.rank for p in stream.phrases }
+
+    # then
+    assert ranked == 0.0
+    assert stream.last_ranked == 20.0
+    assert n_edges > 0
+    assert stream.adjacency.nnz == corpus.adjacency.nnz
+    assert set(stream.vocab) == set(corpus.vocab)
+    assert set(phrases) == set(expected)
+
+    for text, rank in expected.items():
+        assert np.isclose(phrases[text], rank, rtol=1e-2)
+
+    stream.rank(now=40.0)
+    assert not stream.edges and not stream.node_list and not stream.phrases
@@ -3,14 +3,61 @@
 # type: ignore
 
 """Unit tests for BaseTextRank."""
+import gc
+import weakref
+
+from scipy.cluster.hierarchy import fcluster, linkage  # pylint: disable=E0401
+from scipy.spatial.distance import pdist  # pylint: disable=E0401
 from spacy.language import Language  # pylint: disable=E0401
 from spacy.tokens import Span, Doc  # pylint: disable=E0401
+import networkx as nx  # pylint: disable=E0401
+import numpy as np  # pylint: disable=E0401
 import spacy  # pylint: disable=E0401
 
 import sys
 sys.path.insert(0, "../pytextrank")
 
-from pytextrank.topicrank import TopicRankFactory  # pylint: disable=E0401
+from pytextrank.topicrank import TopicRank, TopicRankFactory, _jaccard_pdist, _sparse_clusters  # pylint: disable=E0401
+
+
+def partition (cluster_ids):
+    """
+Group the rows by their cluster ids, regardless of the labels.
+    """
+    groups = {}
+
+    for row, cluster_id in enumerate(cluster_ids):
+        groups.setdefault(cluster_id, []).append(row)
+
+    return sorted(groups.values())
+
+
+def linkage_clusters (term_sets, method, max_dist=0.74):
+    """
+Cluster every row with `scipy` on the dense `pdist` distances, as the
+reference for the clustering backends.
+    """
+    vocab = sorted(set().union(*term_sets))
+    matrix = [
+        [ 1 if term in terms else 0 for term in vocab ]
+        for terms in term_sets
+    ]
+
+    return fcluster(linkage(pdist(matrix, "jaccard"), method=method), t=max_dist, criterion="distance")
+
+
+def random_term_sets (rng, n_trials, n_terms=8):
+    """
+Generate small candidate sets over a small vocabulary, so that repeated
+sets and tied distances are common.
+    """
+    vocab = [ "term{}".format(i) for i in range(n_terms) ]
+
+    for _ in range(n_trials):
+        yield [
+            frozenset(rng.choice(vocab, size=rng.integers(1, 4), replace=False))
+            for _ in range(rng.integers(2, 14))
+        ]
 
 
 def test_base_topic_rank (doc: Doc):
@@ -247,3 +294,291 @@ Works as a pipeline component with an empty document.
 
     # then
     assert len(doc._.phrases) == 0
+
+
+def test_jaccard_pdist ():
+    """
+Sparse pairwise distances match the dense `pdist` computation.
+    """
+    # given
+    term_sets = [
+        {"student", "loan"},
+        {"loan", "interest", "rates"},
+        {"rates"},
+        set(),
+        set(),
+        {"student", "loan"},
+    ]
+
+    vocab = sorted(set().union(*term_sets))
+    matrix = [
+        [ 1 if term in terms else 0 for term in vocab ]
+        for terms in term_sets
+    ]
+
+    # when
+    dist = _jaccard_pdist(term_sets)
+
+    # then
+    assert np.array_equal(dist, pdist(matrix, "jaccard"))
+
+
+def test_cluster_repeated_terms ():
+    """
+Candidates get compared as sets of terms, so a term repeated within a
+candidate only counts once.
+    """
+    # given
+    doc = spacy.blank("en").make_doc("big data big data and big data")
+    tr = TopicRankFactory(chunker="pos")(doc)._.textrank
+    candidates = [ doc[0:4], doc[5:7] ]
+
+    # when
+    clusters = tr._cluster(candidates)  # pylint: disable=W0212
+
+    # then
+    assert _jaccard_pdist([ {"big", "data"}, {"big", "data"} ]).tolist() == [ 0.0 ]
+    assert [ [ span.text for span in cluster ] for cluster in clusters ] == [ [ "big data big data", "big data" ] ]
+
+
+def test_topic_weights (doc: Doc):
+    """
+Vectorized topic edge weights match the pairwise sum of inverse
+distances between candidates.
+    """
+    # given
+    tr = TopicRankFactory()(doc)._.textrank
+    topics = tr.node_list
+
+    # when
+    weights = tr.calc_topic_weights()
+
+    # then
+    assert weights.shape == (len(topics), len(topics))
+
+    for i, source_topic in enumerate(topics):
+        for j, target_topic in enumerate(topics):
+            expected = 0.0
+
+            if i != j:
+                for source_member in source_topic:
+                    for target_member in target_topic:
+                        distance = abs(source_member.start - target_member.start)
+
+                        if distance:
+                            expected += 1.0 / distance
+
+            assert np.isclose(weights[i, j], expected * tr.edge_weight)
+
+
+def test_node_list_per_instance (doc: Doc):
+    """
+Clustered topics are memoized per instance, without retaining
+instances after they are released.
+    """
+    # given
+    factory = TopicRankFactory()
+
+    def make_topic_rank (threshold: float) -> TopicRank:
+        return TopicRank(
+            doc,
+            edge_weight=factory.edge_weight,
+            pos_kept=factory.pos_kept,
+            token_lookback=factory.token_lookback,
+            scrubber=factory.scrubber,
+            stopwords=factory.stopwords,
+            threshold=threshold,
+            method=factory.method,
+        )
+
+    tr_merge = make_topic_rank(0.0)
+    tr_split = make_topic_rank(1.0)
+
+    # when
+    topics_merge = tr_merge.node_list
+    topics_split = tr_split.node_list
+
+    # then
+    assert tr_merge.node_list is topics_merge
+    assert tr_split.node_list is topics_split
+    assert sum(len(topic) for topic in topics_merge) == sum(len(topic) for topic in topics_split)
+    assert all(len(topic) == 1 for topic in topics_split)
+
+    # released instances get collected
+    ref = weakref.ref(tr_merge)
+    del tr_merge
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_sparse_clusters ():
+    """
+Sparse single linkage produces the same clusters as single linkage over
+all of the pairwise distances, while sparse average linkage does so
+whenever no merges are tied.
+    """
+    # given
+    rng = np.random.default_rng(7)
+    max_dist = 0.74
+    n_untied = 0
+
+    for term_sets in random_term_sets(rng, 300, n_terms=12):
+        term_sets.append(frozenset())
+        term_sets.append(frozenset())
+
+        pairwise_dist = _jaccard_pdist(term_sets)
+        merge_dist = pairwise_dist[pairwise_dist <= max_dist]
+
+        # when
+        single_ids = _sparse_clusters(term_sets, max_dist, "single")
+        average_ids = _sparse_clusters(term_sets, max_dist, "average")
+
+        # then
+        assert partition(single_ids) == partition(linkage_clusters(term_sets, "single", max_dist))
+
+        if len(np.unique(merge_dist)) == len(merge_dist):
+            n_untied += 1
+            assert partition(average_ids) == partition(linkage_clusters(term_sets, "average", max_dist))
+
+    assert n_untied > 0
+
+
+def test_cluster_cache (monkeypatch):
+    """
+Caching the clustering results produces the same clusters as
+`cache_size=0`, for each clustering method, while a warm cache skips
+the `linkage` when the same candidates recur.
+    """
+    # given
+    import scipy.cluster.hierarchy  # pylint: disable=C0415,E0401
+
+    n_linkage = [ 0 ]
+    scipy_linkage = scipy.cluster.hierarchy.linkage
+
+    def counted_linkage (*args, **kwargs):
+        n_linkage[0] += 1
+        return scipy_linkage(*args, **kwargs)
+
+    monkeypatch.setattr(scipy.cluster.hierarchy, "linkage", counted_linkage)
+    nlp = spacy.blank("en")
+
+    for method in [ "average", "complete", "single", "sparse_average", "sparse_single" ]:
+        uncached = TopicRankFactory(method=method, chunker="pos")(nlp.make_doc(""))._.textrank
+        cached_factory = TopicRankFactory(method=method, chunker="pos", cache_size=1000)
+        cached = cached_factory(nlp.make_doc(""))._.textrank
+        trials = list(random_term_sets(np.random.default_rng(11), 100))
+
+        for term_sets in trials:
+            # when
+            expected = uncached._cluster_term_sets(term_sets)  # pylint: disable=W0212
+            cluster_ids = cached._cluster_term_sets(term_sets)  # pylint: disable=W0212
+
+            # then
+            assert list(cluster_ids) == list(expected)
+
+        # when
+        n_linkage[0] = 0
+
+        for term_sets in trials:
+            uncached._cluster_term_sets(term_sets)  # pylint: disable=W0212
+
+        n_uncached = n_linkage[0]
+        n_linkage[0] = 0
+
+        for term_sets in trials:
+            cached._cluster_term_sets(term_sets)  # pylint: disable=W0212
+
+        n_warm = n_linkage[0]
+
+        # then
+        assert n_warm == 0
+
+        if method != "sparse_single":
+            assert n_uncached > 0
+            assert cached_factory.cache.cache_info().hits > 0
+
+
+def test_sparse_method (doc: Doc):
+    """
+The sparse single linkage method ranks the same topics as the single
+linkage method.
+    """
+    # when
+    expected = TopicRankFactory(method="single")(doc)._.phrases
+    phrases = TopicRankFactory(method="sparse_single")(doc)._.phrases
+
+    # then
+    assert [ (p.text, p.count) for p in phrases ] == [ (p.text, p.count) for p in expected ]
+    assert np.allclose([ p.rank for p in phrases ], [ p.rank for p in expected ])
+
+
+def test_dense_pagerank (doc: Doc):
+    """
+Ranks calculated on the dense matrix of topic weights match the NetworkX
+PageRank on the graph of topics, which gets constructed on demand.
+    """
+    # given
+    tr = TopicRankFactory()(doc)._.textrank
+
+    # when
+    expected = nx.pagerank(tr.lemma_graph)
+
+    # then
+    assert set(expected) == set(tr.ranks)
+    assert all(np.isclose(tr.ranks[topic], rank) for topic, rank in expected.items())
+
+
+def test_observer ():
+    """
+An observer gets called at the end of each stage, including the
+candidate extraction and the clustering.
+    """
+    # given
+    nlp = spacy.blank("en")
+
+    doc = Doc(
+        nlp.vocab,
+        words=["big", "data", "models", "rank", "data", ".", "models", "rank", "Paris", "."],
+        pos=["ADJ", "NOUN", "NOUN", "VERB", "NOUN", "PUNCT", "NOUN", "VERB", "PROPN", "PUNCT"],
+        lemmas=["big", "datum", "model", "rank", "datum", ".", "model", "rank", "Paris", "."],
+        sent_starts=[True, False, False, False, False, False, True, False, False, False],
+    )
+
+    stages = []
+
+    # when
+    processed_doc = TopicRankFactory(
+        chunker="pos",
+        observer=lambda doc, stage: stages.append(stage),
+    )(doc)
+
+    # then
+    assert [ stage.name for stage in stages ] == ["candidates", "cluster", "graph", "pagerank", "phrases"]
+
+    n_topics = len(processed_doc._.textrank.node_list)
+    assert stages[0].candidates == stages[1].candidates == 4
+    assert stages[1].nodes == stages[2].nodes == n_topics
+    assert stages[2].edges == n_topics * (n_topics - 1) // 2
+
+
+def test_cluster_matches_linkage ():
+    """
+Clustering the candidates gives the same flat clusters as running
+`linkage` on all of the occurrences, including repeated sets of terms
+and tied distances.
+    """
+    # given
+    rng = np.random.default_rng(30)
+    doc = spacy.blank("en").make_doc("")
+
+    for method in [ "average", "complete", "single", "sparse_single" ]:
+        tr = TopicRankFactory(method=method, chunker="pos")(doc)._.textrank
+
+        for term_sets in random_term_sets(rng, 300):
+            # when
+            cluster_ids = tr._cluster_term_sets(term_sets)  # pylint: disable=W0212
+
+            # then
+            expected = linkage_clusters(term_sets, method.replace("sparse_", ""))
+            assert partition(cluster_ids) == partition(expected), (method, term_sets)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# type: ignore
+
+"""Unit tests for the utility functions."""
+import networkx as nx  # pylint: disable=E0401
+import numpy as np  # pylint: disable=E0401
+import pytest  # pylint: disable=E0401
+import spacy  # pylint: disable=E0401
+
+import sys
+sys.path.insert(0, "../pytextrank")
+
+from pytextrank.util import LRUCache, discounted_normalised_rank, groupby_apply, groupby_hash, maniacal_scrubber, memoize_scrubber, pagerank_matrix  # pylint: disable=E0401
+
+
+def test_pagerank_matrix ():
+    """
+PageRank on a sparse adjacency matrix matches the NetworkX results,
+including dangling nodes, self-loops, and personalization.
+    """
+    # given
+    graph = nx.gnm_random_graph(50, 120, seed=42)
+
+    for u, v in graph.edges():
+        graph[u][v]["weight"] = 1.0 + (u * v) % 7
+
+    graph.add_edge(3, 3, weight=2.0)
+    graph.add_node(50)
+
+    nodes = list(graph.nodes())
+    adjacency = nx.to_scipy_sparse_array(graph, nodelist=nodes)
+    bias = { node: 1.0 + node % 3 for node in nodes }
+
+    # when
+    ranks = pagerank_matrix(adjacency)
+    dense_ranks = pagerank_matrix(adjacency.toarray())
+    biased_ranks = pagerank_matrix(adjacency, personalization=np.array([ bias[node] for node in nodes ]))
+
+    # then
+    expected = nx.pagerank(graph)
+    assert np.allclose(ranks, [ expected[node] for node in nodes ])
+    assert np.allclose(dense_ranks, ranks)
+
+    expected = nx.pagerank(graph, personalization=bias)
+    assert np.allclose(biased_ranks, [ expected[node] for node in nodes ])
+
+
+def test_pagerank_matrix_zero_personalization ():
+    """
+PageRank with personalization weights which sum to zero throws the same
+exception as NetworkX, rather than returning NaN ranks.
+    """
+    # given
+    graph = nx.path_graph(4)
+    adjacency = nx.to_scipy_sparse_array(graph)
+
+    # when, then
+    with pytest.raises(ZeroDivisionError):
+        nx.pagerank(graph, personalization={ node: 0.0 for node in graph })
+
+    with pytest.raises(ZeroDivisionError):
+        pagerank_matrix(adjacency, personalization=np.zeros(4))
+
+
+def test_discounted_normalised_rank ():
+    """
+The discounted rank of many phrases as arrays matches the rank of each
+phrase by itself, where a phrase without any tokens ranks zero.
+    """
+    # given
+    lengths = np.array([ 0, 1, 2, 3, 5 ], dtype=np.float64)
+    non_lemma = np.array([ 0, 0, 1, 2, 1 ], dtype=np.float64)
+    sum_rank = np.array([ 0.0, 0.05, 0.11, 0.02, 0.3 ])
+
+    # when
+    ranks = discounted_normalised_rank(lengths, non_lemma, sum_rank)
+
+    # then
+    assert ranks.tolist() == [
+        discounted_normalised_rank(int(length), int(count), rank)
+        for length, count, rank in zip(lengths, non_lemma, sum_rank.tolist())
+    ]
+
+    assert ranks[0] == 0.0
+
+
+def test_lru_cache ():
+    """
+The cache evicts the least recently used item once full, and counts
+the hits and misses of its lookups.
+    """
+    # given
+    cache = LRUCache(2)
+
+    # when
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    # then
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (3, 1, 2, 2)
+
+    cache.clear()
+    assert cache.cache_info() == (0, 0, 2, 0)
+
+
+def test_maniacal_scrubber ():
+    """
+Scrubbing joins lines, maps typographic punctuation onto ASCII, and
+drops any other non-ASCII characters.
+    """
+    # given
+    nlp = spacy.blank("en")
+
+    texts = {
+        "student loan rates": "student loan rates",
+        "  student \n\n loan\t\nrates ": "student  loan rates",
+        "“the” ‘loan’ `rates`": "\"the\" 'loan' 'rates'",
+        "rates… 2020–2021": "rates... 2020-2021",
+        "café\xa0crème ﬁnance": "cafe creme finance",
+    }
+
+    for text, expected in texts.items():
+        # when
+        doc = nlp(text)
+
+        # then
+        assert maniacal_scrubber(doc[:]) == expected
+
+
+def test_memoize_scrubber ():
+    """
+A memoized scrubber only calls the wrapped scrubber once per distinct
+span text.
+    """
+    # given
+    nlp = spacy.blank("en")
+    doc = nlp("the loan rates and the loan rates")
+    calls = []
+
+    def scrubber (span):
+        calls.append(span.text)
+        return span.text.upper()
+
+    memoized = memoize_scrubber(scrubber, maxsize=8)
+
+    # when
+    results = [ memoized(doc[0:3]), memoized(doc[4:7]), memoized(doc[1:3]) ]
+
+    # then
+    assert results == [ "THE LOAN RATES", "THE LOAN RATES", "LOAN RATES" ]
+    assert calls == [ "the loan rates", "loan rates" ]
+    assert memoized.cache.cache_info().hits == 1
+
+
+def test_groupby_hash ():
+    """
+Hash-based grouping keeps the items of each group in their input order,
+and matches the sort-based grouping when the keys get sorted.
+    """
+    # given
+    data = [ ("b", 1), ("a", 2), ("c", 3), ("a", 4), ("b", 5) ]
+    keyfunc = lambda x: x[0]
+    applyfunc = lambda g: [ value for key, value in g ]
+
+    # when
+    groups = groupby_hash(data, keyfunc, applyfunc)
+    sorted_groups = groupby_hash(data, keyfunc, applyfunc, sort_keys=True)
+
+    # then
+    assert groups == [ ("b", [1, 5]), ("a", [2, 4]), ("c", [3]) ]
+    assert sorted_groups == groupby_apply(data, keyfunc, applyfunc)